@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import sys
+
+from .scenarios import default_scenarios
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_time_delta: float = 0.1) -> ([str], [str]):
+    """
+    Compare scenario results against a baseline.
+    Request counts are deterministic and may never grow, memory may grow up to the tolerance.
+    Wall time depends on the machine the baseline was stored on, its growth is reported separately.
+    :param min_time_delta: Wall time growth in seconds below which short scenarios' jitter is ignored.
+    :return: A description of every regression, and of every wall time growth.
+    """
+
+    regressions = []
+    slowdowns = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+
+        if result["requests"] > expected["requests"]:
+            regressions.append(f"{name}: {result['requests']} requests, baseline {expected['requests']}")
+
+        if result["wall_time"] > max(expected["wall_time"] * (1 + tolerance), expected["wall_time"] + min_time_delta):
+            slowdowns.append(f"{name}: wall time {result['wall_time']:.3f}s, baseline {expected['wall_time']:.3f}s")
+
+        if result["peak_memory"] > expected["peak_memory"] * (1 + tolerance):
+            regressions.append(f"{name}: peak memory {result['peak_memory']}, baseline {expected['peak_memory']}")
+
+    return regressions, slowdowns
+
+
+def main(argv: [str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmark the client against a local fake Wekan server.")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds every request to the fake server is delayed by")
+    parser.add_argument("--scenario", action="append", help="run only this scenario (repeatable)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare with")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative growth of wall time and peak memory")
+    parser.add_argument("--min-time-delta", type=float, default=0.1,
+                        help="wall time growth in seconds always tolerated, absorbing jitter of short scenarios")
+    parser.add_argument("--gate-wall-time", action="store_true",
+                        help="fail on wall time growth too, only meaningful against a baseline stored on this machine")
+    args = parser.parse_args(argv)
+
+    scenarios = [scenario for scenario in default_scenarios()
+                 if not args.scenario or scenario.name in args.scenario]
+
+    results = dict()
+    print(f"{'scenario':<28}{'requests':>10}{'wall time (s)':>16}{'peak memory (KiB)':>20}")
+    for scenario in scenarios:
+        result = scenario.measure(latency=args.latency)
+        results[result.name] = result.as_dict()
+        print(f"{result.name:<28}{result.requests:>10}{result.wall_time:>16.3f}{result.peak_memory / 1024:>20.1f}")
+
+    if args.update_baseline:
+        baseline = dict()
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as fd:
+                baseline = json.load(fd)
+
+        baseline.update(results)
+        with open(args.baseline, "w") as fd:
+            json.dump(baseline, fd, indent=2, sort_keys=True)
+            fd.write("\n")
+
+        print(f"Baseline stored in {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare with, run with --update-baseline to store one.")
+        return 0
+
+    with open(args.baseline) as fd:
+        regressions, slowdowns = compare(results, json.load(fd), args.tolerance, args.min_time_delta)
+
+    if args.gate_wall_time:
+        regressions += slowdowns
+    else:
+        for slowdown in slowdowns:
+            print(f"SLOWER {slowdown}")
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
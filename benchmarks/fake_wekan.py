@@ -0,0 +1,397 @@
+import itertools
+import json
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_LABEL_COLORS = ["green", "yellow", "orange", "red", "purple", "blue"]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class FakeWekanState:
+    """
+    In-memory documents of the fake server.
+    """
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.lock = threading.RLock()
+        self.users = dict()
+        self.passwords = dict()
+        self.tokens = dict()
+        self.boards = dict()
+        self.lists = dict()
+        self.swimlanes = dict()
+        self.cards = dict()
+
+    def new_id(self, prefix: str) -> str:
+        return f"{prefix}{next(self._ids)}"
+
+    def add_user(self, username: str, password: str = "password", is_admin: bool = False) -> str:
+        user_id = self.new_id("u")
+        self.users[user_id] = {
+            "_id": user_id,
+            "username": username,
+            "emails": [{"address": f"{username}@example.com", "verified": True}],
+            "createdAt": _now(),
+            "modifiedAt": _now(),
+            "profile": {"fullname": username, "initials": username[:2].upper(), "boardView": "board-view-swimlanes"},
+            "services": {},
+            "isAdmin": is_admin,
+            "authenticationMethod": "password",
+        }
+        self.passwords[username] = password
+        return user_id
+
+    def add_board(self, title: str, owner_id: str, **details) -> str:
+        board_id = self.new_id("b")
+        self.boards[board_id] = {
+            "_id": board_id,
+            "title": title,
+            "slug": title.lower().replace(" ", "-"),
+            "archived": False,
+            "createdAt": _now(),
+            "modifiedAt": _now(),
+            "stars": 0,
+            "labels": [{"_id": self.new_id("lb"), "name": "", "color": color} for color in DEFAULT_LABEL_COLORS],
+            "members": [{"userId": owner_id, "isAdmin": True, "isActive": True, "isNoComments": False,
+                         "isCommentOnly": False}],
+            "permission": details.get("permission") or "private",
+            "color": details.get("color") or "belize",
+            "type": "board",
+        }
+        self.add_swimlane(board_id, "Default")
+        return board_id
+
+    def add_swimlane(self, board_id: str, title: str) -> str:
+        swimlane_id = self.new_id("s")
+        self.swimlanes[swimlane_id] = {
+            "_id": swimlane_id, "title": title, "boardId": board_id, "archived": False, "createdAt": _now(),
+            "updatedAt": _now(), "modifiedAt": _now(), "type": "swimlane",
+            "sort": sum(1 for s in self.swimlanes.values() if s["boardId"] == board_id),
+        }
+        return swimlane_id
+
+    def add_list(self, board_id: str, title: str, sort=None) -> str:
+        list_id = self.new_id("l")
+        if sort is None:
+            sort = sum(1 for l in self.lists.values() if l["boardId"] == board_id)
+        self.lists[list_id] = {
+            "_id": list_id, "title": title, "boardId": board_id, "starred": False, "archived": False,
+            "swimlaneId": "", "createdAt": _now(), "updatedAt": _now(), "modifiedAt": _now(), "sort": sort,
+            "wipLimit": {"value": 1, "enabled": False, "soft": False}, "type": "list",
+        }
+        return list_id
+
+    def add_card(self, board_id: str, list_id: str, title: str, description: str = "", author_id: str = None,
+                 swimlane_id: str = None, sort=None) -> str:
+        card_id = self.new_id("c")
+        if sort is None:
+            sort = sum(1 for c in self.cards.values() if c["listId"] == list_id)
+        self.cards[card_id] = {
+            "_id": card_id, "title": title, "description": description, "boardId": board_id, "listId": list_id,
+            "swimlaneId": swimlane_id, "userId": author_id, "sort": sort, "archived": False,
+            "createdAt": _now(), "modifiedAt": _now(), "dateLastActivity": _now(),
+            "members": [], "assignees": [], "labelIds": [], "type": "cardType-card",
+        }
+        return card_id
+
+    def sorted_children(self, collection: dict, **match) -> [dict]:
+        children = [doc for doc in collection.values() if all(doc.get(k) == v for k, v in match.items())]
+        return sorted(children, key=lambda doc: doc.get("sort") or 0)
+
+
+class _Route:
+    def __init__(self, method: str, pattern: str, handler):
+        self.method = method
+        self.regex = re.compile("^" + re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", pattern) + "$")
+        self.handler = handler
+
+
+class FakeWekanServer:
+    """
+    An in-process stand-in for the Wekan REST API, running in a background thread.
+    It implements the endpoints the library uses, and counts the requests it serves per route.
+
+        with FakeWekanServer(latency=0.002) as server:
+            wekan = Wykan(server.url, "admin", "password")
+    """
+
+    def __init__(self, latency: float = 0, host: str = "127.0.0.1", port: int = 0):
+        """
+        :param latency: Seconds every request is delayed by, simulating the network and the database.
+        """
+
+        self.latency = latency
+        self.state = FakeWekanState()
+        self.admin_id = self.state.add_user("admin", "password", is_admin=True)
+        self.requests = Counter()
+        self.routes = self._build_routes()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, don't let Nagle's algorithm delay the body.
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server._dispatch(self, "GET")
+
+            def do_POST(self):
+                server._dispatch(self, "POST")
+
+            def do_PUT(self):
+                server._dispatch(self, "PUT")
+
+            def do_DELETE(self):
+                server._dispatch(self, "DELETE")
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        return sum(self.requests.values())
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _build_routes(self) -> [_Route]:
+        return [_Route(method, pattern, handler) for method, pattern, handler in [
+            ("POST", "/users/login", self._login),
+            ("GET", "/api/users", self._get_users),
+            ("POST", "/api/users", self._create_user),
+            ("GET", "/api/users/{user_id}", self._get_user),
+            ("DELETE", "/api/users/{user_id}", self._delete_user),
+            ("GET", "/api/users/{user_id}/boards", self._get_user_boards),
+            ("GET", "/api/boards", self._get_public_boards),
+            ("POST", "/api/boards", self._create_board),
+            ("GET", "/api/boards/{board_id}", self._get_board),
+            ("DELETE", "/api/boards/{board_id}", self._delete_board),
+            ("GET", "/api/boards/{board_id}/export", self._export_board),
+            ("PUT", "/api/boards/{board_id}/labels", self._add_label),
+            ("POST", "/api/boards/{board_id}/members/{user_id}", self._set_member),
+            ("POST", "/api/boards/{board_id}/members/{user_id}/add", self._set_member),
+            ("GET", "/api/boards/{board_id}/lists", self._get_lists),
+            ("POST", "/api/boards/{board_id}/lists", self._create_list),
+            ("GET", "/api/boards/{board_id}/lists/{list_id}", self._get_list),
+            ("DELETE", "/api/boards/{board_id}/lists/{list_id}", self._delete_list),
+            ("GET", "/api/boards/{board_id}/swimlanes", self._get_swimlanes),
+            ("POST", "/api/boards/{board_id}/swimlanes", self._create_swimlane),
+            ("GET", "/api/boards/{board_id}/swimlanes/{swimlane_id}", self._get_swimlane),
+            ("GET", "/api/boards/{board_id}/lists/{list_id}/cards", self._get_cards),
+            ("POST", "/api/boards/{board_id}/lists/{list_id}/cards", self._create_card),
+            ("GET", "/api/boards/{board_id}/lists/{list_id}/cards/{card_id}", self._get_card),
+            ("PUT", "/api/boards/{board_id}/lists/{list_id}/cards/{card_id}", self._update_card),
+            ("DELETE", "/api/boards/{board_id}/lists/{list_id}/cards/{card_id}", self._delete_card),
+        ]]
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str):
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = urlsplit(handler.path).path
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw_body = handler.rfile.read(length) if length else b""
+
+        for route in self.routes:
+            match = route.regex.match(path)
+            if route.method != method or match is None:
+                continue
+
+            self.requests[f"{method} {route.regex.pattern}"] += 1
+            if route.handler != self._login and handler.headers.get("Authorization", "")[7:] not in self.state.tokens:
+                return self._send(handler, 401, {"error": "Unauthorized", "statusCode": 401})
+
+            if handler.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+                body = {key: values[0] for key, values in parse_qs(raw_body.decode("utf-8")).items()}
+            else:
+                body = json.loads(raw_body) if raw_body else dict()
+
+            with self.state.lock:
+                status, response = route.handler(body, **match.groupdict())
+            return self._send(handler, status, response)
+
+        self._send(handler, 404, {"error": "Not found", "statusCode": 404})
+
+    @staticmethod
+    def _send(handler: BaseHTTPRequestHandler, status: int, response):
+        content = json.dumps(response).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    # Handlers, returning (status, response).
+
+    def _login(self, body):
+        state = self.state
+        user_id = next((user["_id"] for user in state.users.values() if user["username"] == body.get("username")),
+                       None)
+        if user_id is None or state.passwords[body["username"]] != body.get("password"):
+            return 400, {"error": "not-found", "reason": "Login failed"}
+
+        token = state.new_id("token")
+        state.tokens[token] = user_id
+        return 200, {"id": user_id, "token": token, "tokenExpires": "2100-01-01T00:00:00.000Z"}
+
+    def _get_users(self, body):
+        return 200, [{"_id": user["_id"], "username": user["username"]} for user in self.state.users.values()]
+
+    def _create_user(self, body):
+        user_id = self.state.add_user(body["username"], body.get("password", "password"))
+        return 200, {"_id": user_id}
+
+    def _get_user(self, body, user_id):
+        if user_id not in self.state.users:
+            return 404, {"error": "User not found"}
+        return 200, self.state.users[user_id]
+
+    def _delete_user(self, body, user_id):
+        self.state.users.pop(user_id, None)
+        return 200, {"_id": user_id}
+
+    def _get_user_boards(self, body, user_id):
+        return 200, [{"_id": board["_id"], "title": board["title"]} for board in self.state.boards.values()
+                     if any(member["userId"] == user_id for member in board["members"])]
+
+    def _get_public_boards(self, body):
+        return 200, [{"_id": board["_id"], "title": board["title"]} for board in self.state.boards.values()
+                     if board["permission"] == "public"]
+
+    def _create_board(self, body):
+        board_id = self.state.add_board(body["title"], body["owner"], permission=body.get("permission"),
+                                        color=body.get("color"))
+        swimlane_id = next(s["_id"] for s in self.state.swimlanes.values() if s["boardId"] == board_id)
+        return 200, {"_id": board_id, "defaultSwimlaneId": swimlane_id}
+
+    def _get_board(self, body, board_id):
+        if board_id not in self.state.boards:
+            return 404, {"error": "Board not found"}
+        return 200, self.state.boards[board_id]
+
+    def _delete_board(self, body, board_id):
+        self.state.boards.pop(board_id, None)
+        return 200, {"_id": board_id}
+
+    def _export_board(self, body, board_id):
+        state = self.state
+        if board_id not in state.boards:
+            return 404, {"error": "Board not found"}
+
+        board = dict(state.boards[board_id])
+        member_ids = {member["userId"] for member in board["members"]}
+        board.update({
+            "lists": state.sorted_children(state.lists, boardId=board_id),
+            "swimlanes": state.sorted_children(state.swimlanes, boardId=board_id),
+            "cards": state.sorted_children(state.cards, boardId=board_id),
+            "checklists": [],
+            "checklistItems": [],
+            "comments": [],
+            "activities": [],
+            "users": [{"_id": user_id, "username": state.users[user_id]["username"],
+                       "profile": state.users[user_id]["profile"]} for user_id in member_ids if user_id in state.users],
+        })
+        return 200, board
+
+    def _add_label(self, body, board_id):
+        label_id = self.state.new_id("lb")
+        label = body["label"]
+        self.state.boards[board_id]["labels"].append({"_id": label_id, "name": label["name"],
+                                                      "color": label["color"]})
+        return 200, label_id
+
+    def _set_member(self, body, board_id, user_id):
+        members = self.state.boards[board_id]["members"]
+        member = next((member for member in members if member["userId"] == user_id), None)
+        if member is None:
+            member = {"userId": user_id, "isActive": True}
+            members.append(member)
+
+        member.update({key: body.get(key, False) for key in ("isAdmin", "isNoComments", "isCommentOnly")})
+        return 200, {"_id": user_id}
+
+    def _get_lists(self, body, board_id):
+        return 200, [{"_id": l["_id"], "title": l["title"]}
+                     for l in self.state.sorted_children(self.state.lists, boardId=board_id)]
+
+    def _create_list(self, body, board_id):
+        return 200, {"_id": self.state.add_list(board_id, body["title"], body.get("sort"))}
+
+    def _get_list(self, body, board_id, list_id):
+        if list_id not in self.state.lists:
+            return 404, {"error": "List not found"}
+        return 200, self.state.lists[list_id]
+
+    def _delete_list(self, body, board_id, list_id):
+        self.state.lists.pop(list_id, None)
+        return 200, {"_id": list_id}
+
+    def _get_swimlanes(self, body, board_id):
+        return 200, [{"_id": s["_id"], "title": s["title"]}
+                     for s in self.state.sorted_children(self.state.swimlanes, boardId=board_id)]
+
+    def _create_swimlane(self, body, board_id):
+        return 200, {"_id": self.state.add_swimlane(board_id, body["title"])}
+
+    def _get_swimlane(self, body, board_id, swimlane_id):
+        return 200, self.state.swimlanes[swimlane_id]
+
+    def _get_cards(self, body, board_id, list_id):
+        return 200, [{"_id": c["_id"], "title": c["title"], "description": c["description"]}
+                     for c in self.state.sorted_children(self.state.cards, listId=list_id, archived=False)]
+
+    def _create_card(self, body, board_id, list_id):
+        card_id = self.state.add_card(board_id, list_id, body["title"], body.get("description", ""),
+                                      body.get("authorId"), body.get("swimlaneId"), body.get("sort"))
+        return 200, {"_id": card_id}
+
+    def _get_card(self, body, board_id, list_id, card_id):
+        if card_id not in self.state.cards:
+            return 404, {"error": "Card not found"}
+        return 200, self.state.cards[card_id]
+
+    def _update_card(self, body, board_id, list_id, card_id):
+        card = self.state.cards.get(card_id)
+        if card is None:
+            return 404, {"error": "Card not found"}
+
+        if "archive" in body:
+            card["archived"] = bool(body.pop("archive"))
+        card.update({key: value for key, value in body.items() if key != "newBoardId"})
+        card["modifiedAt"] = _now()
+        return 200, {"_id": card_id}
+
+    def _delete_card(self, body, board_id, list_id, card_id):
+        self.state.cards.pop(card_id, None)
+        return 200, {"_id": card_id}
@@ -0,0 +1,122 @@
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from enum import Enum
+
+from wykan.models.board import Board
+from wykan.models.card import Card
+from wykan.models.list import List
+from wykan.models.user import User
+from .fake_wekan import FakeWekanState
+
+
+def sample_documents(members: int = 10) -> dict:
+    """
+    Documents of a user, a board with members and labels, a list and a card, as served by the fake server.
+    """
+
+    state = FakeWekanState()
+    owner_id = state.add_user("owner")
+    member_ids = [state.add_user(f"member{i}") for i in range(members)]
+    board_id = state.add_board("Board", owner_id)
+    state.boards[board_id]["members"].extend(
+        {"userId": member_id, "isAdmin": False, "isActive": True, "isNoComments": False, "isCommentOnly": False}
+        for member_id in member_ids)
+    swimlane_id = next(iter(state.swimlanes))
+    list_id = state.add_list(board_id, "List")
+    card_id = state.add_card(board_id, list_id, "Card", "description", owner_id, swimlane_id)
+
+    return {
+        "User": (lambda document: User(None, document["_id"], document), state.users[owner_id]),
+        "Board": (lambda document: Board(None, document["_id"], document), state.boards[board_id]),
+        "List": (lambda document: List(None, document["boardId"], document["_id"], document),
+                 state.lists[list_id]),
+        "Card": (lambda document: Card(None, document["boardId"], document["listId"], document["_id"], document),
+                 state.cards[card_id]),
+    }
+
+
+class DictModel:
+    """
+    A plain object holding a model's fields in its __dict__, the shape models had before they declared __slots__.
+    """
+
+
+# Model class -> its DictModel subclass. Instances of a class share their __dict__ keys, like the models' did.
+_dict_classes = dict()
+
+
+def dict_backed(value):
+    """
+    Copy a model, and the models it holds, into :class:`DictModel` subclasses. Strings get their own copy and tuples
+    become lists again, as before models interned them.
+    """
+
+    if isinstance(value, str):
+        return (" " + value)[1:]
+    if isinstance(value, (tuple, list)):
+        return [dict_backed(item) for item in value]
+    if isinstance(value, dict):
+        return {key: dict_backed(item) for key, item in value.items()}
+
+    slots = [(cls, name) for cls in type(value).__mro__ for name in cls.__dict__.get("__slots__", ())]
+    if isinstance(value, Enum) or not slots:
+        return value
+
+    model_class = type(value)
+    if model_class not in _dict_classes:
+        _dict_classes[model_class] = type(model_class.__name__, (DictModel,), dict())
+
+    copy = _dict_classes[model_class]()
+    for cls, name in slots:
+        try:
+            # Read the slot itself, an unset field would otherwise be fetched.
+            field = cls.__dict__[name].__get__(value, cls)
+        except AttributeError:
+            continue
+        setattr(copy, name, dict_backed(field))
+
+    return copy
+
+
+def measure(factory, document: dict, count: int) -> float:
+    """
+    Average bytes retained by a model built from a freshly decoded document, like the client builds them.
+    """
+
+    encoded = json.dumps(document)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory(json.loads(encoded)) for _ in range(count)]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    del objects
+    return retained / count
+
+
+def main(argv: [str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.footprint",
+                                     description="Report the memory retained by every model object, and by the same "
+                                                 "fields held in a __dict__ with unshared strings.")
+    parser.add_argument("--count", type=int, default=2000, help="objects built per model")
+    parser.add_argument("--members", type=int, default=10, help="members of the sample board")
+    args = parser.parse_args(argv)
+
+    print(f"{'model':<12}{'dict-backed':>14}{'slots':>10}{'saved':>8}")
+    for name, (factory, document) in sample_documents(args.members).items():
+        before = measure(lambda decoded: dict_backed(factory(decoded)), document, args.count)
+        after = measure(factory, document, args.count)
+        print(f"{name:<12}{before:>14.0f}{after:>10.0f}{1 - after / before:>8.0%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import time
+import tracemalloc
+
+from wykan import Wykan
+from wykan.board_configuration import BoardConfiguration, ListConfiguration, CardConfiguration
+from .fake_wekan import FakeWekanServer
+
+
+class ScenarioResult:
+    """
+    The cost of a single scenario run.
+    """
+
+    def __init__(self, name: str, requests: int, wall_time: float, peak_memory: int):
+        """
+        :param requests: Requests served by the fake server while the scenario ran.
+        :param wall_time: Seconds the scenario took.
+        :param peak_memory: Peak of traced memory in bytes. The in-process server's allocations are included.
+        """
+
+        self.name = name
+        self.requests = requests
+        self.wall_time = wall_time
+        self.peak_memory = peak_memory
+
+    def as_dict(self) -> dict:
+        return {"requests": self.requests, "wall_time": self.wall_time, "peak_memory": self.peak_memory}
+
+
+class Scenario:
+    """
+    A benchmarked workload. :meth:`setup` seeds the fake server directly, without going through the client,
+    and only :meth:`run` is measured.
+    """
+
+    name = None
+
+    def setup(self, server: FakeWekanServer, wekan: Wykan):
+        pass
+
+    def run(self, server: FakeWekanServer, wekan: Wykan):
+        raise NotImplementedError()
+
+    def measure(self, latency: float = 0, **client_kwargs) -> ScenarioResult:
+        """
+        Run the scenario against a fresh fake server and client.
+        :param latency: Seconds every request to the fake server is delayed by.
+        :param client_kwargs: Extra parameters of the :class:`Wykan` client.
+        """
+
+        with FakeWekanServer(latency=latency) as server, \
+                Wykan(server.url, "admin", "password", **client_kwargs) as wekan:
+            wekan.login()
+            self.setup(server, wekan)
+
+            requests_before = server.request_count
+            tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                self.run(server, wekan)
+                wall_time = time.perf_counter() - start
+                peak_memory = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            return ScenarioResult(self.name, server.request_count - requests_before, wall_time, peak_memory)
+
+
+def seed_board(server: FakeWekanServer, title: str, lists: int, cards_per_list: int, owner_id: str = None) -> str:
+    """
+    Create a board with lists and cards directly in the fake server's state.
+    :return: ID of the board.
+    """
+
+    state = server.state
+    owner_id = owner_id or server.admin_id
+
+    with state.lock:
+        board_id = state.add_board(title, owner_id)
+        swimlane_id = next(s["_id"] for s in state.swimlanes.values() if s["boardId"] == board_id)
+
+        for list_index in range(lists):
+            list_id = state.add_list(board_id, f"List {list_index}")
+            for card_index in range(cards_per_list):
+                state.add_card(board_id, list_id, f"Card {list_index}.{card_index}", "description",
+                               owner_id, swimlane_id)
+
+    return board_id
+
+
+class LoadBoards(Scenario):
+    """
+    Load every board of a user, reading each one's title and admins.
+    """
+
+    name = "load_boards"
+
+    def __init__(self, boards: int = 100, members: int = 10):
+        self.boards = boards
+        self.members = members
+
+    def setup(self, server, wekan):
+        state = server.state
+        with state.lock:
+            member_ids = [state.add_user(f"member{i}") for i in range(self.members)]
+            for i in range(self.boards):
+                board_id = state.add_board(f"Board {i}", server.admin_id)
+                state.boards[board_id]["members"].extend(
+                    {"userId": member_id, "isAdmin": False, "isActive": True, "isNoComments": False,
+                     "isCommentOnly": False} for member_id in member_ids)
+
+    def run(self, server, wekan):
+        for board in wekan.get_user_boards(wekan.user.id):
+            board.title
+            [admin.username for admin in board.get_admin_users()]
+
+
+class ProvisionConfiguration(Scenario):
+    """
+    Create a board from a BoardConfiguration.
+    """
+
+    name = "provision_configuration"
+
+    def __init__(self, lists: int = 5, cards_per_list: int = 40, max_workers: int = 1):
+        self.lists = lists
+        self.cards_per_list = cards_per_list
+        self.max_workers = max_workers
+
+    def run(self, server, wekan):
+        config = BoardConfiguration("Provisioned", [
+            ListConfiguration(f"List {list_index}", [CardConfiguration(f"Card {card_index}", "description")
+                                                     for card_index in range(self.cards_per_list)])
+            for list_index in range(self.lists)])
+        wekan.create_board_from_configuration(config, wekan.user.id, max_workers=self.max_workers)
+
+
+class DuplicateBoard(Scenario):
+    """
+    Duplicate a board with lists and cards.
+    """
+
+    name = "duplicate_board"
+
+    def __init__(self, lists: int = 5, cards_per_list: int = 40):
+        self.lists = lists
+        self.cards_per_list = cards_per_list
+        self.board_id = None
+
+    def setup(self, server, wekan):
+        self.board_id = seed_board(server, "Source", self.lists, self.cards_per_list)
+
+    def run(self, server, wekan):
+        wekan.duplicate_board(wekan.get_board(self.board_id), "Copy")
+
+
+class LoadBoardTree(Scenario):
+    """
+    Read every card of a board with lists and cards.
+    """
+
+    name = "load_board_tree"
+
+    def __init__(self, lists: int = 5, cards_per_list: int = 40):
+        self.lists = lists
+        self.cards_per_list = cards_per_list
+        self.board_id = None
+
+    def setup(self, server, wekan):
+        self.board_id = seed_board(server, "Source", self.lists, self.cards_per_list)
+
+    def run(self, server, wekan):
+        snapshot = wekan.load_board_tree(self.board_id)
+        for board_list in snapshot.lists:
+            [(card.title, card.description) for card in snapshot.get_cards(board_list.id)]
+
+
+class UsernameLookup(Scenario):
+    """
+    Look a user up by username among many users.
+    """
+
+    name = "username_lookup"
+
+    def __init__(self, users: int = 1000):
+        self.users = users
+
+    def setup(self, server, wekan):
+        with server.state.lock:
+            for i in range(self.users):
+                server.state.add_user(f"user{i}")
+
+    def run(self, server, wekan):
+        wekan.get_user_by_username(f"user{self.users // 2}").username
+
+
+def default_scenarios() -> [Scenario]:
+    return [
+        LoadBoards(),
+        ProvisionConfiguration(),
+        DuplicateBoard(),
+        LoadBoardTree(),
+        UsernameLookup(),
+    ]
@@ -3,6 +3,13 @@ from setuptools import setup, find_packages
 setup(name='Wykan',
       version='1.0',
       description='Python wrapping for wekan rest API.',
-      packages=find_packages(),
+      packages=find_packages(exclude=["benchmarks", "benchmarks.*", "tests", "tests.*"]),
+      extras_require={
+          "async": ["aiohttp"],
+          "provision": ["PyYAML"],
+      },
+      entry_points={
+          "console_scripts": ["wykan-provision=wykan.provision:main"],
+      },
       python_requires=">=3"
       )
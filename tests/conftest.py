@@ -0,0 +1,16 @@
+import pytest
+
+from benchmarks.fake_wekan import FakeWekanServer
+from wykan import Wykan
+
+
+@pytest.fixture
+def server():
+    with FakeWekanServer() as server:
+        yield server
+
+
+@pytest.fixture
+def wekan(server):
+    with Wykan(server.url, "admin", "password") as wekan:
+        yield wekan
@@ -0,0 +1,39 @@
+import asyncio
+
+from benchmarks.scenarios import seed_board
+from wykan.aio import AsyncWykan
+from wykan.models.colors import Colors
+
+
+def _board_contents(server, board_id):
+    state = server.state
+    board = state.boards[board_id]
+    lists = state.sorted_children(state.lists, boardId=board_id)
+    return {
+        "permission": board["permission"],
+        "color": board["color"],
+        "labels": sorted((label["name"], label["color"]) for label in board["labels"]),
+        "members": sorted((member["userId"], member.get("isAdmin")) for member in board["members"]),
+        "swimlanes": [s["title"] for s in state.sorted_children(state.swimlanes, boardId=board_id)],
+        "lists": [(l["title"], [(c["title"], c["description"])
+                                for c in state.sorted_children(state.cards, listId=l["_id"])]) for l in lists],
+    }
+
+
+def test_async_and_sync_duplicates_are_the_same(server, wekan):
+    board_id = seed_board(server, "Board", 3, 4)
+    source = wekan.get_board(board_id)
+    source.add_label("Urgent", list(Colors)[0])
+    source.add_board_member(server.state.add_user("member"), False, False, True)
+    source.add_swimlane("Second")
+
+    sync_copy = wekan.duplicate_board(source, "Sync copy")
+
+    async def duplicate():
+        async with AsyncWykan(server.url, "admin", "password") as async_wekan:
+            return await async_wekan.duplicate_board(await async_wekan.get_board(board_id), "Async copy")
+
+    async_copy = asyncio.run(duplicate())
+
+    assert _board_contents(server, sync_copy.id) == _board_contents(server, board_id)
+    assert _board_contents(server, async_copy.id) == _board_contents(server, board_id)
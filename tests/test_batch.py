@@ -0,0 +1,91 @@
+import pytest
+
+from benchmarks.scenarios import seed_board
+from wykan.exceptions import BulkOperationError
+
+
+def _first_card(wekan, board_id):
+    board_list = wekan.get_board(board_id).get_lists()[0]
+    return board_list, board_list.get_cards()[0]
+
+
+def test_repeated_writes_are_merged(server, wekan):
+    board_id = seed_board(server, "Board", 1, 1)
+    _, card = _first_card(wekan, board_id)
+
+    before = server.request_count
+    with wekan.batch() as batch:
+        card.update(title="Renamed")
+        card.update(description="Described")
+        assert card.title == "Card 0.0"
+
+    assert len(batch.results) == 1
+    assert server.request_count - before == 1
+    assert (server.state.cards[card.id]["title"], server.state.cards[card.id]["description"]) \
+        == ("Renamed", "Described")
+    assert (card.title, card.description) == ("Renamed", "Described")
+
+
+def test_failed_block_sends_nothing(server, wekan):
+    board_id = seed_board(server, "Board", 1, 1)
+    _, card = _first_card(wekan, board_id)
+
+    with pytest.raises(RuntimeError):
+        with wekan.batch():
+            card.update(title="Renamed")
+            raise RuntimeError()
+
+    assert server.state.cards[card.id]["title"] == "Card 0.0"
+    assert card.title == "Card 0.0"
+
+
+def test_failed_writes_raise_after_sending_the_others(server, wekan):
+    board_id = seed_board(server, "Board", 2, 1)
+    board = wekan.get_board(board_id)
+    first_list, second_list = board.get_lists()
+    missing_card = first_list.get_cards()[0]
+    card = second_list.get_cards()[0]
+    del server.state.cards[missing_card.id]
+
+    with pytest.raises(BulkOperationError) as error:
+        with wekan.batch():
+            missing_card.update(title="Renamed")
+            card.update(title="Renamed")
+
+    assert [result.ok for result in error.value.results] == [False, True]
+    assert server.state.cards[card.id]["title"] == "Renamed"
+
+
+def test_failing_callback_is_reported_per_operation(server, wekan):
+    board_id = seed_board(server, "Board", 1, 1)
+    user_id = server.state.add_user("member")
+    member_url = f"/api/boards/{board_id}/members/{user_id}"
+
+    def fail():
+        raise ValueError("callback failed")
+
+    with pytest.raises(BulkOperationError) as error:
+        with wekan.batch() as batch:
+            batch.record("post", f"{member_url}/add", {"isAdmin": False}, on_commit=fail)
+            batch.record("post", member_url, {"isAdmin": True})
+
+    results = error.value.results
+    assert isinstance(results[0].error, ValueError)
+    assert results[1].ok
+    member = next(m for m in server.state.boards[board_id]["members"] if m["userId"] == user_id)
+    assert member["isAdmin"] is True
+
+
+def test_delete_drops_pending_writes_under_it(server, wekan):
+    board_id = seed_board(server, "Board", 2, 1)
+    board = wekan.get_board(board_id)
+    board_list, card = _first_card(wekan, board_id)
+
+    with wekan.batch() as batch:
+        card.update(title="Renamed")
+        board.delete_list(board_list.id)
+
+    assert len(batch.results) == 1
+    assert board_list.id not in server.state.lists
+    assert card.title == "Card 0.0"
+
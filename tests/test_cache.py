@@ -0,0 +1,67 @@
+from benchmarks.scenarios import seed_board
+from wykan import Wykan
+from wykan.cache import ResponseCache
+
+
+def _cached_client(server):
+    return Wykan(server.url, "admin", "password", response_cache=ResponseCache())
+
+
+def test_repeated_get_is_served_from_cache(server):
+    board_id = seed_board(server, "Board", 1, 1)
+    with _cached_client(server) as wekan:
+        wekan.get(f"/api/boards/{board_id}")
+        before = server.request_count
+        wekan.get(f"/api/boards/{board_id}")
+
+        assert server.request_count == before
+        assert wekan.response_cache.hits == 1
+
+
+def test_card_write_invalidates_board_export(server):
+    board_id = seed_board(server, "Board", 1, 2)
+    with _cached_client(server) as wekan:
+        board = wekan.get_board(board_id)
+        card = board.snapshot().cards[0]
+
+        card.update(title="Renamed")
+
+        assert [c.title for c in board.snapshot().cards if c.id == card.id] == ["Renamed"]
+
+
+def test_moves_see_previous_moves(server):
+    board_id = seed_board(server, "Board", 3, 3)
+    with _cached_client(server) as wekan:
+        first, second, third = wekan.get_board(board_id).get_lists()
+
+        first.move_all_cards(third)
+        snapshot = wekan.load_board_tree(board_id)
+        assert [len(snapshot.get_cards(l.id)) for l in (first, second, third)] == [0, 3, 6]
+
+        second.move_all_cards(third)
+        snapshot = wekan.load_board_tree(board_id)
+        assert [len(snapshot.get_cards(l.id)) for l in (first, second, third)] == [0, 0, 9]
+        assert [card.sort for card in snapshot.get_cards(third.id)] == list(range(9))
+
+
+def test_card_move_invalidates_destination_listing(server):
+    board_id = seed_board(server, "Board", 2, 1)
+    with _cached_client(server) as wekan:
+        source, destination = wekan.get_board(board_id).get_lists()
+        assert len(destination.get_cards()) == 1
+
+        card = source.get_cards()[0]
+        card.update(listId=destination.id)
+
+        assert card.id in [c.id for c in destination.get_cards()]
+
+
+def test_related_patterns_expand_groups():
+    cache = ResponseCache(related=[(r"^/api/boards/([^/]+)/", r"^/api/boards/\1/export$")])
+    for url in ("/api/boards/a/export", "/api/boards/b/export"):
+        cache.store(url, b"{}", dict())
+
+    cache.invalidate("/api/boards/a/lists/l")
+
+    assert cache.lookup("/api/boards/a/export") is None
+    assert cache.lookup("/api/boards/b/export") is not None
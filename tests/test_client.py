@@ -0,0 +1,43 @@
+import threading
+import time
+
+from benchmarks.fake_wekan import FakeWekanServer
+from wykan import Wykan
+
+
+def test_idle_pool_is_recycled(server, monkeypatch):
+    with Wykan(server.url, "admin", "password", keep_alive_timeout=0.01) as wekan:
+        closed = []
+        monkeypatch.setattr(wekan._adapter, "close", lambda: closed.append(True))
+
+        wekan.get_all_users()
+        time.sleep(0.02)
+        wekan.get_all_users()
+
+        assert closed == [True]
+
+
+def test_pool_is_kept_while_requests_are_in_flight():
+    with FakeWekanServer(latency=0.2) as server, \
+            Wykan(server.url, "admin", "password", keep_alive_timeout=0.02) as wekan:
+        wekan.login()
+        closed = []
+        adapter_close = wekan._adapter.close
+
+        def close():
+            closed.append(wekan._requests_in_flight)
+            adapter_close()
+
+        wekan._adapter.close = close
+        time.sleep(0.05)
+
+        # The first request finds the pool idle, the second one starts while the first is still in flight.
+        results = []
+        slow = threading.Thread(target=lambda: results.append(wekan.get_all_users()))
+        slow.start()
+        time.sleep(0.05)
+        results.append(wekan.get_all_users())
+        slow.join()
+
+        assert closed == [0]
+        assert len(results) == 2
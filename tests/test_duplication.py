@@ -0,0 +1,41 @@
+import threading
+
+from benchmarks.scenarios import seed_board
+from wykan.exceptions import ProvisioningError
+from wykan.models.board import Board
+
+
+def test_duplicate_copies_lists_and_cards(server, wekan):
+    board_id = seed_board(server, "Board", 3, 4)
+
+    copy = wekan.duplicate_board(wekan.get_board(board_id), "Copy")
+
+    snapshot = copy.snapshot()
+    assert [l.title for l in snapshot.lists] == ["List 0", "List 1", "List 2"]
+    assert [c.title for c in snapshot.get_cards(snapshot.lists[1].id)] == [f"Card 1.{i}" for i in range(4)]
+
+
+def test_interrupted_list_creation_fails_its_cards(server, wekan, monkeypatch):
+    class Interrupted(BaseException):
+        pass
+
+    def create_list(self, title, **kwargs):
+        raise Interrupted()
+
+    board_id = seed_board(server, "Board", 1, 3)
+    monkeypatch.setattr(Board, "create_list", create_list)
+    outcome = []
+
+    def duplicate():
+        try:
+            wekan.duplicate_board(wekan.get_board(board_id), "Copy", max_workers=2)
+        except ProvisioningError as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=duplicate, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive(), "The card workers are still waiting for the list"
+    assert len(outcome[0].results) == 3
+    assert all(not result.ok for result in outcome[0].results)
@@ -0,0 +1,93 @@
+import pytest
+
+from benchmarks.scenarios import seed_board
+from wykan.mirror import BoardMirror
+
+
+def _mirror(wekan, board_id):
+    mirror = BoardMirror(wekan, ":memory:")
+    mirror.track(board_id)
+    mirror.sync()
+    return mirror
+
+
+def test_sync_fetches_only_new_entities(server, wekan):
+    board_id = seed_board(server, "Board", 2, 3)
+    mirror = _mirror(wekan, board_id)
+    first_list = mirror.get_lists(board_id)[0]
+
+    list_id = server.state.add_list(board_id, "New list")
+    card_id = server.state.add_card(board_id, first_list.id, "New card")
+    report = mirror.sync()
+
+    assert report.fetched == 2
+    assert report.removed == 0
+    assert [l.title for l in mirror.get_lists(board_id)][-1] == "New list"
+    assert card_id in [card.id for card in mirror.get_cards(board_id, first_list.id)]
+    assert mirror.get_cards(board_id, list_id) == []
+
+
+def test_unchanged_sync_fetches_only_listings(server, wekan):
+    board_id = seed_board(server, "Board", 2, 3)
+    mirror = _mirror(wekan, board_id)
+
+    before = server.request_count
+    report = mirror.sync()
+
+    assert report.fetched == 0
+    # The board, the swimlanes and lists listings, and one cards listing per list.
+    assert server.request_count - before == 5
+
+
+def test_sync_refetches_edited_cards(server, wekan):
+    board_id = seed_board(server, "Board", 1, 3)
+    mirror = _mirror(wekan, board_id)
+    list_id = mirror.get_lists(board_id)[0].id
+    card = mirror.get_cards(board_id, list_id)[0]
+
+    server.state.cards[card.id]["title"] = "Renamed"
+    report = mirror.sync()
+
+    assert report.fetched == 1
+    assert mirror.get_cards(board_id, list_id)[0].title == "Renamed"
+
+
+def test_moved_card_is_kept(server, wekan):
+    board_id = seed_board(server, "Board", 2, 2)
+    mirror = _mirror(wekan, board_id)
+    source, destination = mirror.get_lists(board_id)
+    card = mirror.get_cards(board_id, source.id)[0]
+
+    server.state.cards[card.id]["listId"] = destination.id
+    mirror.sync()
+
+    assert card.id not in [c.id for c in mirror.get_cards(board_id, source.id)]
+    assert card.id in [c.id for c in mirror.get_cards(board_id, destination.id)]
+
+
+def test_removed_entities_are_deleted(server, wekan):
+    board_id = seed_board(server, "Board", 2, 2)
+    mirror = _mirror(wekan, board_id)
+    removed_list, kept_list = mirror.get_lists(board_id)
+    removed_card = mirror.get_cards(board_id, kept_list.id)[0]
+
+    del server.state.lists[removed_list.id]
+    del server.state.cards[removed_card.id]
+    report = mirror.sync()
+
+    assert report.removed == 2
+    assert [l.id for l in mirror.get_lists(board_id)] == [kept_list.id]
+    assert mirror.get_cards(board_id, removed_list.id) == []
+    assert removed_card.id not in [c.id for c in mirror.get_cards(board_id, kept_list.id)]
+
+
+def test_untrack_removes_member_users(server, wekan):
+    board_id = seed_board(server, "Board", 1, 1)
+    mirror = _mirror(wekan, board_id)
+    assert mirror.get_user(server.admin_id).username == "admin"
+
+    mirror.untrack(board_id)
+
+    assert mirror.board_ids == []
+    with pytest.raises(LookupError):
+        mirror.get_user(server.admin_id)
@@ -0,0 +1,61 @@
+import json
+import random
+
+import pytest
+
+from benchmarks.scenarios import seed_board
+from wykan.streaming import NotAnArray, iter_json_array
+
+DOCUMENT = [15000000000.0, -2, 0, 3.25e-7, -1E+10, 12345678901234567890, True, False, None, "", "é ✓ 𝄞",
+            "quote \" and \\\\ backslash", {"_id": "a", "sort": 1.5, "labels": [1, 2e3]}, [], [[-0.5]], {}]
+
+
+def _chunked(data: bytes, rng: random.Random):
+    position = 0
+    while position < len(data):
+        size = rng.randint(1, 8)
+        yield data[position:position + size]
+        position += size
+
+
+def test_random_chunking_decodes_every_element():
+    data = json.dumps(DOCUMENT, ensure_ascii=False).encode("utf-8")
+    for seed in range(200):
+        assert list(iter_json_array(_chunked(data, random.Random(seed)))) == DOCUMENT, f"seed {seed}"
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    ([b"[15000000000.", b"0, -2]"], [15000000000.0, -2]),
+    ([b"[1e", b"5]"], [1e5]),
+    ([b"[1E", b"-", b"3]"], [1e-3]),
+    ([b"[-", b"12", b"34]"], [-1234]),
+    ([b"[tr", b"ue, nu", b"ll]"], [True, None]),
+])
+def test_elements_split_between_chunks(chunks, expected):
+    assert list(iter_json_array(chunks)) == expected
+
+
+def test_not_an_array():
+    with pytest.raises(NotAnArray) as error:
+        list(iter_json_array([b'{"error": ', b'"Unauthorized"}']))
+
+    assert error.value.document == {"error": "Unauthorized"}
+
+
+def test_unterminated_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b"[1, 2"]))
+
+
+def test_iter_cards_streams_the_listing(server, wekan):
+    board_id = seed_board(server, "Board", 1, 50)
+    board_list = wekan.get_board(board_id).get_lists()[0]
+
+    assert [card.title for card in board_list.iter_cards()] == [f"Card 0.{i}" for i in range(50)]
+
+
+def test_get_user_by_username_stops_at_first_match(server, wekan):
+    for index in range(20):
+        server.state.add_user(f"user{index}")
+
+    assert wekan.get_user_by_username("user3").username == "user3"
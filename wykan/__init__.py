@@ -1,42 +1,275 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 
-from wykan.board_configuration import BoardConfiguration, ListConfiguration, CardConfiguration
-from .exceptions import WekanException
+from .auth import TokenCache
+from .cache import IdentityMap, NameIndex, ResponseCache, SingleFlight
+from .duplication import BoardDuplicator
+from .batch import WriteBatch
+from .bulk import run_bulk, raise_for_failures
+from .exceptions import WekanException, ProvisioningError
+from .metrics import RequestEvent, RequestMetrics
 from .models.board import Board
+from .models.card import Card
 from .models.user import User
+from .scheduler import RequestScheduler
+from .search import SearchIndex
+from .snapshot import BoardSnapshot
+from .streaming import iter_json_array, NotAnArray
+
+# Bytes read at once from streamed responses.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+if TYPE_CHECKING:
+    from .board_configuration import BoardConfiguration
+    from .cluster import WykanCluster
+
+# Configuration classes pull in yaml and the cluster depends on Wykan itself, they're only imported when accessed.
+# See __getattr__.
+_LAZY_IMPORTS = {
+    "BoardConfiguration": "wykan.board_configuration",
+    "ListConfiguration": "wykan.board_configuration",
+    "CardConfiguration": "wykan.board_configuration",
+    "WykanCluster": "wykan.cluster",
+}
+
+
+def _response_size(response, streamed: bool) -> int:
+    """
+    Size of a response body, as reported by the server for streamed responses which weren't read yet.
+    """
+
+    if response is None:
+        return 0
+
+    if streamed:
+        return int(response.headers.get("Content-Length") or 0)
+
+    return len(response.content)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Wykan:
-    verify_tls = True  # Set to False before initialization to ignore TLS validity.
+    verify_tls = True  # Default for new instances, use the verify_tls parameter to override it per instance.
 
-    def __init__(self, wekan_url: str, username: str, password: str):
+    def __init__(self, wekan_url: str, username: str, password: str, **kwargs):
         """
         Initialize a connection to a Wekan server.
         This object logs on to the Wekan server and lets you control it using REST API.
+        Logging on is deferred to the first request (or an explicit :meth:`login`), and is repeated
+        automatically if the server rejects the token.
+        All the requests of this client, and of every model object created by it, share one pool of
+        keep-alive connections. Call :meth:`close` (or use the client as a context manager) to release it.
 
         :param wekan_url: Base url to the Wekan server. Example: https://mywekan.com/
+        :param verify_tls: (optional) Validate the server's TLS certificate. Defaults to :attr:`Wykan.verify_tls`.
+        :param pool_connections: (optional) Number of per-host connection pools to cache.
+        :param pool_maxsize: (optional) Maximum number of kept-alive connections per host.
+        :param pool_block: (optional) Wait for a free connection instead of opening an extra one when the pool is full.
+        :param keep_alive_timeout: (optional) Seconds an idle connection is kept before the pool is recycled.
+            None keeps connections for as long as the server allows.
+        :param timeout: (optional) Timeout in seconds for every request, or a (connect, read) tuple.
+        :param user_cache_ttl: (optional) Seconds a fetched user is reused before it's fetched again.
+        :param user_cache_size: (optional) Maximum number of users kept in the user cache.
+        :param name_index_ttl: (optional) Seconds the username and title indexes are trusted before reloading them.
+        :param response_cache: (optional) A :class:`ResponseCache` serving repeated GETs. Disabled by default.
+        :param search_index: (optional) The :class:`SearchIndex` used by :meth:`search`, or a path of its file.
+            An in memory index is created on the first search by default.
+        :param search_index_ttl: (optional) Seconds a board's search index is trusted before reindexing it.
+        :param single_flight: (optional) Share a single request between threads sending the same GET at the same
+            time. Enabled by default.
+        :param token_cache: (optional) A :class:`TokenCache`, or a path of its file, reusing login tokens across
+            processes until they expire.
+        :param max_concurrency: (optional) Maximum number of requests in flight, the pool size by default. Fewer are
+            sent while the server shows signs of load, see :class:`RequestScheduler`.
+        :param retries: (optional) Times an idempotent request failing with a transient error is sent again,
+            2 by default.
+        :param scheduler: (optional) A :class:`RequestScheduler` replacing the default one, e.g. shared by clients
+            of the same server.
         """
 
         self.wekan_url = wekan_url
+        self.verify_tls = kwargs.get("verify_tls", Wykan.verify_tls)
+        self.keep_alive_timeout = kwargs.get("keep_alive_timeout")
+        self.timeout = kwargs.get("timeout")
+        self.pool_maxsize = kwargs.get("pool_maxsize", 10)
+
+        self._session = requests.Session()
+        self._session.verify = self.verify_tls
+        self._adapter = HTTPAdapter(pool_connections=kwargs.get("pool_connections", 10),
+                                    pool_maxsize=self.pool_maxsize,
+                                    pool_block=kwargs.get("pool_block", False))
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+        self._last_request_time = None
+        self._requests_in_flight = 0
+        self._pool_lock = threading.Lock()
+
+        self.user_cache = IdentityMap(kwargs.get("user_cache_ttl", 300), kwargs.get("user_cache_size", 4096))
+        self.name_index = NameIndex(kwargs.get("name_index_ttl", 300))
+        self.response_cache = kwargs.get("response_cache")
+        search_index = kwargs.get("search_index")
+        self.search_index = SearchIndex(search_index) if isinstance(search_index, str) else search_index
+        self.search_index_ttl = kwargs.get("search_index_ttl", 300)
+        self.single_flight = SingleFlight() if kwargs.get("single_flight", True) else None
+
+        self.metrics = RequestMetrics()
+        self.scheduler = kwargs.get("scheduler") or RequestScheduler(kwargs.get("max_concurrency", self.pool_maxsize),
+                                                                     retries=kwargs.get("retries", 2))
+        self._before_request_hooks = []
+        self._after_request_hooks = []
+        self._metrics_scopes = []
+        self._hooks_lock = threading.Lock()
+
+        token_cache = kwargs.get("token_cache")
+        self.token_cache = TokenCache(token_cache) if isinstance(token_cache, str) else token_cache
+        self.token = None
+        self._user_id = None
+        self._username = username
+        self._password = password
+        self._login_lock = threading.Lock()
+
+        # Write batches opened by each thread, see batch().
+        self._batches = threading.local()
+
+    @property
+    def user(self) -> User:
+        """
+        The logged on user.
+        """
+
+        self._ensure_logged_in()
+        return self.get_user(self._user_id)
+
+    def login(self):
+        """
+        Log on to the Wekan server, reusing a cached token if there's a valid one.
+        """
+
+        with self._login_lock:
+            self._login_or_reuse_token()
+
+    def _login_or_reuse_token(self):
+        cached_token = self.token_cache.load(self.wekan_url, self._username) if self.token_cache else None
+        if cached_token is not None:
+            self.token, self._user_id = cached_token
+            return
+
+        self._login()
 
+    def _login(self):
         login_user = self.post("/users/login",
-                               data={"username": username, "password": password},
+                               data={"username": self._username, "password": self._password},
                                authed=False)
         self.token = login_user["token"]
-        self.user = User(self, login_user["id"])
+        self._user_id = login_user["id"]
+
+        if self.token_cache is not None:
+            self.token_cache.store(self.wekan_url, self._username, self.token, self._user_id,
+                                   login_user.get("tokenExpires"))
+
+    def _ensure_logged_in(self):
+        if self.token is not None:
+            return
+
+        # Threads sending their first request at the same time wait for a single login.
+        with self._login_lock:
+            if self.token is None:
+                self._login_or_reuse_token()
+
+    def _relogin(self, rejected_token: str):
+        """
+        Log on again after the server rejected a token, unless another thread already did.
+        """
+
+        with self._login_lock:
+            if self.token != rejected_token:
+                return
+
+            if self.token_cache is not None:
+                self.token_cache.discard(self.wekan_url, self._username)
+
+            self._login()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close all the pooled connections to the Wekan server.
+        """
+
+        self._session.close()
 
     def get(self, url: str, **kwargs):
-        return self._internal_api_call(url, "get", **kwargs)
+        if self.single_flight is None:
+            return self._internal_api_call(url, "get", **kwargs)
+
+        return self.single_flight.do((url, kwargs.get("authed", True)),
+                                     lambda: self._internal_api_call(url, "get", **kwargs))
 
     def post(self, url: str, data: dict, **kwargs):
-        return self._internal_api_call(url, "post", data, **kwargs)
+        return self._write(url, "post", data, **kwargs)
 
     def delete(self, url: str, **kwargs):
-        return self._internal_api_call(url, "delete", **kwargs)
+        return self._write(url, "delete", **kwargs)
 
     def put(self, url: str, data: dict, **kwargs):
-        return self._internal_api_call(url, "put", data, **kwargs)
+        return self._write(url, "put", data, **kwargs)
+
+    def batch(self, **kwargs) -> WriteBatch:
+        """
+        Open a unit of work, recording the writes issued in the current thread until it's committed.
+        Example:
+            with wekan.batch() as batch:
+                board.change_member_permissions(...)
+        :param max_workers: (optional) Maximum number of requests sent at once on commit, 4 by default.
+        :raises BulkOperationError: On exiting the block, if some of the writes failed.
+        """
+
+        return WriteBatch(self, kwargs.get("max_workers", 4))
+
+    def _write(self, url: str, method: str, data: dict = None, **kwargs):
+        """
+        Send a write, or record it in the open batch if its response isn't needed.
+        :param deferrable: (optional) Whether the write may be recorded by a batch.
+        :param on_commit: (optional) Called once the write was sent successfully, to update caches and models.
+            A batched write calls it on commit, never if the batch is discarded.
+        """
+
+        on_commit = kwargs.pop("on_commit", None)
+        batches = getattr(self._batches, "stack", None)
+        if kwargs.get("deferrable", False) and batches:
+            return batches[-1].record(method, url, data, on_commit)
+
+        response = self._internal_api_call(url, method, data, **kwargs)
+        if on_commit is not None:
+            on_commit()
+
+        return response
+
+    def _open_batch(self, batch: WriteBatch):
+        if getattr(self._batches, "stack", None) is None:
+            self._batches.stack = []
+        self._batches.stack.append(batch)
+
+    def _close_batch(self, batch: WriteBatch):
+        self._batches.stack.remove(batch)
 
     def _internal_api_call(self, rest_url: str, method: str, data: dict = None, **kwargs) -> dict:
         """
@@ -46,16 +279,27 @@ class Wykan:
         :param method: Type of REST method to send.
         :param data: Dictionary to be sent in the request.
         :param authed: Should the request be sent with authorization token.
+        :param idempotent: (optional) Whether the request may be sent again after a transient error, by its method
+            by default.
         :return: JSON encoded REST response.
         """
 
-        request_url = f"{self.wekan_url}{rest_url}"
-
         headers = dict()
         request_data = dict()
 
+        cached_response = None
+        if self.response_cache is not None and method == "get":
+            cached_response = self.response_cache.lookup(rest_url)
+            if cached_response is not None:
+                if cached_response.fresh:
+                    return cached_response.json()
+
+                headers.update(cached_response.validators)
+
         # Some api requests do not require authorization.
-        if kwargs.get("authed", True):
+        authed = kwargs.get("authed", True)
+        if authed:
+            self._ensure_logged_in()
             headers["Authorization"] = f"Bearer {self.token}"
 
         # Except for the initial login request.
@@ -63,15 +307,23 @@ class Wykan:
             headers["Content-type"] = "application/x-www-form-urlencoded"
             request_data["data"] = data
 
-        api_response = requests.request(method, request_url,
-                                        headers=headers,
-                                        json=data,
-                                        verify=Wykan.verify_tls,
-                                        **request_data)
+        api_response = self._send(method, rest_url, headers, data, kwargs.get("idempotent"), **request_data)
+
+        # The token expired or was revoked, log on again and retry once.
+        if authed and api_response.status_code == 401 and not kwargs.get("is_retry", False):
+            self._relogin(headers["Authorization"][len("Bearer "):])
+            return self._internal_api_call(rest_url, method, data, is_retry=True, **kwargs)
+
+        if self.response_cache is not None:
+            if method != "get":
+                self.response_cache.invalidate(rest_url)
+            elif cached_response is not None and api_response.status_code == 304:
+                self.response_cache.revalidated(rest_url)
+                return cached_response.json()
 
         # Check if the HTTP request returned successfully.
         if not api_response.ok:
-            raise HTTPError(api_response.content.decode('utf-8'))
+            raise HTTPError(api_response.content.decode('utf-8'), response=api_response)
 
         response_json = dict()
         # Response might be valid, but return not content.
@@ -84,8 +336,176 @@ class Wykan:
         if isinstance(response_json, dict) and "error" in response_json:
             raise WekanException(str(response_json))
 
+        if self.response_cache is not None and method == "get":
+            self.response_cache.store(rest_url, api_response.content, api_response.headers)
+
         return response_json
 
+    def iter_get(self, url: str, **kwargs):
+        """
+        Stream a GET of a collection endpoint, decoding its JSON array incrementally.
+        Elements are yielded as soon as they're received, and the request is abandoned when the iteration stops.
+        Streamed requests bypass the response cache.
+        :param url: REST url of the collection. Example: /api/users
+        """
+
+        headers = {"Authorization": f"Bearer {self._logged_in_token()}"}
+        api_response = self._send("get", url, headers, stream=True)
+
+        # The token expired or was revoked, log on again and retry once.
+        if api_response.status_code == 401 and not kwargs.get("is_retry", False):
+            api_response.close()
+            self._relogin(headers["Authorization"][len("Bearer "):])
+            yield from self.iter_get(url, is_retry=True)
+            return
+
+        try:
+            # Check if the HTTP request returned successfully.
+            if not api_response.ok:
+                raise HTTPError(api_response.content.decode('utf-8'), response=api_response)
+
+            try:
+                yield from iter_json_array(api_response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+            except NotAnArray as e:
+                # Errors of the REST api are returned as an object instead of the collection.
+                raise WekanException(str(e.document))
+        finally:
+            api_response.close()
+
+    def _logged_in_token(self) -> str:
+        self._ensure_logged_in()
+        return self.token
+
+    def _send(self, method: str, rest_url: str, headers: dict, json_data: dict = None, idempotent: bool = None,
+              **request_data):
+        """
+        Send a request, sending it again after a delay while an idempotent request fails with a transient error.
+        :param idempotent: Whether the request may be sent again, by its method by default.
+        :param stream: (optional) Don't read the response body, for streamed requests.
+        :return: The HTTP response.
+        """
+
+        attempt = 0
+        while True:
+            try:
+                api_response = self._send_once(method, rest_url, headers, json_data, **request_data)
+            except Exception as e:
+                delay = self.scheduler.retry_delay(method, attempt, error=e, idempotent=idempotent)
+                if delay is None:
+                    raise
+            else:
+                delay = self.scheduler.retry_delay(method, attempt, response=api_response, idempotent=idempotent)
+                if delay is None:
+                    return api_response
+                api_response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _send_once(self, method: str, rest_url: str, headers: dict, json_data: dict = None, **request_data):
+        """
+        Send a single request over the connection pool within the scheduler's concurrency limit, running the request
+        hooks and recording its metrics.
+        Streamed requests leave the limit once their headers are received.
+        """
+
+        for hook in list(self._before_request_hooks):
+            hook(method.upper(), rest_url)
+
+        # Connections that were idle for too long are likely to be dropped by the server, recycle them. Only while no
+        # request is in flight, other threads may be using connections of the pool.
+        with self._pool_lock:
+            now = time.monotonic()
+            if self.keep_alive_timeout is not None and self._last_request_time is not None \
+                    and now - self._last_request_time > self.keep_alive_timeout and self._requests_in_flight == 0:
+                self._adapter.close()
+            self._last_request_time = now
+            self._requests_in_flight += 1
+
+        api_response = None
+        error = None
+        try:
+            with self.scheduler.slot() as epoch:
+                # Time spent waiting for the limit isn't the server's latency.
+                start = time.monotonic()
+                try:
+                    api_response = self._session.request(method, f"{self.wekan_url}{rest_url}",
+                                                         headers=headers,
+                                                         json=json_data,
+                                                         timeout=self.timeout,
+                                                         **request_data)
+                    return api_response
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    request_body = api_response.request.body if api_response is not None else None
+                    event = RequestEvent(method.upper(), rest_url,
+                                         status=api_response.status_code if api_response is not None else None,
+                                         latency=time.monotonic() - start,
+                                         bytes_sent=len(request_body or b""),
+                                         bytes_received=_response_size(api_response, request_data.get("stream", False)),
+                                         error=error)
+                    self.scheduler.observe(epoch, event)
+                    self._record(event)
+        finally:
+            with self._pool_lock:
+                self._requests_in_flight -= 1
+
+    def _record(self, event: RequestEvent):
+        self.metrics.record(event)
+        for scope in list(self._metrics_scopes):
+            scope.record(event)
+
+        for hook in list(self._after_request_hooks):
+            hook(event)
+
+    def add_request_hook(self, before=None, after=None):
+        """
+        Register callables invoked around every request sent to the server (cached responses excluded).
+        :param before: (optional) Called with the method and REST url before the request is sent.
+        :param after: (optional) Called with a :class:`RequestEvent` once the request finished or failed.
+        """
+
+        with self._hooks_lock:
+            if before is not None:
+                self._before_request_hooks.append(before)
+            if after is not None:
+                self._after_request_hooks.append(after)
+
+    def remove_request_hook(self, hook):
+        """
+        Unregister a before or after request hook.
+        """
+
+        with self._hooks_lock:
+            for hooks in (self._before_request_hooks, self._after_request_hooks):
+                if hook in hooks:
+                    hooks.remove(hook)
+
+    @contextmanager
+    def measure(self):
+        """
+        Scope a block of code and collect the requests it sent, including the ones sent by worker threads
+        of bulk operations (any request of the client sent while the block runs is counted).
+
+            with wekan.measure() as metrics:
+                wekan.duplicate_board(board, "copy")
+            print(metrics.report())
+
+        :return: A :class:`RequestMetrics` of the block's requests.
+        """
+
+        scope = RequestMetrics(self.metrics.buckets)
+        with self._hooks_lock:
+            self._metrics_scopes.append(scope)
+
+        try:
+            yield scope
+        finally:
+            with self._hooks_lock:
+                self._metrics_scopes.remove(scope)
+
     def get_user_boards(self, user_id: str) -> [Board]:
         """
         Get all the boards attached to a user.
@@ -93,7 +513,18 @@ class Wykan:
         """
 
         user_boards = self.get(f"/api/users/{user_id}/boards")
-        return [self.get_board(user_board["_id"]) for user_board in user_boards]
+        self.name_index.load(("boards", user_id), user_boards, "title")
+        return [Board(self, user_board["_id"], user_board) for user_board in user_boards]
+
+    def iter_user_boards(self, user_id: str):
+        """
+        Iterate the boards attached to a user, as they're received.
+        :param user_id: ID of the user.
+        """
+
+        for user_board in self.iter_get(f"/api/users/{user_id}/boards"):
+            self.name_index.update(("boards", user_id), [user_board], "title")
+            yield Board(self, user_board["_id"], user_board)
 
     def get_board_by_title(self, user_id: str, title: str) -> Board:
         """
@@ -101,13 +532,15 @@ class Wykan:
         :param user_id: Wanted user's id.
         :param title: Title of the board wanted.
         """
-        boards = self.get_user_boards(user_id)
+        board_id = self.name_index.lookup(("boards", user_id), title)
+        if board_id is None:
+            self.get_user_boards(user_id)
+            board_id = self.name_index.lookup(("boards", user_id), title)
 
-        found_boards = list(filter(lambda board: board.title == title, boards))
-        if len(boards) <= 0:
-            raise LookupError(f"Could not find board {board_name}")
+        if board_id is None:
+            raise LookupError(f"Could not find board {title}")
 
-        return found_boards[0]
+        return Board(self, board_id, {"title": title})
 
     def delete_board(self, board_id: str):
         """
@@ -115,7 +548,14 @@ class Wykan:
         :param board_id: ID of the board to delete.
         """
 
-        self.delete(f"/api/boards/{board_id}")
+        def forget():
+            self.name_index.discard(board_id)
+            self.name_index.invalidate(("lists", board_id))
+            self.name_index.invalidate(("swimlanes", board_id))
+            if self.search_index is not None:
+                self.search_index.remove_board(board_id)
+
+        self.delete(f"/api/boards/{board_id}", deferrable=True, on_commit=forget)
 
     def delete_board_by_title(self, user_id: str, title: str):
         """
@@ -151,9 +591,10 @@ class Wykan:
         }
 
         new_board = self.post("/api/boards", new_board_details)
-        return self.get_board(new_board["_id"])
+        self.name_index.add(("boards", owner_id), title, new_board["_id"])
+        return Board(self, new_board["_id"], {"title": title})
 
-    def create_board_from_configuration(self, config: BoardConfiguration, owner_id: str, **kwargs) -> Board:
+    def create_board_from_configuration(self, config: "BoardConfiguration", owner_id: str, **kwargs) -> Board:
         """
         Creates a new board from a BoardConfiguration object.
         :param config: BoardConfiguration object containing wanted board.
@@ -164,41 +605,65 @@ class Wykan:
         :param is_comment_only: (optional) Enable comments only.
         :param permission: (optional) "private" board. Set to "public" for a public one.
         :param color: (optional) One of the allowed colors in :class:`BoardColors`
+        :param max_workers: (optional) Create lists, then cards, concurrently over this many threads.
+            Their order is kept by explicit sort values. Defaults to 1, creating everything one after another.
+        :raises ProvisioningError: In concurrent mode, if some of the lists or cards couldn't be created.
         """
         board = self.create_board(config.title, owner_id, **kwargs)
+        return self.apply_configuration(board, config, owner_id, **kwargs)
+
+    def apply_configuration(self, board: Board, config: "BoardConfiguration", owner_id: str, **kwargs) -> Board:
+        """
+        Create the lists and cards of a BoardConfiguration in an existing board.
+        :param board: The board to fill, usually a new one.
+        :param config: BoardConfiguration object containing wanted lists and cards.
+        :param owner_id: User ID of the cards' author.
+        :param max_workers: (optional) Create lists, then cards, concurrently over this many threads.
+        :raises ProvisioningError: In concurrent mode, if some of the lists or cards couldn't be created.
+        """
+        swimlane_id = board.get_swimlanes()[0].id
+        max_workers = kwargs.get("max_workers", 1)
+
+        if max_workers <= 1:
+            for l in config.lists:
+                new_list = board.create_list(l.title)
+                new_list.create_cards(l.cards, author_id=owner_id, swimlane_id=swimlane_id, max_workers=1)
+
+            return board
 
-        for l in config.lists:
-            new_list = board.create_list(l.title)
+        list_results = run_bulk(lambda item: board.create_list(item[1].title, sort=item[0]),
+                                enumerate(config.lists),
+                                max_workers)
 
-            for card in l.cards:
-                new_list.create_card(card.title, card.description)
+        card_items = [(result.value, sort, card)
+                      for result in list_results if result.ok
+                      for sort, card in enumerate(result.item[1].cards)]
+        card_results = run_bulk(lambda item: item[0]._post_card(item[2].title, item[2].description,
+                                                                owner_id, swimlane_id, item[1]),
+                                card_items,
+                                max_workers)
+
+        failures = [result for result in list_results + card_results if not result.ok]
+        if failures:
+            raise ProvisioningError(f"{len(failures)} lists and cards of board {board.id} failed: {failures[0].error}",
+                                    list_results + card_results, board)
 
         return board
 
-    def duplicate_board(self, source_board: Board, new_title: str) -> Board:
+    def duplicate_board(self, source_board: Board, new_title: str, **kwargs) -> Board:
         """
         Create a new board from an existing one with a new title.
+        Copies the board's color, permission, labels, members, swimlanes, lists and cards. The target lists and
+        cards are created while the source is still being read, see :class:`BoardDuplicator`.
         :param source_board: Board object to duplicate.
         :param new_title: wanted title for the new board.
+        :param max_workers: (optional) Number of threads creating lists and cards. Defaults to the pool size.
+        :param queue_size: (optional) Maximum number of read entities waiting to be created.
+        :raises ProvisioningError: If some of the lists or cards couldn't be copied.
         """
-        lists = []
-
-        try:
-            for l in source_board.get_lists():
-                cards = []
-
-                try:
-                    for card in l.get_cards():
-                        cards.append(CardConfiguration(card.title, card.description))
-
-                except LookupError:
-                    pass
 
-                lists.append(ListConfiguration(l.title, cards))
-        except LookupError:
-            pass
-
-        return self.create_board_from_configuration(BoardConfiguration(new_title, lists), source_board.get_admin_users()[0].id)
+        duplicator = BoardDuplicator(self, kwargs.get("max_workers"), kwargs.get("queue_size"))
+        return duplicator.duplicate(source_board, new_title)
 
     def get_board(self, id) -> Board:
         """
@@ -208,13 +673,92 @@ class Wykan:
 
         return Board(self, id)
 
+    def load_board_tree(self, board_id: str) -> BoardSnapshot:
+        """
+        Load a whole board, with its lists, swimlanes, cards, checklists and comments, in a single request.
+        :param board_id: ID of the board.
+        """
+
+        return BoardSnapshot(self, self.get(f"/api/boards/{board_id}/export"))
+
+    def search(self, query: str, **kwargs) -> [Card]:
+        """
+        Find cards by words of their title or description, in the local search index.
+        Boards that weren't indexed yet, or were indexed more than search_index_ttl seconds ago, are indexed first,
+        with a single request each.
+        :param query: Words the cards must contain. The last one may be the beginning of a word.
+        :param boards: (optional) Boards or IDs of boards to search. By default the boards indexed so far, or all the
+            boards of the logged in user if none was.
+        :param limit: (optional) Maximum number of cards returned.
+        :return: Matching cards, best matches first.
+        """
+
+        if self.search_index is None:
+            self.search_index = SearchIndex()
+
+        boards = kwargs.get("boards")
+        if boards is not None:
+            board_ids = [board.id if isinstance(board, Board) else board for board in boards]
+        else:
+            board_ids = self.search_index.board_ids or [board.id for board in self.get_user_boards(self.user.id)]
+
+        # Boards marked stale have been indexed at 0.
+        stale_ids = [board_id for board_id in board_ids if not self.search_index.indexed_at(board_id)
+                     or self.search_index_ttl is not None
+                     and time.time() - self.search_index.indexed_at(board_id) > self.search_index_ttl]
+        for board_id in stale_ids:
+            self.search_index.index_board(self.load_board_tree(board_id))
+        if stale_ids and self.search_index.path is not None:
+            self.search_index.save()
+
+        return [Card(self, entry["board_id"], entry["list_id"], entry["id"],
+                     {"title": entry["title"], "description": entry["description"]})
+                for entry in self.search_index.search(query, board_ids, kwargs.get("limit"))]
+
+    def update_cards(self, updates, **kwargs) -> [Card]:
+        """
+        Edit many cards, possibly of many boards, concurrently over the client's connection pool.
+        Within :meth:`batch`, the updates are recorded by the batch instead.
+        Updates failing with a transient error (connection error, timeout, throttling, unavailable server) are retried
+        by the client, see the `retries` parameter of :class:`Wykan`.
+        :param updates: (card, fields) pairs, with fields as passed to :meth:`Card.update`.
+            Example: [(card, {"listId": done_list.id}), (other_card, {"archive": True})]
+        :param max_workers: (optional) Maximum number of cards updated at once. Defaults to the client's pool size.
+        :param retries: (optional) Times a card still failing with a transient error after the client's own retries
+            is updated again, none by default.
+        :return: The updated cards, in the given order.
+        :raises BulkOperationError: If some of the cards couldn't be updated, with a result per card.
+        """
+
+        def update(item) -> Card:
+            card, fields = item
+            card.update(**fields)
+            return card
+
+        # Batches are per thread, the updates are recorded by the calling thread's batch and sent on its commit.
+        if getattr(self._batches, "stack", None):
+            return [update(item) for item in updates]
+
+        results = run_bulk(update, updates, kwargs.get("max_workers", self.pool_maxsize), kwargs.get("retries", 0))
+        raise_for_failures(results, "card updates")
+
+        return [result.value for result in results]
+
     def get_public_boards(self) -> [Board]:
         """
         Return a list of all public boards.
         """
 
         public_boards = self.get("/api/boards")
-        return [self.get_board(board_id["_id"]) for board_id in public_boards]
+        return [Board(self, public_board["_id"], public_board) for public_board in public_boards]
+
+    def iter_public_boards(self):
+        """
+        Iterate all public boards, as they're received.
+        """
+
+        for public_board in self.iter_get("/api/boards"):
+            yield Board(self, public_board["_id"], public_board)
 
     def delete_user_by_username(self, username: str):
         """
@@ -238,8 +782,12 @@ class Wykan:
         :return: id of the deleted user.
         """
 
-        deleted_user = self.delete(f"/api/users/{id}")
-        return deleted_user["_id"]
+        def forget():
+            self.invalidate_user(id)
+            self.name_index.discard(id)
+
+        self.delete(f"/api/users/{id}", deferrable=True, on_commit=forget)
+        return id
 
     def create_new_user(self, username: str, email: str, password: str) -> User:
         """
@@ -253,6 +801,7 @@ class Wykan:
         }
 
         new_user = self.post("/api/users", new_user_details)
+        self.name_index.add(("users",), username, new_user["_id"])
         return self.get_user(new_user["_id"])
 
     def get_user_by_username(self, username) -> User:
@@ -261,18 +810,42 @@ class Wykan:
         :param username: Username to search by
         """
 
-        users = self.get_all_users()
-        for user in users:
+        user_id = self.name_index.lookup(("users",), username)
+        if user_id is not None:
+            return self.get_user(user_id)
+
+        # Stop reading the users at the first match.
+        for user in self.iter_users():
             if user.username == username:
                 return user
 
+        return None
+
     def get_user(self, id) -> User:
         """
         Get a single user.
+        Users are shared through the client's user cache, so each user is fetched at most once per cache TTL.
         :param id: ID of the user.
         """
 
-        return User(self, id)
+        return self.user_cache.get_or_create(id, lambda: User(self, id))
+
+    def invalidate_user(self, id: str = None):
+        """
+        Drop a user from the user cache, so it's fetched again on next use.
+        :param id: ID of the user. None drops all the cached users.
+        """
+
+        self.user_cache.invalidate(id)
+
+    def iter_users(self):
+        """
+        Iterate all the users, as they're received.
+        """
+
+        for user in self.iter_get("/api/users"):
+            self.name_index.update(("users",), [user], "username")
+            yield self.user_cache.get_or_create(user["_id"], lambda: User(self, user["_id"], user))
 
     def get_all_users(self) -> [User]:
         """
@@ -280,4 +853,5 @@ class Wykan:
         """
 
         all_users = self.get("/api/users")
-        return [self.get_user(user_id["_id"]) for user_id in all_users]
+        self.name_index.load(("users",), all_users, "username")
+        return [self.user_cache.get_or_create(user["_id"], lambda: User(self, user["_id"], user)) for user in all_users]
@@ -0,0 +1,416 @@
+import asyncio
+import json
+
+from requests.exceptions import HTTPError
+
+from wykan.cache import IdentityMap, NameIndex
+from wykan.exceptions import WekanException, ProvisioningError
+from .duplication import AsyncBoardDuplicator
+from .models import AsyncBoard, AsyncBoardSnapshot, AsyncCard, AsyncList, AsyncSwimlane, AsyncUser, _gather_results
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncWykan:
+    """
+    An asyncio counterpart of :class:`wykan.Wykan`, built on aiohttp.
+    Install it with the "async" extra: pip install Wykan[async]
+
+    The client logs on when entering it as an async context manager, or on :meth:`login`:
+
+        async with AsyncWykan("https://mywekan.com", "admin", "password") as wekan:
+            boards = await wekan.get_user_boards(wekan.user.id)
+    """
+
+    verify_tls = True  # Default for new instances, use the verify_tls parameter to override it per instance.
+
+    def __init__(self, wekan_url: str, username: str, password: str, **kwargs):
+        """
+        :param wekan_url: Base url to the Wekan server. Example: https://mywekan.com/
+        :param verify_tls: (optional) Validate the server's TLS certificate. Defaults to :attr:`AsyncWykan.verify_tls`.
+        :param pool_maxsize: (optional) Maximum number of pooled connections.
+        :param pool_maxsize_per_host: (optional) Maximum number of pooled connections per host. 0 for unlimited.
+        :param keep_alive_timeout: (optional) Seconds an idle connection is kept alive.
+        :param timeout: (optional) Total timeout in seconds of every request.
+        :param max_concurrency: (optional) Maximum number of requests in flight at once.
+        :param user_cache_ttl: (optional) Seconds a fetched user is reused before it's fetched again.
+        :param user_cache_size: (optional) Maximum number of users kept in the user cache.
+        :param name_index_ttl: (optional) Seconds the username and title indexes are trusted before reloading them.
+        """
+
+        if aiohttp is None:
+            raise ImportError("AsyncWykan requires aiohttp, install it with: pip install Wykan[async]")
+
+        self.wekan_url = wekan_url
+        self.verify_tls = kwargs.get("verify_tls", AsyncWykan.verify_tls)
+        self.keep_alive_timeout = kwargs.get("keep_alive_timeout", 15)
+        self.timeout = kwargs.get("timeout")
+        self.pool_maxsize = kwargs.get("pool_maxsize", 10)
+        self.pool_maxsize_per_host = kwargs.get("pool_maxsize_per_host", 0)
+        self.max_concurrency = kwargs.get("max_concurrency", self.pool_maxsize)
+
+        self._username = username
+        self._password = password
+        self._session = None
+        self._semaphore = None
+
+        self.token = None
+        self.user = None
+        self.user_cache = IdentityMap(kwargs.get("user_cache_ttl", 300), kwargs.get("user_cache_size", 4096))
+        self.name_index = NameIndex(kwargs.get("name_index_ttl", 300))
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def login(self):
+        """
+        Log on to the Wekan server.
+        """
+
+        login_user = await self.post("/users/login",
+                                     data={"username": self._username, "password": self._password},
+                                     authed=False)
+        self.token = login_user["token"]
+        self.user = self.cached_user(login_user["id"])
+
+    async def close(self):
+        """
+        Close all the pooled connections to the Wekan server.
+        """
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        # The session has to be created inside the running event loop.
+        if self._session is None:
+            connector_kwargs = dict() if self.verify_tls else {"ssl": False}
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize,
+                                             limit_per_host=self.pool_maxsize_per_host,
+                                             keepalive_timeout=self.keep_alive_timeout,
+                                             **connector_kwargs)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._session
+
+    async def get(self, url: str, **kwargs):
+        return await self._internal_api_call(url, "get", **kwargs)
+
+    async def post(self, url: str, data: dict, **kwargs):
+        return await self._internal_api_call(url, "post", data, **kwargs)
+
+    async def delete(self, url: str, **kwargs):
+        return await self._internal_api_call(url, "delete", **kwargs)
+
+    async def put(self, url: str, data: dict, **kwargs):
+        return await self._internal_api_call(url, "put", data, **kwargs)
+
+    async def _internal_api_call(self, rest_url: str, method: str, data: dict = None, **kwargs) -> dict:
+        """
+        Issues the actual request to the Wekan server.
+
+        :param rest_url: example: /users/login
+        :param method: Type of REST method to send.
+        :param data: Dictionary to be sent in the request.
+        :param authed: Should the request be sent with authorization token.
+        :return: JSON encoded REST response.
+        """
+
+        session = self._get_session()
+        request_url = f"{self.wekan_url}{rest_url}"
+
+        headers = dict()
+        request_data = {"json": data}
+
+        # Some api requests do not require authorization.
+        if kwargs.get("authed", True):
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        # Except for the initial login request.
+        if rest_url == "/users/login":
+            request_data = {"data": data}
+
+        async with self._semaphore:
+            async with session.request(method, request_url, headers=headers, **request_data) as api_response:
+                content = await api_response.read()
+
+        # Check if the HTTP request returned successfully.
+        if api_response.status >= 400:
+            raise HTTPError(content.decode('utf-8'))
+
+        response_json = dict()
+        # Response might be valid, but return not content.
+        if not content:
+            return response_json
+
+        response_json = json.loads(content)
+
+        # Check if the REST api request hasn't caused an error.
+        if isinstance(response_json, dict) and "error" in response_json:
+            raise WekanException(str(response_json))
+
+        return response_json
+
+    async def get_user_boards(self, user_id: str, hydrate: bool = False) -> [AsyncBoard]:
+        """
+        Get all the boards attached to a user.
+        :param user_id: ID of the user.
+        :param hydrate: Fetch the full document of every board concurrently.
+        """
+
+        user_boards = await self.get(f"/api/users/{user_id}/boards")
+        self.name_index.load(("boards", user_id), user_boards, "title")
+
+        boards = [AsyncBoard(self, user_board["_id"], user_board) for user_board in user_boards]
+        if hydrate:
+            await asyncio.gather(*(board.refresh() for board in boards))
+
+        return boards
+
+    async def get_board_by_title(self, user_id: str, title: str) -> AsyncBoard:
+        """
+        Retreives a board of specified user, with specified title.
+        :param user_id: Wanted user's id.
+        :param title: Title of the board wanted.
+        """
+
+        board_id = self.name_index.lookup(("boards", user_id), title)
+        if board_id is None:
+            await self.get_user_boards(user_id)
+            board_id = self.name_index.lookup(("boards", user_id), title)
+
+        if board_id is None:
+            raise LookupError(f"Could not find board {title}")
+
+        return AsyncBoard(self, board_id, {"title": title})
+
+    async def delete_board(self, board_id: str):
+        """
+        Delete a board.
+        :param board_id: ID of the board to delete.
+        """
+
+        await self.delete(f"/api/boards/{board_id}")
+        self.name_index.discard(board_id)
+        self.name_index.invalidate(("lists", board_id))
+        self.name_index.invalidate(("swimlanes", board_id))
+
+    async def delete_board_by_title(self, user_id: str, title: str):
+        """
+        Deletes a board.
+        :param user_id: ID of the user who owns the board.
+        :param title: Title of the board to delete.
+        """
+
+        board = await self.get_board_by_title(user_id, title)
+        await self.delete_board(board.id)
+
+    async def create_board(self, title: str, owner_id: str, **kwargs) -> AsyncBoard:
+        """
+        Create a new board
+        Takes the same optional parameters as :meth:`wykan.Wykan.create_board`.
+        :param title: Name of the new board.
+        :param owner_id: ID of the owner.
+        """
+
+        new_board_details = {
+            "title": title,
+            "owner": owner_id,
+            "isAdmin": kwargs.get("is_admin", True),
+            "isActive": kwargs.get("is_active", True),
+            "isNoComments": kwargs.get("is_no_comments", False),
+            "isCommentOnly": kwargs.get("is_comment_only", False),
+            "permission": kwargs.get("permission", "private"),
+            "color": kwargs.get("color")
+        }
+
+        new_board = await self.post("/api/boards", new_board_details)
+        self.name_index.add(("boards", owner_id), title, new_board["_id"])
+        return AsyncBoard(self, new_board["_id"], {"title": title})
+
+    async def create_board_from_configuration(self, config, owner_id: str, **kwargs) -> AsyncBoard:
+        """
+        Creates a new board from a BoardConfiguration object.
+        The lists are created concurrently, then all of their cards, with explicit sort values keeping the
+        configuration's order. Takes the same optional parameters as :meth:`create_board`.
+        :param config: BoardConfiguration object containing wanted board.
+        :param owner_id: User ID of the board's creator.
+        :raises ProvisioningError: If some of the lists or cards couldn't be created.
+        """
+
+        board = await self.create_board(config.title, owner_id, **kwargs)
+        swimlane_id = (await board.get_swimlanes())[0].id
+
+        list_results = await _gather_results(enumerate(config.lists),
+                                             lambda item: board.create_list(item[1].title, sort=item[0]))
+
+        card_items = [(result.value, sort, card)
+                      for result in list_results if result.ok
+                      for sort, card in enumerate(result.item[1].cards)]
+        card_results = await _gather_results(card_items,
+                                             lambda item: item[0]._post_card(item[2].title, item[2].description,
+                                                                             owner_id, swimlane_id, item[1]))
+
+        failures = [result for result in list_results + card_results if not result.ok]
+        if failures:
+            raise ProvisioningError(f"{len(failures)} lists and cards of board {board.id} failed: {failures[0].error}",
+                                    list_results + card_results, board)
+
+        return board
+
+    async def duplicate_board(self, source_board: AsyncBoard, new_title: str, **kwargs) -> AsyncBoard:
+        """
+        Create a new board from an existing one with a new title.
+        Copies the board's color, permission, labels, members, swimlanes, lists and cards. The target lists and
+        cards are created while the source is still being read, see :class:`AsyncBoardDuplicator`.
+        :param source_board: Board object to duplicate.
+        :param new_title: wanted title for the new board.
+        :param max_workers: (optional) Number of tasks creating lists and cards. Defaults to the concurrency limit.
+        :param queue_size: (optional) Maximum number of read entities waiting to be created.
+        :raises ProvisioningError: If some of the lists or cards couldn't be copied.
+        """
+
+        duplicator = AsyncBoardDuplicator(self, kwargs.get("max_workers"), kwargs.get("queue_size"))
+        return await duplicator.duplicate(source_board, new_title)
+
+    async def get_board(self, id) -> AsyncBoard:
+        """
+        Get a single board.
+        :param id: ID of the board.
+        """
+
+        return await AsyncBoard(self, id).refresh()
+
+    async def load_board_tree(self, board_id: str) -> AsyncBoardSnapshot:
+        """
+        Load a whole board, with its lists, swimlanes, cards, checklists and comments, in a single request.
+        :param board_id: ID of the board.
+        """
+
+        return AsyncBoardSnapshot(self, await self.get(f"/api/boards/{board_id}/export"))
+
+    async def get_public_boards(self, hydrate: bool = False) -> [AsyncBoard]:
+        """
+        Return a list of all public boards.
+        :param hydrate: Fetch the full document of every board concurrently.
+        """
+
+        public_boards = await self.get("/api/boards")
+
+        boards = [AsyncBoard(self, public_board["_id"], public_board) for public_board in public_boards]
+        if hydrate:
+            await asyncio.gather(*(board.refresh() for board in boards))
+
+        return boards
+
+    async def delete_user_by_username(self, username: str):
+        """
+        Delete a single user by username.
+        USE WITH CAUTION. SEE: https://github.com/wekan/wekan/issues/1289
+        :param username: Username of the user to delete.
+        :return: id of the deleted user, None if the user doesn't exist.
+        """
+
+        user = await self.get_user_by_username(username)
+        if user is None:
+            return
+
+        return await self.delete_user(user.id)
+
+    async def delete_user(self, id: str) -> str:
+        """
+        Delete a user.
+        USE WITH CAUTION. SEE: https://github.com/wekan/wekan/issues/1289
+        :param id: id of the user to delete
+        :return: id of the deleted user.
+        """
+
+        deleted_user = await self.delete(f"/api/users/{id}")
+        self.invalidate_user(id)
+        self.name_index.discard(id)
+        return deleted_user["_id"]
+
+    async def create_new_user(self, username: str, email: str, password: str) -> AsyncUser:
+        """
+        Create a new user.
+        """
+
+        new_user_details = {
+            "username": username,
+            "email": email,
+            "password": password
+        }
+
+        new_user = await self.post("/api/users", new_user_details)
+        self.name_index.add(("users",), username, new_user["_id"])
+        return await self.get_user(new_user["_id"])
+
+    async def get_user_by_username(self, username) -> AsyncUser:
+        """
+        Get a single user by username.
+        :param username: Username to search by
+        """
+
+        user_id = self.name_index.lookup(("users",), username)
+        if user_id is None:
+            await self.get_all_users()
+            user_id = self.name_index.lookup(("users",), username)
+
+        if user_id is None:
+            return None
+
+        return await self.get_user(user_id)
+
+    async def get_user(self, id) -> AsyncUser:
+        """
+        Get a single, hydrated user. Users are shared through the client's user cache.
+        :param id: ID of the user.
+        """
+
+        user = self.cached_user(id)
+        if not user._loaded:
+            await user.refresh()
+
+        return user
+
+    def cached_user(self, id) -> AsyncUser:
+        """
+        Get the user object of an id from the user cache, without fetching it.
+        :param id: ID of the user.
+        """
+
+        return self.user_cache.get_or_create(id, lambda: AsyncUser(self, id))
+
+    def invalidate_user(self, id: str = None):
+        """
+        Drop a user from the user cache, so it's fetched again on next use.
+        :param id: ID of the user. None drops all the cached users.
+        """
+
+        self.user_cache.invalidate(id)
+
+    async def get_all_users(self, hydrate: bool = False) -> [AsyncUser]:
+        """
+        Return a list of all the users.
+        :param hydrate: Fetch the full document of every user concurrently.
+        """
+
+        all_users = await self.get("/api/users")
+        self.name_index.load(("users",), all_users, "username")
+
+        users = [self.user_cache.get_or_create(user["_id"], lambda: AsyncUser(self, user["_id"], user))
+                 for user in all_users]
+        if hydrate:
+            await asyncio.gather(*(user.refresh() for user in users))
+
+        return users
@@ -0,0 +1,190 @@
+import asyncio
+
+from wykan.bulk import BulkResult
+from wykan.exceptions import ProvisioningError, WekanException
+from .models import AsyncBoard, AsyncCard, AsyncList
+
+# Tells a worker that the source board was fully read.
+_END_OF_BOARD = object()
+
+
+class _PendingList:
+    """
+    A target list that may still be being created by another worker.
+    """
+
+    def __init__(self, title: str):
+        self.title = title
+        self.list = None
+        self.error = None
+        self._created = asyncio.Event()
+
+    def set(self, new_list: AsyncList = None, error: BaseException = None):
+        self.list = new_list
+        self.error = error
+        self._created.set()
+
+    async def wait(self) -> AsyncList:
+        await self._created.wait()
+        if self.error is not None:
+            raise WekanException(f"List {self.title} wasn't created: {self.error}")
+
+        return self.list
+
+
+class AsyncBoardDuplicator:
+    """
+    An asyncio counterpart of :class:`wykan.duplication.BoardDuplicator`, copying the same entities.
+    Worker tasks create the target lists and cards while the source is still being read, and at most `queue_size`
+    source cards wait in the queue. The client doesn't stream responses, so a source list's cards listing is
+    received whole.
+    """
+
+    def __init__(self, api, max_workers: int = None, queue_size: int = None):
+        """
+        :param api: The AsyncWykan client.
+        :param max_workers: (optional) Number of tasks creating lists and cards. Defaults to the client's
+            concurrency limit.
+        :param queue_size: (optional) Maximum number of read entities waiting to be created.
+        """
+
+        self._api = api
+        self.max_workers = max_workers or api.max_concurrency
+        self.queue_size = queue_size or self.max_workers * 4
+
+    async def duplicate(self, source_board: AsyncBoard, new_title: str) -> AsyncBoard:
+        """
+        Create a new board from an existing one with a new title.
+        Copies the board's color, permission, labels, members, swimlanes, lists and cards.
+        :param source_board: Board object to duplicate.
+        :param new_title: wanted title for the new board.
+        :raises ProvisioningError: If some of the lists or cards couldn't be copied, with the results of the failed
+            ones only.
+        """
+
+        await source_board._ensure_loaded("members", "labels", "permission", "color")
+        owner_id = (await source_board.get_admin_users())[0].id
+        target_board = await self._api.create_board(new_title, owner_id,
+                                                    permission=source_board.permission,
+                                                    color=source_board.color.value if source_board.color else None)
+        await target_board.refresh()
+
+        await self._copy_labels(source_board, target_board)
+        await self._copy_members(source_board, target_board, owner_id)
+        swimlanes, default_swimlane_id = await self._copy_swimlanes(source_board, target_board)
+
+        copied, failures = await self._copy_lists(source_board, target_board, owner_id, swimlanes,
+                                                  default_swimlane_id)
+        if failures:
+            raise ProvisioningError(f"{len(failures)} lists and cards of board {target_board.id} failed, "
+                                    f"{copied} were copied: {failures[0].error}", failures, target_board)
+
+        return target_board
+
+    async def _copy_labels(self, source_board: AsyncBoard, target_board: AsyncBoard):
+        # New boards come with default labels, only add the missing ones.
+        existing_labels = {(label.name, label.color) for label in target_board.labels}
+
+        for label in source_board.labels:
+            if (label.name, label.color) not in existing_labels:
+                await target_board.add_label(label.name, label.color)
+
+    async def _copy_members(self, source_board: AsyncBoard, target_board: AsyncBoard, owner_id: str):
+        for member in source_board.members:
+            if member.user_id != owner_id:
+                await target_board.add_board_member(member.user_id, member.is_board_admin, member.is_no_comment,
+                                                    member.is_comment_only)
+
+    async def _copy_swimlanes(self, source_board: AsyncBoard, target_board: AsyncBoard) -> (dict, str):
+        """
+        Create the source swimlanes that the target board doesn't have, matching them by title.
+        :return: Source swimlane IDs mapped to target swimlane IDs, and the target swimlane for unmapped cards.
+        """
+
+        try:
+            source_swimlanes = await source_board.get_swimlanes()
+        except LookupError:
+            source_swimlanes = []
+
+        target_swimlanes = await target_board.get_swimlanes()
+        target_ids = dict()
+        for swimlane in target_swimlanes:
+            target_ids.setdefault(swimlane.title, swimlane.id)
+
+        swimlanes = dict()
+        for swimlane in source_swimlanes:
+            if swimlane.title not in target_ids:
+                target_ids[swimlane.title] = (await target_board.add_swimlane(swimlane.title)).id
+
+            swimlanes[swimlane.id] = target_ids[swimlane.title]
+
+        default_swimlane_id = swimlanes[source_swimlanes[0].id] if source_swimlanes else target_swimlanes[0].id
+        return swimlanes, default_swimlane_id
+
+    async def _copy_lists(self, source_board: AsyncBoard, target_board: AsyncBoard, owner_id: str, swimlanes: dict,
+                          default_swimlane_id: str) -> (int, [BulkResult]):
+        """
+        Stream the source lists and cards into the target board.
+        Only the failures are kept, so memory doesn't grow with the board.
+        :return: The number of lists and cards copied, and the results of those that failed.
+        """
+
+        tasks = asyncio.Queue(maxsize=self.queue_size)
+        copied = 0
+        failures = []
+
+        # Reading each card's swimlane costs a request, which is pointless when there's only one.
+        map_swimlanes = len(swimlanes) > 1
+
+        async def create_list(pending_list: _PendingList, sort: int):
+            new_list = None
+            error = None
+            try:
+                new_list = await target_board.create_list(pending_list.title, sort=sort)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                # Even when cancelled, the workers creating its cards are waiting for it.
+                pending_list.set(new_list, error)
+
+        async def create_card(pending_list: _PendingList, card: AsyncCard, sort: int):
+            await card._ensure_loaded("title", "description", *(("swimlaneId",) if map_swimlanes else ()))
+            swimlane_id = swimlanes.get(card.swimlaneId, default_swimlane_id) if map_swimlanes else default_swimlane_id
+
+            await (await pending_list.wait())._post_card(card.title, card.description, owner_id, swimlane_id, sort)
+
+        async def work():
+            nonlocal copied
+            while True:
+                task = await tasks.get()
+                if task is _END_OF_BOARD:
+                    return
+
+                operation, args = task
+                try:
+                    await operation(*args)
+                except (Exception, WekanException) as e:
+                    failures.append(BulkResult(args[1] if operation is create_card else args[0], error=e))
+                else:
+                    copied += 1
+
+        workers = [asyncio.ensure_future(work()) for _ in range(self.max_workers)]
+        try:
+            source_lists = await self._api.get(f"/api/boards/{source_board.id}/lists")
+            for list_sort, source_list in enumerate(source_lists):
+                pending_list = _PendingList(source_list.get("title"))
+                await tasks.put((create_list, (pending_list, list_sort)))
+
+                cards = await self._api.get(f"/api/boards/{source_board.id}/lists/{source_list['_id']}/cards")
+                for card_sort, card in enumerate(cards):
+                    source_card = AsyncCard(self._api, source_board.id, source_list["_id"], card["_id"], card)
+                    await tasks.put((create_card, (pending_list, source_card, card_sort)))
+        except (Exception, WekanException) as e:
+            failures.append(BulkResult(source_board, error=e))
+        finally:
+            for _ in workers:
+                await tasks.put(_END_OF_BOARD)
+            await asyncio.gather(*workers)
+
+        return copied, failures
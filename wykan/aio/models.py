@@ -0,0 +1,506 @@
+import asyncio
+
+from wykan.bulk import BulkResult, raise_for_failures
+from wykan.models.board import Board, BoardMember
+from wykan.models import intern
+from wykan.models.card import Card
+from wykan.models.colors import Colors
+from wykan.models.list import List, _card_fields, _moves
+from wykan.models.swimlane import Swimlane
+from wykan.models.user import User
+from wykan.snapshot import BoardSnapshot
+
+
+class _AsyncWekanObject:
+    """
+    Base of the asynchronous models.
+    Fields are never fetched on attribute access, await :meth:`refresh` to load the full document.
+    Reading a field that isn't loaded raises AttributeError.
+    """
+
+    __slots__ = ()
+
+    _hydrate_on_access = False
+
+    async def refresh(self):
+        """
+        Fetch the full document of the object from the server, overriding the loaded fields.
+        """
+
+        self._populate(await self._api.get(self._url), complete=True)
+        return self
+
+    async def _ensure_loaded(self, *fields: str):
+        """
+        Fetch the full document if any of the fields isn't loaded yet.
+        """
+
+        for field in fields:
+            try:
+                getattr(self, field)
+            except AttributeError:
+                await self.refresh()
+                return
+
+
+async def _gather_results(items, operation) -> [BulkResult]:
+    """
+    Await an operation on many items concurrently, collecting a result per item.
+    The client's semaphore bounds how many requests are actually sent at once.
+    """
+
+    items = list(items)
+    values = await asyncio.gather(*(operation(item) for item in items), return_exceptions=True)
+    return [BulkResult(item, error=value) if isinstance(value, BaseException) else BulkResult(item, value)
+            for item, value in zip(items, values)]
+
+
+async def _update_cards(updates) -> ["AsyncCard"]:
+    """
+    Edit many cards concurrently.
+    :param updates: (card, fields) pairs, with fields as passed to :meth:`AsyncCard.update`.
+    :raises BulkOperationError: If some of the cards couldn't be updated, with a result per card.
+    """
+
+    async def update(item) -> AsyncCard:
+        card, fields = item
+        await card.update(**fields)
+        return card
+
+    results = await _gather_results(updates, update)
+    raise_for_failures(results, "card updates")
+
+    return [result.value for result in results]
+
+
+class AsyncUser(_AsyncWekanObject, User):
+    """
+    A Wekan user, loaded asynchronously.
+    """
+
+    __slots__ = ()
+
+
+class AsyncCard(_AsyncWekanObject, Card):
+    """
+    Wekan Card, loaded asynchronously.
+    move(), archive() and restore() return coroutines, like update().
+    """
+
+    __slots__ = ()
+
+    async def update(self, **fields):
+        """
+        Edit the card. The fields are named like in Wekan's documents, and are updated locally too.
+        """
+
+        card_data = {key: value.value if isinstance(value, Colors) else value for key, value in fields.items()}
+        result = await self._api.put(self._url, card_data)
+
+        if "archive" in card_data:
+            card_data["archived"] = bool(card_data.pop("archive"))
+        self._populate(card_data)
+        self.listId = intern(card_data.get("listId", self.listId))
+
+        return result
+
+
+class AsyncSwimlane(_AsyncWekanObject, Swimlane):
+    """
+    Wekan swimlane, loaded asynchronously.
+    """
+
+    __slots__ = ()
+
+
+class AsyncBoardMember(BoardMember):
+    """
+    A board member of an asynchronous board.
+    """
+
+    __slots__ = ()
+
+    @property
+    def user(self) -> AsyncUser:
+        """
+        The member's Wekan user, shared through the client's user cache.
+        It's only hydrated if it was loaded before, await its refresh() otherwise.
+        """
+        return self._api.cached_user(self.user_id)
+
+
+class AsyncList(_AsyncWekanObject, List):
+    """
+    Wekan List, loaded asynchronously.
+    """
+
+    __slots__ = ()
+
+    async def create_card(self, title: str, description: str, **kwargs) -> AsyncCard:
+        """
+        Add a card to the list
+        :param title: Title of the card to add.
+        :param author_id: (optional) ID of the card's author. Defaults to the first admin of the board.
+        :param swimlane_id: (optional) ID of the card's swimlane. Defaults to the first swimlane of the board.
+        """
+
+        author_id, swimlane_id = await self._card_context(kwargs.get("author_id"), kwargs.get("swimlane_id"))
+        return await self._post_card(title, description, author_id, swimlane_id)
+
+    async def create_cards(self, cards, **kwargs) -> [AsyncCard]:
+        """
+        Add many cards to the list concurrently.
+        :param cards: :class:`CardConfiguration` objects, or (title, description) tuples.
+        :param author_id: (optional) ID of the cards' author. Defaults to the first admin of the board.
+        :param swimlane_id: (optional) ID of the cards' swimlane. Defaults to the first swimlane of the board.
+        :param first_sort: (optional) Position of the first card, the next ones get consecutive positions so their
+            order is kept. Defaults to the number of cards in the list, appending the cards like Wekan does.
+        :return: The new cards, in the given order.
+        :raises BulkOperationError: If some of the cards couldn't be created.
+        """
+
+        author_id, swimlane_id = await self._card_context(kwargs.get("author_id"), kwargs.get("swimlane_id"))
+        first_sort = kwargs.get("first_sort")
+        if first_sort is None:
+            first_sort = await self._card_count()
+
+        async def post(item) -> AsyncCard:
+            index, card = item
+            return await self._post_card(*_card_fields(card), author_id, swimlane_id, first_sort + index)
+
+        results = await _gather_results(enumerate(cards), post)
+        raise_for_failures(results, f"cards of list {self.id}")
+
+        return [result.value for result in results]
+
+    async def move_all_cards(self, to_list, **kwargs) -> [AsyncCard]:
+        """
+        Move all the cards of this list to another list of the board, concurrently.
+        The cards are read with a single export of the board, and keep their order after the destination's cards.
+        :param to_list: The destination :class:`AsyncList`, or its ID.
+        :param swimlane_id: (optional) ID of the destination swimlane, the cards' current ones by default.
+        :raises BulkOperationError: If some of the cards couldn't be moved, with a result per card.
+        """
+
+        snapshot = await self._api.load_board_tree(self.boardId)
+        return await _update_cards(_moves(snapshot, self.id, to_list, kwargs.get("swimlane_id")))
+
+    async def iter_cards(self):
+        """
+        Iterate the cards in this list. The listing is received whole, the client doesn't stream responses.
+        """
+
+        for card in await self._api.get(f"/api/boards/{self.boardId}/lists/{self.id}/cards"):
+            yield AsyncCard(self._api, self.boardId, self.id, card['_id'], card)
+
+    async def get_cards(self, hydrate: bool = False) -> [AsyncCard]:
+        """
+        Get the list of all cards in this list
+        :param hydrate: Fetch the full document of every card concurrently.
+        """
+
+        cards_data = await self._api.get(f"/api/boards/{self.boardId}/lists/{self.id}/cards")
+        if len(cards_data) <= 0:
+            raise LookupError(f"Could not find cards in list {self.id}")
+
+        cards = [AsyncCard(self._api, self.boardId, self.id, card['_id'], card) for card in cards_data]
+        if hydrate:
+            await asyncio.gather(*(card.refresh() for card in cards))
+
+        return cards
+
+    async def _card_count(self) -> int:
+        return len(await self._api.get(f"/api/boards/{self.boardId}/lists/{self.id}/cards"))
+
+    async def _card_context(self, author_id: str = None, swimlane_id: str = None) -> (str, str):
+        board = AsyncBoard(self._api, self.boardId)
+
+        if author_id is None:
+            author_id = (await board.get_admin_users())[0].id
+
+        if swimlane_id is None:
+            swimlane_id = (await board.get_swimlanes())[0].id
+
+        return author_id, swimlane_id
+
+    async def _post_card(self, title: str, description: str, author_id: str, swimlane_id: str,
+                         sort: int = None) -> AsyncCard:
+        card_data = {
+            "title": title,
+            "description": description,
+            "authorId": author_id,
+            "swimlaneId": swimlane_id,
+        }
+        if sort is not None:
+            card_data["sort"] = sort
+
+        new_card = await self._api.post(f"/api/boards/{self.boardId}/lists/{self.id}/cards", card_data)
+
+        return AsyncCard(self._api, self.boardId, self.id, new_card["_id"], card_data)
+
+
+class AsyncBoard(_AsyncWekanObject, Board):
+    """
+    A Wekan board, loaded asynchronously.
+    """
+
+    __slots__ = ()
+
+    def _parse_members(self, members: list) -> [AsyncBoardMember]:
+        return [AsyncBoardMember(
+            self._api,
+            member.get("userId"),
+            member.get("isAdmin"),
+            member.get("isNoComments"),
+            member.get("isCommentOnly")
+        ) for member in members or []]
+
+    async def change_member_permissions(self, user_id, is_board_admin: bool, is_no_comments: bool,
+                                        is_comment_only: bool):
+        """
+        Change the permission of a member of the board.
+        :param user_id: ID of the user to change.
+        :param is_board_admin: Can view and edit cards, remove members, and change settings for the board.
+        :param is_no_comments: Can not see comments and activities.
+        :param is_comment_only: Can comment on cards only.
+        """
+
+        change_user_details = {
+            "isAdmin": is_board_admin,
+            "isNoComments": is_no_comments,
+            "isCommentOnly": is_comment_only
+        }
+        await self._api.post(f"/api/boards/{self.id}/members/{user_id}", change_user_details)
+
+    async def add_board_member(self, user_id, is_board_admin: bool, is_no_comments: bool, is_comment_only: bool):
+        """
+        Add a user to the board.
+        :param user_id: ID of the user to add.
+        :param is_board_admin: Can view and edit cards, remove members, and change settings for the board.
+        :param is_no_comments: Can not see comments and activities.
+        :param is_comment_only: Can comment on cards only.
+        """
+
+        add_user_details = {
+            "action": "add",
+            "isAdmin": is_board_admin,
+            "isNoComments": is_no_comments,
+            "isCommentOnly": is_comment_only
+        }
+        await self._api.post(f"/api/boards/{self.id}/members/{user_id}/add", add_user_details)
+
+    async def add_label(self, name: str, color: Colors) -> str:
+        """
+        Add a label to the board.
+        :param name: Name of the label.
+        :param color: Color of the label.
+        :return: ID of the new label.
+        """
+
+        return await self._api.put(f"/api/boards/{self.id}/labels", {"label": {"name": name, "color": color.value}})
+
+    async def snapshot(self) -> "AsyncBoardSnapshot":
+        """
+        Load the whole board, with its lists, swimlanes, cards, checklists and comments, in a single request.
+        """
+
+        return await self._api.load_board_tree(self.id)
+
+    async def get_lists(self, hydrate: bool = False) -> [AsyncList]:
+        """
+        Get all the lists in this board.
+        :param hydrate: Fetch the full document of every list concurrently.
+        """
+
+        board_lists = await self._api.get(f"/api/boards/{self.id}/lists")
+        self._api.name_index.load(("lists", self.id), board_lists, "title")
+
+        lists = [AsyncList(self._api, self.id, board_list.get("_id"), board_list) for board_list in board_lists]
+        if hydrate:
+            await asyncio.gather(*(board_list.refresh() for board_list in lists))
+
+        return lists
+
+    async def archive_cards(self, predicate) -> [AsyncCard]:
+        """
+        Archive the board's cards matching a condition, concurrently.
+        The cards are read with a single export of the board.
+        :param predicate: Callable receiving a loaded :class:`AsyncCard`, true for the cards to archive.
+            Cards that are already archived aren't passed to it.
+        :raises BulkOperationError: If some of the cards couldn't be archived, with a result per card.
+        """
+
+        snapshot = await self.snapshot()
+        cards = [card for card in snapshot.cards if not card.archived and predicate(card)]
+        return await _update_cards([(card, {"archive": True}) for card in cards])
+
+    async def iter_lists(self):
+        """
+        Iterate the lists in this board. The listing is received whole, the client doesn't stream responses.
+        """
+
+        board_lists = await self._api.get(f"/api/boards/{self.id}/lists")
+        self._api.name_index.load(("lists", self.id), board_lists, "title")
+        for board_list in board_lists:
+            yield AsyncList(self._api, self.id, board_list.get("_id"), board_list)
+
+    def get_list(self, list_id) -> AsyncList:
+        """
+        Get a single list, without loading it.
+        :param list_id: ID of the list.
+        """
+
+        return AsyncList(self._api, self.id, list_id)
+
+    async def get_list_by_title(self, list_title: str) -> AsyncList:
+        """
+        Retrieve a list by it's title from current board.
+        :param list_title: Wanted list's title.
+        """
+
+        list_id = await self._find_by_title("lists", list_title, self.get_lists)
+
+        if list_id is None:
+            raise NameError("Could not find list {}".format(list_title))
+
+        return AsyncList(self._api, self.id, list_id, {"title": list_title})
+
+    async def create_list(self, title: str, sort: int = None) -> AsyncList:
+        """
+        Add a list to the board.
+        :param title: Title of the list to add.
+        :param sort: (optional) Explicit position of the list in the board.
+        """
+
+        new_list_details = {
+            "title": title
+        }
+        if sort is not None:
+            new_list_details["sort"] = sort
+
+        new_list = await self._api.post(f"/api/boards/{self.id}/lists", new_list_details)
+        self._api.name_index.add(("lists", self.id), title, new_list["_id"])
+        return AsyncList(self._api, self.id, new_list["_id"], new_list_details)
+
+    async def bulk_create_cards(self, cards: dict, **kwargs) -> dict:
+        """
+        Add many cards to lists of the board concurrently.
+        :param cards: Maps list IDs to their new cards, as :class:`CardConfiguration` objects or (title, description) tuples.
+        :param author_id: (optional) ID of the cards' author. Defaults to the first admin of the board.
+        :param swimlane_id: (optional) ID of the cards' swimlane. Defaults to the first swimlane of the board.
+        :param first_sort: (optional) Position of the first card of every list, the next ones get consecutive
+            positions so their order is kept. Defaults to the number of cards in each list, appending the cards.
+        :return: Maps list IDs to their new cards, in the given order.
+        :raises BulkOperationError: If some of the cards couldn't be created.
+        """
+
+        author_id = kwargs.get("author_id") or (await self.get_admin_users())[0].id
+        swimlane_id = kwargs.get("swimlane_id") or (await self.get_swimlanes())[0].id
+
+        lists = {list_id: self.get_list(list_id) for list_id in cards}
+        if kwargs.get("first_sort") is not None:
+            first_sorts = {list_id: kwargs["first_sort"] for list_id in cards}
+        else:
+            counts = await asyncio.gather(*(lists[list_id]._card_count() for list_id in cards))
+            first_sorts = dict(zip(cards, counts))
+        items = [(list_id, first_sorts[list_id] + index, card)
+                 for list_id, list_cards in cards.items() for index, card in enumerate(list_cards)]
+
+        results = await _gather_results(
+            items, lambda item: lists[item[0]]._post_card(*_card_fields(item[2]), author_id, swimlane_id, item[1]))
+        raise_for_failures(results, f"cards of board {self.id}")
+
+        new_cards = {list_id: [] for list_id in cards}
+        for result in results:
+            new_cards[result.item[0]].append(result.value)
+
+        return new_cards
+
+    async def delete_list(self, list_id) -> str:
+        """
+        Delete a list from the board.
+        :param list_id: ID of the list to delete.
+        :return ID of the delete list.
+        """
+
+        deleted_list = await self._api.delete(f"/api/boards/{self.id}/lists/{list_id}")
+        self._api.name_index.discard(list_id)
+        return deleted_list
+
+    async def get_admin_users(self) -> [AsyncUser]:
+        """
+        Retrieve all board's users that are admins.
+        The users are only hydrated if they were loaded before.
+        """
+
+        await self._ensure_loaded("members")
+        admins = [member.user for member in self.members if member.is_board_admin]
+
+        if len(admins) <= 0:
+            raise LookupError(f"Could not find admin users for board {self.id}")
+
+        return admins
+
+    async def add_swimlane(self, title: str) -> AsyncSwimlane:
+        """
+        Adds a new swimlane to current board.
+        :param title: New swimlane's name.
+        """
+        swimlane_data = {
+            "title": title,
+        }
+
+        new_swimlane = await self._api.post(f"/api/boards/{self.id}/swimlanes", swimlane_data)
+        self._api.name_index.add(("swimlanes", self.id), title, new_swimlane["_id"])
+        return AsyncSwimlane(self._api, self.id, new_swimlane['_id'], swimlane_data)
+
+    async def get_swimlanes(self) -> [AsyncSwimlane]:
+        """
+        Retrieve all swimlanes on current board.
+        """
+        data = await self._api.get(f"/api/boards/{self.id}/swimlanes")
+        self._api.name_index.load(("swimlanes", self.id), data, "title")
+        swimlanes = [AsyncSwimlane(self._api, self.id, swimlane.get('_id'), swimlane) for swimlane in data]
+
+        if len(swimlanes) <= 0:
+            raise LookupError(f"Could not find swimlanes in board {self.id}")
+
+        return swimlanes
+
+    async def get_swimlane_by_title(self, title: str) -> AsyncSwimlane:
+        """
+        Retrieve a swimlane by its title from current board.
+        :param title: wanted swimlane's title.
+        """
+        swimlane_id = await self._find_by_title("swimlanes", title, self.get_swimlanes)
+
+        if swimlane_id is None:
+            raise LookupError(f"Could not find swimlane {title}")
+
+        return AsyncSwimlane(self._api, self.id, swimlane_id, {"title": title})
+
+    async def _find_by_title(self, kind: str, title: str, load):
+        scope = (kind, self.id)
+        found_id = self._api.name_index.lookup(scope, title)
+        if found_id is None:
+            try:
+                await load()
+            except LookupError:
+                return None
+
+            found_id = self._api.name_index.lookup(scope, title)
+
+        return found_id
+
+
+class AsyncBoardSnapshot(BoardSnapshot):
+    """
+    A whole board loaded from a single export, with asynchronous models.
+    The export holds only some fields of the users, await their refresh() to load the rest.
+    """
+
+    _board_class = AsyncBoard
+    _list_class = AsyncList
+    _swimlane_class = AsyncSwimlane
+    _card_class = AsyncCard
+    _user_class = AsyncUser
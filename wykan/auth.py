@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+
+class TokenCache:
+    """
+    Persists login tokens in a file, so short lived processes can reuse them instead of logging on again.
+    Tokens are kept per Wekan url and username, until they expire.
+    The file holds credentials, it's created readable by its owner only.
+    """
+
+    def __init__(self, path: str, default_ttl: float = 24 * 60 * 60):
+        """
+        :param path: Path of the cache file.
+        :param default_ttl: Seconds a token is trusted when the server didn't report its expiry.
+        """
+
+        self.path = os.path.expanduser(path)
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(wekan_url: str, username: str) -> str:
+        return f"{wekan_url.rstrip('/')}|{username}"
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as fd:
+                return json.load(fd)
+        except (OSError, ValueError):
+            return dict()
+
+    def _write(self, entries: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temporary_path = tempfile.mkstemp(dir=directory, prefix=".wykan-tokens-")
+        try:
+            with os.fdopen(fd, "w") as temporary_file:
+                json.dump(entries, temporary_file)
+            os.chmod(temporary_path, 0o600)
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def load(self, wekan_url: str, username: str) -> (str, str):
+        """
+        Get a cached token that hasn't expired.
+        :return: The token and the ID of its user, or None if there's no valid token.
+        """
+
+        with self._lock:
+            entry = self._read().get(self._key(wekan_url, username))
+
+        if entry is None or entry.get("expires", 0) <= time.time():
+            return None
+
+        return entry["token"], entry["user_id"]
+
+    def store(self, wekan_url: str, username: str, token: str, user_id: str, expires: str = None):
+        """
+        Cache a token.
+        :param expires: Expiry of the token as reported by the server. Example: 2021-01-01T00:00:00.000Z
+        """
+
+        expires_at = _parse_expiry(expires) or time.time() + self.default_ttl
+
+        with self._lock:
+            entries = {key: entry for key, entry in self._read().items() if entry.get("expires", 0) > time.time()}
+            entries[self._key(wekan_url, username)] = {"token": token, "user_id": user_id, "expires": expires_at}
+            self._write(entries)
+
+    def discard(self, wekan_url: str, username: str):
+        """
+        Drop the cached token of a user, for example after the server rejected it.
+        """
+
+        with self._lock:
+            entries = self._read()
+            if entries.pop(self._key(wekan_url, username), None) is not None:
+                self._write(entries)
+
+
+def _parse_expiry(expires: str):
+    """
+    Convert an expiry reported by Wekan to a unix timestamp, None if it can't be parsed.
+    """
+
+    if not expires:
+        return None
+
+    try:
+        return datetime.fromisoformat(expires.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
@@ -0,0 +1,162 @@
+import threading
+
+from .bulk import BulkResult, raise_for_failures, run_bulk
+from .exceptions import WekanException
+from .metrics import COLLECTIONS, KEYWORDS
+
+
+class BatchOperation:
+    """
+    A write recorded by a :class:`WriteBatch`, returned instead of the response while the batch is open.
+    """
+
+    def __init__(self, method: str, url: str, data: dict = None, on_commit=None):
+        """
+        :param on_commit: (optional) Called once the write was sent successfully, to update local state.
+        """
+
+        self.method = method
+        self.url = url
+        self.data = dict(data) if data is not None else None
+        self.resource, self.depth = _resource(url)
+        self.result = None
+        self.on_commit = [on_commit] if on_commit is not None else []
+
+    def __repr__(self):
+        return f"<BatchOperation {self.method.upper()} {self.url}>"
+
+
+class WriteBatch:
+    """
+    A unit of work: writes issued through the client while the batch is open in the current thread are recorded
+    instead of being sent, and sent together on commit.
+
+    Repeated writes to the same url are merged into one request, and a delete drops the pending writes of the deleted
+    resource and everything under it. On commit, resources are written parents first (boards, then lists, then cards),
+    writes of independent resources in parallel and writes of the same resource in the order they were recorded.
+    A failed write doesn't stop the others, the commit raises once they were all sent.
+
+    Only writes whose response isn't needed are recorded, creating objects is still sent immediately.
+    The client's caches and the written models are updated once their write is sent, nothing changes locally if the
+    batch is discarded.
+    """
+
+    def __init__(self, api, max_workers: int = 4):
+        """
+        :param api: The Wykan client the writes are sent through.
+        :param max_workers: Maximum number of requests sent at once on commit.
+        """
+
+        self._api = api
+        self.max_workers = max_workers
+        self.results = None
+        self._operations = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._api._open_batch(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._api._close_batch(self)
+
+        # Nothing is sent if the block failed.
+        if exc_type is not None:
+            self.discard()
+            return
+
+        self.commit()
+
+    def __len__(self):
+        return len(self._operations)
+
+    def record(self, method: str, url: str, data: dict = None, on_commit=None) -> BatchOperation:
+        """
+        Record a write, merging it with the pending writes it supersedes.
+        :param on_commit: (optional) Called once the write was sent successfully.
+        :return: The pending operation, its result is set on commit.
+        """
+
+        operation = BatchOperation(method, url, data, on_commit)
+
+        with self._lock:
+            if method == "delete":
+                self._operations = [pending for pending in self._operations
+                                    if not _is_under(pending.resource, operation.resource)]
+            else:
+                last = next((pending for pending in reversed(self._operations)
+                             if pending.resource == operation.resource), None)
+                if last is not None and last.method == method and last.url == url \
+                        and last.data is not None and operation.data is not None:
+                    last.data.update(operation.data)
+                    last.on_commit.extend(operation.on_commit)
+                    return last
+
+            self._operations.append(operation)
+
+        return operation
+
+    def discard(self):
+        """
+        Drop the pending writes without sending them.
+        """
+
+        with self._lock:
+            self._operations = []
+
+    def commit(self) -> [BulkResult]:
+        """
+        Send the pending writes.
+        :return: A result per sent request, in the order the writes were recorded.
+        :raises BulkOperationError: If some of the writes failed, with a result per request. The others were sent.
+        """
+
+        with self._lock:
+            operations, self._operations = self._operations, []
+
+        # Writes of the same resource are sent in sequence, by a single worker.
+        by_resource = dict()
+        for operation in operations:
+            by_resource.setdefault(operation.resource, []).append(operation)
+
+        def send(resource_operations: [BatchOperation]):
+            for operation in resource_operations:
+                try:
+                    operation.result = BulkResult(operation, self._api._internal_api_call(
+                        operation.url, operation.method, operation.data))
+                except (Exception, WekanException) as e:
+                    operation.result = BulkResult(operation, error=e)
+                    continue
+
+                # The write was sent, a failing callback must not stop the next writes of the resource.
+                try:
+                    for callback in operation.on_commit:
+                        callback()
+                except (Exception, WekanException) as e:
+                    operation.result = BulkResult(operation, operation.result.value, e)
+
+        for depth in sorted({operation.depth for operation in operations}):
+            run_bulk(send, [group for group in by_resource.values() if group[0].depth == depth], self.max_workers)
+
+        self.results = [operation.result for operation in operations]
+        raise_for_failures(self.results, "batched writes")
+        return self.results
+
+
+def _resource(url: str) -> (str, int):
+    """
+    Get the resource a REST url writes, and its depth in the hierarchy of resources.
+    Example: /api/boards/abc/members/def/add -> /api/boards/abc/members/def, 2
+    """
+
+    segments = url.split("?", 1)[0].rstrip("/").split("/")
+    end, depth = len(segments), 0
+    for i in range(1, len(segments)):
+        if segments[i - 1] in COLLECTIONS and segments[i] and segments[i] not in KEYWORDS:
+            end, depth = i + 1, depth + 1
+
+    return "/".join(segments[:end]), depth
+
+
+def _is_under(resource: str, ancestor: str) -> bool:
+    return resource == ancestor or resource.startswith(ancestor + "/")
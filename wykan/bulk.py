@@ -0,0 +1,85 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .exceptions import BulkOperationError, WekanException
+
+# HTTP statuses of failures worth retrying: timeouts, throttling and unavailable servers.
+TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class BulkResult:
+    """
+    The outcome of a single item of a bulk operation.
+    """
+
+    def __init__(self, item, value=None, error: BaseException = None):
+        """
+        :param item: The item the operation was run on.
+        :param value: Value returned by the operation.
+        :param error: Exception raised by the operation, None if it succeeded.
+        """
+
+        self.item = item
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether a failed request may succeed if sent again: connection errors, timeouts and transient HTTP statuses.
+    """
+
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in TRANSIENT_STATUSES
+
+
+def run_bulk(operation, items, max_workers: int = 1, retries: int = 0, backoff: float = 0.1) -> [BulkResult]:
+    """
+    Run an operation on many items over a bounded thread pool.
+    :param operation: Callable receiving a single item.
+    :param items: Items to run the operation on.
+    :param max_workers: Maximum number of operations running at once.
+    :param retries: Times an operation failing with a transient error is run again. Only for idempotent operations.
+    :param backoff: Seconds before the first retry, doubled on every retry.
+    :return: A result per item, in the order of the items.
+    """
+
+    def run(item) -> BulkResult:
+        attempt = 0
+        while True:
+            try:
+                return BulkResult(item, operation(item))
+            except (Exception, WekanException) as e:
+                if attempt >= retries or not is_transient(e):
+                    return BulkResult(item, error=e)
+
+            time.sleep(backoff * 2 ** attempt)
+            attempt += 1
+
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [run(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(run, items))
+
+
+def raise_for_failures(results: [BulkResult], description: str):
+    """
+    Raise a :class:`BulkOperationError` if any of the results failed.
+    :param description: What the operation was, used in the error message.
+    """
+
+    failures = [result for result in results if not result.ok]
+    if failures:
+        raise BulkOperationError(f"{len(failures)} of {len(results)} {description} failed: {failures[0].error}",
+                                 results)
@@ -0,0 +1,477 @@
+import copy
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+class IdentityMap:
+    """
+    Keeps a single object per id, so every reference to an entity shares the same (lazily hydrated) instance.
+    Entries expire after a TTL, and the least recently used ones are evicted once the map is full.
+    """
+
+    def __init__(self, ttl: float = None, max_size: int = None):
+        """
+        :param ttl: Seconds an object is kept before it's recreated. None keeps objects until evicted.
+        :param max_size: Maximum number of objects kept. None for unbounded.
+        """
+
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, id: str) -> bool:
+        return self.get(id) is not None
+
+    def get(self, id: str):
+        """
+        Get the cached object of an id, None if it isn't cached or has expired.
+        :param id: ID of the object.
+        """
+
+        with self._lock:
+            entry = self._entries.get(id)
+            if entry is None:
+                return None
+
+            obj, created_at = entry
+            if self.ttl is not None and time.monotonic() - created_at > self.ttl:
+                del self._entries[id]
+                return None
+
+            self._entries.move_to_end(id)
+            return obj
+
+    def get_or_create(self, id: str, factory):
+        """
+        Get the cached object of an id, creating it if it isn't cached.
+        :param id: ID of the object.
+        :param factory: Callable returning a new object for the id.
+        """
+
+        with self._lock:
+            obj = self.get(id)
+            if obj is None:
+                obj = factory()
+                self.put(id, obj)
+
+            return obj
+
+    def put(self, id: str, obj):
+        """
+        Cache an object, replacing the previous object of the id.
+        """
+
+        with self._lock:
+            self._entries[id] = (obj, time.monotonic())
+            self._entries.move_to_end(id)
+
+            while self.max_size is not None and len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, id: str = None):
+        """
+        Drop an object from the map, so it's refetched on next use.
+        :param id: ID of the object to drop. None drops all the objects.
+        """
+
+        with self._lock:
+            if id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(id, None)
+
+
+class NameIndex:
+    """
+    Maps names (usernames, titles) to ids, within scopes such as the boards of a user or the lists of a board.
+    Scopes are loaded from collection payloads, expire after a TTL, and are updated incrementally on changes.
+    """
+
+    def __init__(self, ttl: float = None):
+        """
+        :param ttl: Seconds a loaded scope is trusted before it has to be loaded again. None to never expire.
+        """
+
+        self.ttl = ttl
+        self._scopes = dict()
+        self._lock = threading.RLock()
+
+    def is_loaded(self, scope: tuple) -> bool:
+        """
+        Whether a scope was loaded and hasn't expired yet.
+        """
+
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None:
+                return False
+
+            if self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._scopes[scope]
+                return False
+
+            return True
+
+    def lookup(self, scope: tuple, name: str):
+        """
+        Get the id of a name, None if it isn't known.
+        :param scope: Scope of the name. Example: ("lists", board_id)
+        :param name: Wanted name.
+        """
+
+        with self._lock:
+            if not self.is_loaded(scope):
+                return None
+
+            return self._scopes[scope][0].get(name)
+
+    def load(self, scope: tuple, entries: [dict], key: str):
+        """
+        Replace the names of a scope from a collection payload.
+        The first entry wins when a name is repeated.
+        :param scope: Scope to load.
+        :param entries: Wekan documents, each with an `_id` and the name field.
+        :param key: Name field of the documents. Example: title
+        """
+
+        names = dict()
+        for entry in entries:
+            if entry.get(key) is not None:
+                names.setdefault(entry[key], entry["_id"])
+
+        with self._lock:
+            self._scopes[scope] = (names, time.monotonic())
+
+    def update(self, scope: tuple, entries: [dict], key: str):
+        """
+        Merge names into a scope, creating it if needed, for example while a collection is being streamed.
+        A partially loaded scope is safe: lookups that miss fall back to loading the scope.
+        """
+
+        with self._lock:
+            if not self.is_loaded(scope):
+                self._scopes[scope] = (dict(), time.monotonic())
+
+            names = self._scopes[scope][0]
+            for entry in entries:
+                if entry.get(key) is not None:
+                    names.setdefault(entry[key], entry["_id"])
+
+    def add(self, scope: tuple, name: str, id: str):
+        """
+        Add a name to a loaded scope. A scope that isn't loaded is left to be loaded on its next lookup.
+        """
+
+        with self._lock:
+            if self.is_loaded(scope):
+                self._scopes[scope][0].setdefault(name, id)
+
+    def discard(self, id: str):
+        """
+        Remove every name pointing to an id.
+        """
+
+        with self._lock:
+            for names, _ in self._scopes.values():
+                for name in [name for name, name_id in names.items() if name_id == id]:
+                    del names[name]
+
+    def invalidate(self, scope: tuple = None):
+        """
+        Drop a scope, so it's loaded again on next lookup.
+        :param scope: Scope to drop. None drops all the scopes.
+        """
+
+        with self._lock:
+            if scope is None:
+                self._scopes.clear()
+            else:
+                self._scopes.pop(scope, None)
+
+
+class CachedResponse:
+    """
+    A cached GET response.
+    """
+
+    def __init__(self, content: bytes, expires_at: float, etag: str = None, last_modified: str = None):
+        self.content = content
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    @property
+    def validators(self) -> dict:
+        """
+        Conditional request headers revalidating this response, empty if the server sent no validators.
+        """
+
+        headers = dict()
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+    def json(self):
+        # Parsed on every hit, so callers never share (and mutate) the same objects.
+        return json.loads(self.content) if self.content else dict()
+
+
+class ResponseCache:
+    """
+    A memory bounded LRU cache of GET responses, with TTLs per url pattern.
+    Writes (post, put, delete) invalidate the cached responses of the resource they touch, its sub-resources,
+    its parent resources, and the listings registered as related to it.
+    Expired responses that carry an ETag or Last-Modified are revalidated instead of refetched.
+    """
+
+    DEFAULT_TTLS = [
+        (r"^/api/users(/[^/]+)?$", 300),
+        (r"/cards(/[^/]+)?$", 5),
+    ]
+
+    DEFAULT_RELATED = [
+        # Board changes show up in the board listings of users.
+        (r"^/api/boards(?:/|$)", r"^/api/users/[^/]+/boards$"),
+        # And anything written in a board shows up in its export.
+        (r"^/api/boards/([^/]+)/", r"^/api/boards/\1/export$"),
+    ]
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, default_ttl: float = 30, ttls: [tuple] = None,
+                 related: [tuple] = None):
+        """
+        :param max_bytes: Maximum total size of the cached response bodies.
+        :param default_ttl: Seconds a response is fresh when no TTL pattern matches its url.
+        :param ttls: (pattern, seconds) pairs, the first pattern matching a url sets its TTL. 0 disables caching.
+            Defaults to :attr:`DEFAULT_TTLS`.
+        :param related: (write pattern, cached pattern) pairs. A write to a url matching the first pattern also
+            invalidates the cached urls matching the second, where \\1, \\2... stand for the groups of the write's
+            match. Defaults to :attr:`DEFAULT_RELATED`.
+        """
+
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._ttls = [(re.compile(pattern), ttl) for pattern, ttl in (self.DEFAULT_TTLS if ttls is None else ttls)]
+        self._related = [(re.compile(write), cached)
+                         for write, cached in (self.DEFAULT_RELATED if related is None else related)]
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Total size of the cached response bodies.
+        """
+        return self._size
+
+    def stats(self) -> dict:
+        """
+        Counters to tune the cache with.
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+    def ttl(self, url: str) -> float:
+        for pattern, ttl in self._ttls:
+            if pattern.search(url):
+                return ttl
+
+        return self.default_ttl
+
+    def lookup(self, url: str) -> CachedResponse:
+        """
+        Get the cached response of a url, fresh or not. Counts a hit only for fresh responses.
+        :return: The cached response, None if there's none.
+        """
+
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or not entry.fresh:
+                self.misses += 1
+                if entry is not None and not entry.validators:
+                    self._remove(url)
+                    return None
+
+                return entry
+
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return entry
+
+    def store(self, url: str, content: bytes, headers: dict):
+        """
+        Cache the response of a url.
+        :param headers: The response headers, for the ETag and Last-Modified validators.
+        """
+
+        ttl = self.ttl(url)
+        if ttl <= 0 or len(content) > self.max_bytes:
+            return
+
+        entry = CachedResponse(content, time.monotonic() + ttl, headers.get("ETag"), headers.get("Last-Modified"))
+
+        with self._lock:
+            self._remove(url)
+            self._entries[url] = entry
+            self._size += len(content)
+
+            while self._size > self.max_bytes:
+                evicted_url = next(iter(self._entries))
+                self._remove(evicted_url)
+                self.evictions += 1
+
+    def revalidated(self, url: str) -> CachedResponse:
+        """
+        Mark a cached response as still valid after the server answered 304 Not Modified.
+        """
+
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl(url)
+                self._entries.move_to_end(url)
+                self.revalidations += 1
+
+            return entry
+
+    def invalidate(self, url: str = None):
+        """
+        Drop the cached responses related to a written url.
+        :param url: The written url. None drops the whole cache.
+        """
+
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+                self._size = 0
+                return
+
+            path = url.rstrip("/")
+            ancestors = set()
+            parent = path
+            while "/" in parent:
+                parent = parent.rsplit("/", 1)[0]
+                ancestors.add(parent)
+
+            related = []
+            for write, cached in self._related:
+                match = write.search(path)
+                if match is not None:
+                    related.append(re.compile(_expand(match, cached)))
+
+            for cached_url in list(self._entries):
+                if cached_url == path or cached_url.startswith(path + "/") or cached_url in ancestors \
+                        or any(pattern.search(cached_url) for pattern in related):
+                    self._remove(cached_url)
+                    self.invalidations += 1
+
+    def _remove(self, url: str):
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self._size -= len(entry.content)
+
+
+def _expand(match, pattern: str) -> str:
+    """
+    Replace the \\1, \\2... of a pattern with the escaped groups of a match.
+    """
+
+    return re.sub(r"\\(\d+)", lambda reference: re.escape(match.group(int(reference.group(1))) or ""), pattern)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Shares a single call between the threads asking for the same key at the same time.
+    The first thread runs the call, the others wait for it and get a copy of its result, or its exception.
+    Nothing is kept once the call returns, later calls run again.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = dict()
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._flights)}
+
+    def do(self, key, call):
+        """
+        Run a call, or wait for the identical one already running.
+        :param key: Identity of the call. Example: the url of a GET.
+        :param call: Callable without parameters.
+        """
+
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.shared += 1
+                flight.waiters += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+
+            # Every waiter gets its own copy of the snapshot, which it may modify.
+            return copy.deepcopy(flight.value)
+
+        value = None
+        try:
+            value = call()
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                waiters = flight.waiters
+
+            # The leader may modify its result as soon as it returns, the waiters copy a snapshot taken before.
+            if waiters and flight.error is None:
+                flight.value = copy.deepcopy(value)
+            flight.done.set()
@@ -0,0 +1,139 @@
+import threading
+
+from . import Wykan
+from .bulk import BulkResult, run_bulk
+
+
+class ClusterResult(BulkResult):
+    """
+    A value or error returned by one of the instances of a cluster.
+    """
+
+    @property
+    def origin(self) -> str:
+        """
+        Name of the instance the result came from.
+        """
+        return self.item
+
+
+class WykanCluster:
+    """
+    Many Wekan servers, each reached through its own :class:`Wykan` client.
+    Operations fan out to all the instances in parallel, and every instance runs at most max_concurrency of
+    them at once.
+    """
+
+    def __init__(self, instances: dict = None, **kwargs):
+        """
+        :param instances: (optional) Maps names of instances to their :class:`Wykan` client,
+            or to the (wekan_url, username, password) to create it with.
+        :param max_concurrency: (optional) Maximum number of operations running at once per instance, 4 by default.
+        :param client_kwargs: (optional) Extra parameters of the clients created by the cluster.
+        """
+
+        self.max_concurrency = kwargs.get("max_concurrency", 4)
+        self.client_kwargs = kwargs.get("client_kwargs", {})
+        self.clients = dict()
+        self._semaphores = dict()
+
+        for name, instance in (instances or {}).items():
+            self.add(name, instance)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getitem__(self, name: str) -> Wykan:
+        return self.clients[name]
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def add(self, name: str, instance):
+        """
+        Add an instance to the cluster.
+        :param instance: Its :class:`Wykan` client, or the (wekan_url, username, password) to create it with.
+        """
+
+        if not isinstance(instance, Wykan):
+            wekan_url, username, password = instance
+            client_kwargs = dict(self.client_kwargs)
+            client_kwargs.setdefault("pool_maxsize", self.max_concurrency)
+            instance = Wykan(wekan_url, username, password, **client_kwargs)
+
+        self.clients[name] = instance
+        self._semaphores[name] = threading.BoundedSemaphore(self.max_concurrency)
+
+    def close(self):
+        for client in self.clients.values():
+            client.close()
+
+    def map(self, operation, instances: [str] = None) -> [ClusterResult]:
+        """
+        Run an operation on every instance in parallel.
+        :param operation: Callable receiving the :class:`Wykan` client of an instance.
+        :param instances: (optional) Names of the instances to run on, all of them by default.
+        :return: A result per instance, in the order of the instances.
+        """
+
+        names = list(instances) if instances is not None else list(self.clients)
+
+        def run(name: str):
+            with self._semaphores[name]:
+                return operation(self.clients[name])
+
+        return [ClusterResult(result.item, result.value, result.error)
+                for result in run_bulk(run, names, max_workers=len(names))]
+
+    def get_user_by_username(self, username: str) -> [ClusterResult]:
+        """
+        Find a user on every instance.
+        :return: The user of every instance it was found on, and the errors of the instances that failed.
+        """
+
+        return [result for result in self.map(lambda wekan: wekan.get_user_by_username(username))
+                if not result.ok or result.value is not None]
+
+    def get_board_by_title(self, title: str) -> [ClusterResult]:
+        """
+        Find a board of the logged in user on every instance.
+        :return: The board of every instance it was found on, and the errors of the instances that failed.
+        """
+
+        def find(wekan: Wykan):
+            try:
+                return wekan.get_board_by_title(wekan.user.id, title)
+            except LookupError:
+                return None
+
+        return [result for result in self.map(find) if not result.ok or result.value is not None]
+
+    def get_public_boards(self) -> [ClusterResult]:
+        """
+        Get the public boards of all the instances.
+        :return: A result per board, and the errors of the instances that failed.
+        """
+
+        return _flatten(self.map(lambda wekan: wekan.get_public_boards()))
+
+    def get_all_users(self) -> [ClusterResult]:
+        """
+        Get the users of all the instances.
+        :return: A result per user, and the errors of the instances that failed.
+        """
+
+        return _flatten(self.map(lambda wekan: wekan.get_all_users()))
+
+
+def _flatten(results: [ClusterResult]) -> [ClusterResult]:
+    flattened = []
+    for result in results:
+        if result.ok:
+            flattened.extend(ClusterResult(result.origin, value) for value in result.value)
+        else:
+            flattened.append(result)
+
+    return flattened
@@ -9,11 +9,10 @@ if __name__ == '__main__':
     wekan_url = "http://localhost/"
     username = "admin"
     password = "Password1"
-    Wykan.verify_tls = False
-    wekan = Wykan(wekan_url, username, password)
 
-    user = wekan.get_user_by_username('admin')
-    wekan.create_board_from_configuration(config, user.id)
+    with Wykan(wekan_url, username, password, verify_tls=False) as wekan:
+        user = wekan.get_user_by_username('admin')
+        wekan.create_board_from_configuration(config, user.id)
 
-    board = wekan.get_board_by_title(user.id, config.title)
-    wekan.duplicate_board(board, "dup test")
+        board = wekan.get_board_by_title(user.id, config.title)
+        wekan.duplicate_board(board, "dup test")
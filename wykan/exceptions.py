@@ -3,3 +3,25 @@ class WekanException(BaseException):
     Raised if an exception occurred on the Wekan server.
     """
     pass
+
+
+class BulkOperationError(WekanException):
+    """
+    Raised if some of the items of a bulk operation failed.
+    results: A :class:`wykan.bulk.BulkResult` per item, successful ones included.
+    """
+
+    def __init__(self, message: str, results: list):
+        super().__init__(message)
+        self.results = results
+
+
+class ProvisioningError(BulkOperationError):
+    """
+    Raised if some of the lists or cards of a board created from a configuration failed.
+    board: The created board, with everything that succeeded.
+    """
+
+    def __init__(self, message: str, results: list, board):
+        super().__init__(message, results)
+        self.board = board
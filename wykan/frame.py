@@ -0,0 +1,289 @@
+import bisect
+import math
+import threading
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from itertools import compress
+
+from .bulk import run_bulk, raise_for_failures
+
+DAY = 24 * 60 * 60
+DEFAULT_AGE_BUCKETS = (1, 7, 30, 90, 365)
+
+
+class _Dictionary:
+    """
+    Dictionary encoding of a column: every distinct value is stored once, rows hold its code.
+    """
+
+    def __init__(self):
+        self.values = []
+        self._codes = dict()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def lookup(self, value) -> int:
+        """
+        Code of a value, None if no row holds it.
+        """
+        return self._codes.get(value)
+
+    def code(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+
+        return code
+
+
+class WipStatus:
+    """
+    Open cards of a list against its WIP limit.
+    """
+
+    def __init__(self, board_id: str, list_id: str, title: str, cards: int, limit: int = None, soft: bool = False):
+        """
+        :param limit: The list's WIP limit, None if it's not enabled.
+        :param soft: Whether the limit may be exceeded.
+        """
+
+        self.board_id = board_id
+        self.list_id = list_id
+        self.title = title
+        self.cards = cards
+        self.limit = limit
+        self.soft = soft
+
+    @property
+    def over_limit(self) -> bool:
+        return self.limit is not None and self.cards > self.limit
+
+    def __repr__(self):
+        return f"<WipStatus {self.title}: {self.cards}/{self.limit}>"
+
+
+class BoardFrame:
+    """
+    Cards of one or many boards stored by column, for analytics over many boards.
+    IDs are dictionary encoded and columns are compact arrays: a card costs a few dozen bytes instead of a
+    model object, and aggregations run over whole columns.
+    Multi-valued columns (labels, members) are stored as (row, code) pairs.
+    """
+
+    def __init__(self):
+        self.boards = _Dictionary()
+        self.lists = _Dictionary()
+        self.swimlanes = _Dictionary()
+        self.labels = _Dictionary()
+        self.users = _Dictionary()
+
+        self.card_ids = []
+        self.board = array("L")
+        self.list = array("L")
+        self.swimlane = array("L")
+        self.archived = array("b")
+        # Unix timestamps, NaN when unknown.
+        self.created_at = array("d")
+        self.modified_at = array("d")
+
+        self.label_rows = array("L")
+        self.label_codes = array("L")
+        self.member_rows = array("L")
+        self.member_codes = array("L")
+
+        # List ID -> (board ID, title, wipLimit document, archived)
+        self.list_details = dict()
+
+        # Mask of the open cards, computed on first use after cards were added.
+        self._open_mask = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.card_ids)
+
+    @classmethod
+    def load(cls, api, board_ids: [str], **kwargs) -> "BoardFrame":
+        """
+        Load the cards of many boards, with a single export request per board.
+        Each export is converted to columns as soon as it's received and dropped, the boards' rows are in the order
+        their exports arrived.
+        :param api: The Wykan client.
+        :param board_ids: IDs of the boards.
+        :param max_workers: (optional) Boards exported at once, 1 by default.
+        :raises BulkOperationError: If some of the boards couldn't be exported.
+        """
+
+        frame = cls()
+        results = run_bulk(lambda board_id: frame.add_board(api.get(f"/api/boards/{board_id}/export")), board_ids,
+                           kwargs.get("max_workers", 1))
+        raise_for_failures(results, "board exports")
+
+        return frame
+
+    def add_board(self, export: dict):
+        """
+        Append the cards of a board.
+        :param export: Document returned by the board export endpoint.
+        """
+
+        with self._lock:
+            self._add_board(export)
+
+    def _add_board(self, export: dict):
+        self._open_mask = None
+        board_code = self.boards.code(export["_id"])
+        for board_list in export.get("lists") or []:
+            self.list_details[board_list["_id"]] = (export["_id"], board_list.get("title"),
+                                                    board_list.get("wipLimit"), bool(board_list.get("archived")))
+
+        for card in export.get("cards") or []:
+            row = len(self.card_ids)
+            self.card_ids.append(card["_id"])
+            self.board.append(board_code)
+            self.list.append(self.lists.code(card.get("listId")))
+            self.swimlane.append(self.swimlanes.code(card.get("swimlaneId")))
+            self.archived.append(bool(card.get("archived")))
+            self.created_at.append(_timestamp(card.get("createdAt")))
+            self.modified_at.append(_timestamp(card.get("modifiedAt")))
+
+            for label_id in card.get("labelIds") or []:
+                self.label_rows.append(row)
+                self.label_codes.append(self.labels.code(label_id))
+
+            for user_id in set(card.get("members") or []) | set(card.get("assignees") or []):
+                self.member_rows.append(row)
+                self.member_codes.append(self.users.code(user_id))
+
+    def _open_rows(self) -> [bool]:
+        """
+        Mask of the cards that are neither archived nor in an archived list.
+        """
+
+        if self._open_mask is None:
+            archived_lists = {self.lists.lookup(list_id)
+                              for list_id, details in self.list_details.items() if details[3]}
+            self._open_mask = [not archived and list_code not in archived_lists
+                               for archived, list_code in zip(self.archived, self.list)]
+
+        return self._open_mask
+
+    def cards_per_list(self, include_archived: bool = False) -> dict:
+        """
+        :return: Number of cards of every list ID.
+        """
+
+        codes = self.list if include_archived else compress(self.list, self._open_rows())
+        return {self.lists.values[code]: count for code, count in Counter(codes).items()}
+
+    def wip(self) -> [WipStatus]:
+        """
+        Open cards of every open list against its WIP limit.
+        """
+
+        counts = self.cards_per_list()
+        statuses = []
+        for list_id, (board_id, title, wip_limit, archived) in self.list_details.items():
+            if archived:
+                continue
+
+            wip_limit = wip_limit or {}
+            limit = wip_limit.get("value") if wip_limit.get("enabled") else None
+            statuses.append(WipStatus(board_id, list_id, title, counts.get(list_id, 0), limit,
+                                      bool(wip_limit.get("soft"))))
+
+        return statuses
+
+    def ages(self, now: float = None) -> array:
+        """
+        Days since every open card was created.
+        """
+
+        now = time.time() if now is None else now
+        created = [created_at for created_at in compress(self.created_at, self._open_rows())
+                   if not math.isnan(created_at)]
+        return array("d", ((now - created_at) / DAY for created_at in created))
+
+    def age_distribution(self, buckets: tuple = DEFAULT_AGE_BUCKETS, now: float = None) -> dict:
+        """
+        Count the open cards by age.
+        :param buckets: Upper bounds of the buckets, in days.
+        :return: Number of cards of every bucket, keyed by its upper bound. Older cards are keyed by inf.
+        """
+
+        ages = sorted(self.ages(now))
+        bounds = list(buckets) + [math.inf]
+        distribution = dict()
+        previous = 0
+        for bound in bounds:
+            position = bisect.bisect_right(ages, bound)
+            distribution[bound] = position - previous
+            previous = position
+
+        return distribution
+
+    def cycle_times(self, done_list_ids: [str] = None) -> array:
+        """
+        Days from creation to last modification of the finished cards.
+        :param done_list_ids: (optional) Lists holding finished cards. By default, archived cards are the finished ones.
+        """
+
+        if done_list_ids is not None:
+            done_codes = {self.lists.lookup(list_id) for list_id in done_list_ids}
+            done = [list_code in done_codes for list_code in self.list]
+        else:
+            done = self.archived
+
+        return array("d", ((modified_at - created_at) / DAY
+                           for created_at, modified_at in compress(zip(self.created_at, self.modified_at), done)
+                           if not math.isnan(created_at) and not math.isnan(modified_at)))
+
+    def cycle_time_percentiles(self, percentiles: tuple = (0.5, 0.85, 0.95), done_list_ids: [str] = None) -> dict:
+        """
+        :return: Cycle time in days of every percentile, None if no card is finished.
+        """
+
+        times = sorted(self.cycle_times(done_list_ids))
+        if not times:
+            return {percentile: None for percentile in percentiles}
+
+        return {percentile: times[min(len(times) - 1, int(percentile * len(times)))] for percentile in percentiles}
+
+    def member_load(self, include_archived: bool = False) -> dict:
+        """
+        :return: Number of cards every user ID is a member or assignee of.
+        """
+
+        codes = self.member_codes
+        if not include_archived:
+            codes = compress(codes, map(self._open_rows().__getitem__, self.member_rows))
+
+        return {self.users.values[code]: count for code, count in Counter(codes).items()}
+
+    def label_counts(self, include_archived: bool = False) -> dict:
+        """
+        :return: Number of cards of every label ID.
+        """
+
+        codes = self.label_codes
+        if not include_archived:
+            codes = compress(codes, map(self._open_rows().__getitem__, self.label_rows))
+
+        return {self.labels.values[code]: count for code, count in Counter(codes).items()}
+
+
+def _timestamp(value: str) -> float:
+    """
+    Convert a Wekan date to a unix timestamp, NaN if it's missing or can't be parsed.
+    """
+
+    if not value:
+        return math.nan
+
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, AttributeError):
+        return math.nan
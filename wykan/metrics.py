@@ -0,0 +1,200 @@
+import bisect
+import threading
+
+# Path segments following these collections are IDs.
+COLLECTIONS = {"users", "boards", "lists", "cards", "swimlanes", "members", "checklists", "items", "comments",
+                "labels", "custom-fields", "attachments"}
+# Path segments that are never IDs.
+KEYWORDS = COLLECTIONS | {"api", "login", "add", "export"}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def endpoint_template(rest_url: str) -> str:
+    """
+    Replace the IDs of a REST url with placeholders.
+    Example: /api/boards/abc/lists/def/cards -> /api/boards/{id}/lists/{id}/cards
+    """
+
+    path = rest_url.split("?", 1)[0]
+    segments = path.split("/")
+    for i in range(1, len(segments)):
+        if segments[i - 1] in COLLECTIONS and segments[i] and segments[i] not in KEYWORDS:
+            segments[i] = "{id}"
+
+    return "/".join(segments)
+
+
+class RequestEvent:
+    """
+    A finished request, as passed to the after-request hooks.
+    """
+
+    def __init__(self, method: str, url: str, status: int = None, latency: float = 0, bytes_sent: int = 0,
+                 bytes_received: int = 0, error: BaseException = None):
+        """
+        :param method: HTTP method, upper case.
+        :param url: REST url of the request. Example: /api/boards/abc
+        :param status: HTTP status of the response, None if no response was received.
+        :param latency: Seconds the request took.
+        :param error: Exception raised while sending the request, if any.
+        """
+
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_template(url)
+        self.status = status
+        self.latency = latency
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.error = error
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or self.status is None or self.status >= 400
+
+
+class LatencyHistogram:
+    """
+    Cumulative-friendly latency histogram with fixed bucket bounds, in seconds.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile as the upper bound of the bucket holding it.
+        """
+
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return float("inf")
+
+
+class EndpointStats:
+    """
+    Counters of the requests sent to a single endpoint template.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = LatencyHistogram(buckets)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_total": self.latency.sum,
+            "latency_p50": self.latency.quantile(0.5),
+            "latency_p99": self.latency.quantile(0.99),
+        }
+
+
+class RequestMetrics:
+    """
+    Per endpoint template request counters and latency histograms.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.endpoints = dict()
+        self._lock = threading.Lock()
+
+    def record(self, event: RequestEvent):
+        with self._lock:
+            stats = self.endpoints.get((event.method, event.endpoint))
+            if stats is None:
+                stats = self.endpoints[(event.method, event.endpoint)] = EndpointStats(self.buckets)
+
+            stats.requests += 1
+            stats.errors += event.failed
+            stats.bytes_sent += event.bytes_sent
+            stats.bytes_received += event.bytes_received
+            stats.latency.observe(event.latency)
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+
+    def report(self) -> dict:
+        """
+        Totals and per endpoint counters. Endpoints are keyed like "GET /api/boards/{id}".
+        """
+
+        with self._lock:
+            endpoints = {f"{method} {endpoint}": stats.as_dict()
+                         for (method, endpoint), stats in sorted(self.endpoints.items())}
+
+        return {
+            "requests": sum(stats["requests"] for stats in endpoints.values()),
+            "errors": sum(stats["errors"] for stats in endpoints.values()),
+            "bytes_sent": sum(stats["bytes_sent"] for stats in endpoints.values()),
+            "bytes_received": sum(stats["bytes_received"] for stats in endpoints.values()),
+            "latency_total": sum(stats["latency_total"] for stats in endpoints.values()),
+            "endpoints": endpoints,
+        }
+
+    def to_prometheus(self, prefix: str = "wykan") -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+        :param prefix: Prefix of the metric names.
+        """
+
+        with self._lock:
+            items = sorted(self.endpoints.items())
+
+            lines = []
+            for name, help_text, attribute in [
+                ("requests_total", "Requests sent to the Wekan server.", "requests"),
+                ("request_errors_total", "Requests that failed or got an error status.", "errors"),
+                ("request_bytes_sent_total", "Request body bytes sent.", "bytes_sent"),
+                ("request_bytes_received_total", "Response body bytes received.", "bytes_received"),
+            ]:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (method, endpoint), stats in items:
+                    lines.append(f"{prefix}_{name}{{{_labels(method, endpoint)}}} {getattr(stats, attribute)}")
+
+            name = f"{prefix}_request_duration_seconds"
+            lines.append(f"# HELP {name} Latency of requests sent to the Wekan server.")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, endpoint), stats in items:
+                labels = _labels(method, endpoint)
+                cumulative = 0
+                for bound, count in zip(stats.latency.buckets + (float("inf"),), stats.latency.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {stats.latency.sum}")
+                lines.append(f"{name}_count{{{labels}}} {stats.latency.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, endpoint: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return f'method="{escape(method)}",endpoint="{escape(endpoint)}"'
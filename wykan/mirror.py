@@ -0,0 +1,295 @@
+import json
+import sqlite3
+import threading
+
+from .models.board import Board
+from .models.card import Card
+from .models.list import List
+from .models.swimlane import Swimlane
+from .models.user import User
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracked_boards (
+    board_id TEXT PRIMARY KEY,
+    synced_at TEXT
+);
+CREATE TABLE IF NOT EXISTS entities (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    board_id TEXT,
+    parent_id TEXT,
+    modified_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE INDEX IF NOT EXISTS entities_by_parent ON entities (kind, board_id, parent_id);
+"""
+
+
+class SyncReport:
+    """
+    What a :meth:`BoardMirror.sync` did.
+    """
+
+    def __init__(self):
+        self.fetched = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def __repr__(self):
+        return f"SyncReport(fetched={self.fetched}, unchanged={self.unchanged}, removed={self.removed})"
+
+
+class BoardMirror:
+    """
+    A local SQLite mirror holding a consistent snapshot of selected boards: their lists, swimlanes, cards and
+    member users. Reads are served from the mirror, and :meth:`sync` refetches only what changed.
+
+    Change detection, per board:
+    - The board document is fetched, and its member users are fetched when they're new or the board changed.
+    - The lists and swimlanes listings, and the cards listing of every list, are fetched. An entity's document is
+      refetched only if it's new, or if a field of its listing entry (title, description, or `modifiedAt` when the
+      server includes it) differs from the mirrored document. A card moved to another list is new in that list.
+    - Entities missing from the listings are removed, and users that are no longer members of a mirrored board.
+    Changes to fields the listings don't show, like a card's color, are only seen by ``sync(force=True)``.
+    """
+
+    def __init__(self, api, path: str):
+        """
+        :param api: The Wykan client used to sync the mirror.
+        :param path: Path of the SQLite database file. ":memory:" for a non persistent mirror.
+        """
+
+        self._api = api
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the mirror's database.
+        """
+
+        self._connection.close()
+
+    @property
+    def board_ids(self) -> [str]:
+        """
+        IDs of the mirrored boards.
+        """
+
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT board_id FROM tracked_boards")]
+
+    def track(self, board_id: str):
+        """
+        Add a board to the mirror. It's fetched on the next :meth:`sync`.
+        :param board_id: ID of the board.
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR IGNORE INTO tracked_boards (board_id) VALUES (?)", (board_id,))
+
+    def untrack(self, board_id: str):
+        """
+        Remove a board and everything in it from the mirror.
+        :param board_id: ID of the board.
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM tracked_boards WHERE board_id = ?", (board_id,))
+            self._connection.execute("DELETE FROM entities WHERE board_id = ? OR (kind = 'board' AND id = ?)",
+                                     (board_id, board_id))
+            self._remove_orphan_users()
+
+    def sync(self, force: bool = False) -> SyncReport:
+        """
+        Bring the mirrored boards up to date with the server.
+        Each board is written in a single transaction, so reads never see a half synced board.
+        :param force: Refetch every entity, regardless of the change detection.
+        """
+
+        report = SyncReport()
+        for board_id in self.board_ids:
+            self._sync_board(board_id, force, report)
+
+        return report
+
+    def _sync_board(self, board_id: str, force: bool, report: SyncReport):
+        writes = []
+        deletes = []
+
+        board = self._api.get(f"/api/boards/{board_id}")
+        board_changed = force or not self._is_mirrored("board", board_id) or self._document("board", board_id) != board
+        writes.append(("board", board_id, board_id, None, board))
+        if board_changed:
+            report.fetched += 1
+        else:
+            report.unchanged += 1
+
+        for member in board.get("members") or []:
+            user_id = member.get("userId")
+            if board_changed or not self._is_mirrored("user", user_id):
+                writes.append(("user", user_id, None, None, self._api.get(f"/api/users/{user_id}")))
+                report.fetched += 1
+
+        board_url = f"/api/boards/{board_id}"
+        self._sync_children("swimlane", board_id, None, f"{board_url}/swimlanes", force,
+                            writes, deletes, report)
+        list_ids = self._sync_children("list", board_id, None, f"{board_url}/lists", force,
+                                       writes, deletes, report)
+
+        for list_id in list_ids:
+            self._sync_children("card", board_id, list_id, f"{board_url}/lists/{list_id}/cards", force,
+                                writes, deletes, report)
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entities (kind, id, board_id, parent_id, modified_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(kind, id, entity_board_id, parent_id, data.get("modifiedAt"), json.dumps(data))
+                 for kind, id, entity_board_id, parent_id, data in writes])
+            # An entity missing from one listing may be in another one now, like a card moved to another list.
+            written = {(kind, id) for kind, id, _, _, _ in writes}
+            deletes = [delete for delete in deletes if delete not in written]
+            self._connection.executemany("DELETE FROM entities WHERE kind = ? AND id = ?", deletes)
+
+            # Cards of removed lists go with them.
+            removed_lists = [id for kind, id in deletes if kind == "list"]
+            self._connection.executemany("DELETE FROM entities WHERE kind = 'card' AND parent_id = ?",
+                                         [(list_id,) for list_id in removed_lists])
+            self._connection.execute("UPDATE tracked_boards SET synced_at = datetime('now') WHERE board_id = ?",
+                                     (board_id,))
+            self._remove_orphan_users()
+
+    def _remove_orphan_users(self):
+        """
+        Delete the users that aren't members of any mirrored board. Must be called in a transaction.
+        Users are shared by boards, so they're stored without a board.
+        """
+
+        member_ids = {member.get("userId")
+                      for row in self._connection.execute("SELECT data FROM entities WHERE kind = 'board'")
+                      for member in json.loads(row[0]).get("members") or []}
+        orphan_ids = [row[0] for row in self._connection.execute("SELECT id FROM entities WHERE kind = 'user'")
+                      if row[0] not in member_ids]
+        self._connection.executemany("DELETE FROM entities WHERE kind = 'user' AND id = ?",
+                                     [(user_id,) for user_id in orphan_ids])
+
+    def _sync_children(self, kind: str, board_id: str, parent_id: str, listing_url: str, refetch_all: bool,
+                       writes: list, deletes: list, report: SyncReport) -> [str]:
+        """
+        Sync the entities of a collection endpoint.
+        :return: IDs of the entities in the listing.
+        """
+
+        listing = self._api.get(listing_url)
+        mirrored = {id: json.loads(data) for id, data in self._select("id, data", kind, board_id, parent_id)}
+
+        for entry in listing:
+            mirrored_doc = mirrored.pop(entry["_id"], None)
+
+            if refetch_all or mirrored_doc is None or _differs(entry, mirrored_doc):
+                writes.append((kind, entry["_id"], board_id, parent_id, self._api.get(f"{listing_url}/{entry['_id']}")))
+                report.fetched += 1
+            else:
+                report.unchanged += 1
+
+        for removed_id in mirrored:
+            deletes.append((kind, removed_id))
+            report.removed += 1
+
+        return [entry["_id"] for entry in listing]
+
+    def _select(self, columns: str, kind: str, board_id: str = None, parent_id: str = None):
+        query = f"SELECT {columns} FROM entities WHERE kind = ? AND board_id IS ? AND parent_id IS ?"
+        with self._lock:
+            return self._connection.execute(query, (kind, board_id, parent_id)).fetchall()
+
+    def _is_mirrored(self, kind: str, id: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM entities WHERE kind = ? AND id = ?",
+                                            (kind, id)).fetchone() is not None
+
+    def _document(self, kind: str, id: str) -> dict:
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM entities WHERE kind = ? AND id = ?",
+                                           (kind, id)).fetchone()
+
+        if row is None:
+            raise LookupError(f"Could not find {kind} {id} in the mirror")
+
+        return json.loads(row[0])
+
+    def _children(self, kind: str, board_id: str, parent_id: str = None) -> [dict]:
+        documents = [json.loads(row[0]) for row in self._select("data", kind, board_id, parent_id)]
+        return sorted(documents, key=lambda document: document.get("sort") or 0)
+
+    def get_board(self, board_id: str) -> Board:
+        """
+        Get a mirrored board.
+        :param board_id: ID of the board.
+        """
+
+        return _loaded(Board(self._api, board_id), self._document("board", board_id))
+
+    def get_lists(self, board_id: str) -> [List]:
+        """
+        Get the mirrored lists of a board, in their board order.
+        :param board_id: ID of the board.
+        """
+
+        return [_loaded(List(self._api, board_id, document["_id"]), document)
+                for document in self._children("list", board_id)]
+
+    def get_swimlanes(self, board_id: str) -> [Swimlane]:
+        """
+        Get the mirrored swimlanes of a board, in their board order.
+        :param board_id: ID of the board.
+        """
+
+        return [_loaded(Swimlane(self._api, board_id, document["_id"]), document)
+                for document in self._children("swimlane", board_id)]
+
+    def get_cards(self, board_id: str, list_id: str) -> [Card]:
+        """
+        Get the mirrored cards of a list, in their list order.
+        :param board_id: ID of the list's board.
+        :param list_id: ID of the list.
+        """
+
+        return [_loaded(Card(self._api, board_id, list_id, document["_id"]), document)
+                for document in self._children("card", board_id, list_id)]
+
+    def get_user(self, user_id: str) -> User:
+        """
+        Get a mirrored member user.
+        :param user_id: ID of the user.
+        """
+
+        return _loaded(User(self._api, user_id), self._document("user", user_id))
+
+
+def _loaded(obj, document: dict):
+    """
+    Populate a model with its full document, so it's never fetched on access.
+    """
+
+    obj._populate(document, complete=True)
+    return obj
+
+
+def _differs(entry: dict, document: dict) -> bool:
+    """
+    Whether a listing entry disagrees with the mirrored document of the same entity.
+    """
+
+    return any(document.get(key) != value for key, value in entry.items() if key != "_id")
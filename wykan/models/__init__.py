@@ -1,13 +1,96 @@
+import builtins
+import sys
+
+# Strings up to this length are interned: IDs, usernames, colors, types and other values repeated across objects.
+INTERN_MAX_LENGTH = 64
+
+
+def intern(value):
+    """
+    Share a single copy of short strings, decoded JSON holds a new copy of every occurrence.
+    Lists of strings, such as the label and member IDs of a card, become tuples of shared strings: a tuple is
+    smaller than a list, and all empty ones are the same object. Other values are returned as is.
+    """
+
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+
+    # The list submodule shadows the builtin in this package's namespace.
+    if isinstance(value, builtins.list) and all(isinstance(item, str) for item in value):
+        return tuple(intern(item) for item in value)
+
+    return value
+
+
 class _WekanObject:
     """
         Base Wekan object
         _id: id of object
+
+        Objects can be created from a partial payload (for example an entry of a collection endpoint).
+        The full document is fetched only when a field that wasn't loaded yet is read, or on :meth:`refresh`.
+        _fields: maps attribute names to their key in the Wekan document.
+                 A `_parse_<attribute>` method, if defined, converts the raw value.
+        _hydrate_on_access: fetch the document when reading a field that isn't loaded.
+                 Disabled by asynchronous models, which can't block on attribute access.
+
+        Models have no instance __dict__, subclasses declare their fields and other attributes in __slots__.
     """
 
-    def __init__(self, api, id: str):
+    __slots__ = ("_api", "_id", "_loaded")
+
+    _fields = {}
+    _hydrate_on_access = True
+
+    def __init__(self, api, id: str, data: dict = None):
         self._api = api
-        self._id = id
+        self._id = intern(id)
+        self._loaded = False
+
+        if data is not None:
+            self._populate(data)
+
+    def __getattr__(self, name):
+        # Only called when the attribute isn't set yet, hydrate the object if it's one of its fields.
+        if name in type(self)._fields and type(self)._hydrate_on_access and not getattr(self, "_loaded", True):
+            self.refresh()
+            return getattr(self, name)
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
     @property
     def id(self) -> str:
         return self._id
+
+    @property
+    def _url(self) -> str:
+        """
+        REST url of the object's document.
+        """
+        raise NotImplementedError()
+
+    def refresh(self):
+        """
+        Fetch the full document of the object from the server, overriding the loaded fields.
+        """
+
+        self._populate(self._api.get(self._url), complete=True)
+        return self
+
+    def _populate(self, data: dict, complete: bool = False):
+        """
+        Load fields from a Wekan document.
+        :param data: Wekan document, possibly partial.
+        :param complete: Whether the document is the full one. Missing fields are then set to None.
+        """
+
+        for attribute, key in self._fields.items():
+            if key not in data and not complete:
+                continue
+
+            value = intern(data.get(key))
+            parse = getattr(self, f"_parse_{attribute}", None)
+            setattr(self, attribute, parse(value) if parse is not None else value)
+
+        if complete:
+            self._loaded = True
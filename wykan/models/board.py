@@ -1,18 +1,26 @@
-from wykan.models.list import List
+from typing import TYPE_CHECKING
+
+from wykan.bulk import run_bulk, raise_for_failures
+from wykan.models.list import List, _card_fields
 from wykan.models.swimlane import Swimlane
 from wykan.models.user import User
-from . import _WekanObject
+from . import _WekanObject, intern
 from .colors import Colors, BoardColors
 
+if TYPE_CHECKING:
+    from wykan.snapshot import BoardSnapshot
+
 
 class BoardLabel:
     """
     A board label.
     """
 
+    __slots__ = ("id", "name", "color")
+
     def __init__(self, id: str, name: str, color: BoardColors):
-        self.id = id
-        self.name = name
+        self.id = intern(id)
+        self.name = intern(name)
         self.color = color
 
 
@@ -21,62 +29,86 @@ class BoardMember:
     A board member.
     """
 
-    def __init__(self, user, is_board_admin: bool, is_no_comments: bool, is_comment_only: bool):
+    __slots__ = ("_api", "user_id", "is_board_admin", "is_no_comment", "is_comment_only")
+
+    def __init__(self, api, user_id: str, is_board_admin: bool, is_no_comments: bool, is_comment_only: bool):
         """
-        :param user: A Wekan user.
+        :param api: The Wykan client the member's user is resolved through.
+        :param user_id: ID of the member's Wekan user.
         :param is_board_admin: Can view and edit cards, remove members, and change settings for the board.
         :param is_no_comments: Can not see comments and activities.
         :param is_comment_only: Can comment on cards only.
         """
 
-        self.user = user
+        self._api = api
+        self.user_id = intern(user_id)
         self.is_board_admin = is_board_admin
         self.is_no_comment = is_no_comments
         self.is_comment_only = is_comment_only
 
+    @property
+    def user(self) -> User:
+        """
+        The member's Wekan user, shared through the client's user cache.
+        """
+        return self._api.get_user(self.user_id)
+
 
 class Board(_WekanObject):
     """
     A Wekan board.
     """
 
-    def __init__(self, api, id: str):
-        super().__init__(api, id)
-        board = self._api.get(f"/api/boards/{self.id}")
-
-        self.title = board.get("title")
-        self.slug = board.get("slug")
-        self.archived = board.get("archived")
-        self.created_at = board.get("createdAt")
-        self.modified_at = board.get("modifiedAt")
-        self.stars = board.get("stars")
-
-        self.labels = list()
-        for label in board.get("labels"):
-            self.labels.append(BoardLabel(label.get("_id"), label.get("name"), Colors[label.get("color")]))
-
-        self.members = list()
-        for member in board.get("members"):
-            self.members.append(BoardMember(
-                self._api.get_user(member.get("userId")),
-                member.get("isAdmin"),
-                member.get("isNoComments"),
-                member.get("isCommentOnly")
-            ))
-
-        self.permission = board.get("permission")
-        self.color = BoardColors[board.get("color")]
-        self.description = board.get("description")
-        self.subtasks_default_board_id = board.get("subtasksDefaultBoardId")
-        self.subtasks_default_list_id = board.get("subtasksDefaultListId")
-        self.allows_subtasks = board.get("allowsSubtasks")
-        self.present_parent_task = board.get("presentParentTask")
-        self.start_at = board.get("startAt")
-        self.due_at = board.get("dueAt")
-        self.end_at = board.get("endAt")
-        self.spent_time = board.get("spentTime")
-        self.is_overtime = board.get("isOvertime")
-        self.type = board.get("type")
+    _fields = {
+        "title": "title",
+        "slug": "slug",
+        "archived": "archived",
+        "created_at": "createdAt",
+        "modified_at": "modifiedAt",
+        "stars": "stars",
+        "labels": "labels",
+        "members": "members",
+        "permission": "permission",
+        "color": "color",
+        "description": "description",
+        "subtasks_default_board_id": "subtasksDefaultBoardId",
+        "subtasks_default_list_id": "subtasksDefaultListId",
+        "allows_subtasks": "allowsSubtasks",
+        "present_parent_task": "presentParentTask",
+        "start_at": "startAt",
+        "due_at": "dueAt",
+        "end_at": "endAt",
+        "spent_time": "spentTime",
+        "is_overtime": "isOvertime",
+        "type": "type",
+    }
+
+    __slots__ = tuple(_fields)
+
+    def __init__(self, api, id: str, data: dict = None):
+        """
+        :param data: (optional) Already known fields of the board, the rest are fetched on first access.
+        """
+        super().__init__(api, id, data)
+
+    @property
+    def _url(self) -> str:
+        return f"/api/boards/{self.id}"
+
+    def _parse_labels(self, labels: list) -> [BoardLabel]:
+        return [BoardLabel(label.get("_id"), label.get("name"), Colors[label.get("color")]) for label in labels or []]
+
+    def _parse_members(self, members: list) -> [BoardMember]:
+        return [BoardMember(
+            self._api,
+            member.get("userId"),
+            member.get("isAdmin"),
+            member.get("isNoComments"),
+            member.get("isCommentOnly")
+        ) for member in members or []]
+
+    def _parse_color(self, color: str) -> BoardColors:
+        return BoardColors[color] if color else None
 
     def change_member_permissions(self, user_id, is_board_admin: bool, is_no_comments: bool, is_comment_only: bool):
         """
@@ -92,7 +124,7 @@ class Board(_WekanObject):
             "isNoComments": is_no_comments,
             "isCommentOnly": is_comment_only
         }
-        self._api.post(f"/api/boards/{self.id}/members/{user_id}", change_user_details)
+        self._api.post(f"/api/boards/{self.id}/members/{user_id}", change_user_details, deferrable=True)
 
     def add_board_member(self, user_id, is_board_admin: bool, is_no_comments: bool, is_comment_only: bool):
         """
@@ -109,7 +141,49 @@ class Board(_WekanObject):
             "isNoComments": is_no_comments,
             "isCommentOnly": is_comment_only
         }
-        self._api.post(f"/api/boards/{self.id}/members/{user_id}/add", add_user_details)
+        self._api.post(f"/api/boards/{self.id}/members/{user_id}/add", add_user_details, deferrable=True)
+
+    def add_label(self, name: str, color: Colors) -> str:
+        """
+        Add a label to the board.
+        :param name: Name of the label.
+        :param color: Color of the label.
+        :return: ID of the new label.
+        """
+
+        label_details = {
+            "label": {
+                "name": name,
+                "color": color.value,
+            }
+        }
+
+        # Wekan adds a label on every PUT, a retried request could add it twice.
+        return self._api.put(f"/api/boards/{self.id}/labels", label_details, idempotent=False)
+
+    def snapshot(self) -> "BoardSnapshot":
+        """
+        Load the whole board, with its lists, swimlanes, cards, checklists and comments, in a single request.
+        """
+
+        return self._api.load_board_tree(self.id)
+
+    def archive_cards(self, predicate, **kwargs) -> ["Card"]:
+        """
+        Archive the board's cards matching a condition, concurrently.
+        The cards are read with a single export of the board.
+        Example: board.archive_cards(lambda card: card.dateLastActivity < "2020-01-01")
+        :param predicate: Callable receiving a loaded :class:`Card`, true for the cards to archive.
+            Cards that are already archived aren't passed to it.
+        :param max_workers: (optional) Maximum number of cards archived at once. Defaults to the client's pool size.
+        :param retries: (optional) Times a card still failing with a transient error after the client's own retries
+            is archived again, none by default; the client's scheduler retries transient errors.
+        :return: The archived cards.
+        :raises BulkOperationError: If some of the cards couldn't be archived, with a result per card.
+        """
+
+        cards = [card for card in self.snapshot().cards if not card.archived and predicate(card)]
+        return self._api.update_cards([(card, {"archive": True}) for card in cards], **kwargs)
 
     def get_lists(self) -> [List]:
         """
@@ -117,7 +191,17 @@ class Board(_WekanObject):
         """
 
         board_lists = self._api.get(f"/api/boards/{self.id}/lists")
-        return [self.get_list(board_list.get("_id")) for board_list in board_lists]
+        self._api.name_index.load(("lists", self.id), board_lists, "title")
+        return [List(self._api, self.id, board_list.get("_id"), board_list) for board_list in board_lists]
+
+    def iter_lists(self):
+        """
+        Iterate the lists in this board, as they're received.
+        """
+
+        for board_list in self._api.iter_get(f"/api/boards/{self.id}/lists"):
+            self._api.name_index.update(("lists", self.id), [board_list], "title")
+            yield List(self._api, self.id, board_list.get("_id"), board_list)
 
     def get_list(self, list_id) -> List:
         """
@@ -132,26 +216,66 @@ class Board(_WekanObject):
         Retrieve a list by it's title from current board.
         :param list_title: Wanted board's title.
         """
-        lists = self.get_lists()
-        wanted_lists = list(filter(lambda l: l.title == list_title, lists))
+        list_id = self._find_by_title("lists", list_title, self.get_lists)
 
-        if len(wanted_lists) <= 0:
+        if list_id is None:
             raise NameError("Could not find list {}".format(list_title))
 
-        return wanted_lists[0]
+        return List(self._api, self.id, list_id, {"title": list_title})
 
-    def create_list(self, title: str) -> List:
+    def create_list(self, title: str, sort: int = None) -> List:
         """
         Add a list to the board.
         :param title: Title of the list to add.
+        :param sort: (optional) Explicit position of the list in the board.
         """
 
         new_list_details = {
             "title": title
         }
+        if sort is not None:
+            new_list_details["sort"] = sort
 
         new_list = self._api.post(f"/api/boards/{self.id}/lists", new_list_details)
-        return List(self._api, self.id, new_list["_id"])
+        self._api.name_index.add(("lists", self.id), title, new_list["_id"])
+        return List(self._api, self.id, new_list["_id"], new_list_details)
+
+    def bulk_create_cards(self, cards: dict, **kwargs) -> dict:
+        """
+        Add many cards to lists of the board.
+        The author and swimlane are resolved once for the whole board, and the cards are posted concurrently
+        over the client's connection pool, without fetching them back.
+        :param cards: Maps list IDs to their new cards, as :class:`CardConfiguration` objects or (title, description) tuples.
+        :param author_id: (optional) ID of the cards' author. Defaults to the first admin of the board.
+        :param swimlane_id: (optional) ID of the cards' swimlane. Defaults to the first swimlane of the board.
+        :param max_workers: (optional) Maximum number of cards posted at once. Defaults to the client's pool size.
+        :param first_sort: (optional) Position of the first card of every list, the next ones get consecutive
+            positions so their order is kept. Defaults to the number of cards in each list, appending the cards.
+        :return: Maps list IDs to their new cards, in the given order.
+        :raises BulkOperationError: If some of the cards couldn't be created.
+        """
+
+        author_id = kwargs.get("author_id") or self.get_admin_users()[0].id
+        swimlane_id = kwargs.get("swimlane_id") or self.get_swimlanes()[0].id
+
+        lists = {list_id: self.get_list(list_id) for list_id in cards}
+        first_sorts = {list_id: kwargs["first_sort"] if kwargs.get("first_sort") is not None
+                       else lists[list_id]._card_count()
+                       for list_id in cards}
+        items = [(list_id, first_sorts[list_id] + index, card)
+                 for list_id, list_cards in cards.items() for index, card in enumerate(list_cards)]
+
+        results = run_bulk(lambda item: lists[item[0]]._post_card(*_card_fields(item[2]), author_id, swimlane_id,
+                                                                  item[1]),
+                           items,
+                           kwargs.get("max_workers", self._api.pool_maxsize))
+        raise_for_failures(results, f"cards of board {self.id}")
+
+        new_cards = {list_id: [] for list_id in cards}
+        for result in results:
+            new_cards[result.item[0]].append(result.value)
+
+        return new_cards
 
     def delete_list(self, list_id) -> str:
         """
@@ -160,7 +284,12 @@ class Board(_WekanObject):
         :return ID of the delete list.
         """
 
-        return self._api.delete(f"/api/boards/{self.id}/lists/{list_id}")
+        def forget():
+            self._api.name_index.discard(list_id)
+            if self._api.search_index is not None:
+                self._api.search_index.remove_list(list_id)
+
+        return self._api.delete(f"/api/boards/{self.id}/lists/{list_id}", deferrable=True, on_commit=forget)
 
     def get_admin_users(self) -> [User]:
         """
@@ -169,7 +298,7 @@ class Board(_WekanObject):
         admins = [member.user for member in self.members if member.is_board_admin]
 
         if len(admins) <= 0:
-            raise LookupError(f"Could not find admin users for board {self.title}")
+            raise LookupError(f"Could not find admin users for board {self.id}")
 
         return admins
 
@@ -183,17 +312,19 @@ class Board(_WekanObject):
         }
 
         new_swimlane = self._api.post(f"/api/boards/{self.id}/swimlanes", swimlane_data)
-        return Swimlane(self._api, self.id, new_swimlane['_id'])
+        self._api.name_index.add(("swimlanes", self.id), title, new_swimlane["_id"])
+        return Swimlane(self._api, self.id, new_swimlane['_id'], swimlane_data)
 
     def get_swimlanes(self) -> [Swimlane]:
         """
         Retrieve all swimlanes on current board.
         """
         data = self._api.get(f"/api/boards/{self.id}/swimlanes")
-        swimlanes = [Swimlane(self._api, self.id, swimlane.get('_id')) for swimlane in data]
+        self._api.name_index.load(("swimlanes", self.id), data, "title")
+        swimlanes = [Swimlane(self._api, self.id, swimlane.get('_id'), swimlane) for swimlane in data]
 
         if len(swimlanes) <= 0:
-            raise LookupError(f"Could not find swimlanes in board {self.title}")
+            raise LookupError(f"Could not find swimlanes in board {self.id}")
 
         return swimlanes
 
@@ -202,9 +333,30 @@ class Board(_WekanObject):
         Retrieve a swimlane by its title from current board.
         :param title: wanted swimlane's title.
         """
-        swimlanes = list(filter(lambda s: s.title == title, self.get_swimlanes()))
+        swimlane_id = self._find_by_title("swimlanes", title, self.get_swimlanes)
 
-        if len(swimlanes) <= 0:
+        if swimlane_id is None:
             raise LookupError(f"Could not find swimlane {title}")
 
-        return swimlanes[0]
+        return Swimlane(self._api, self.id, swimlane_id, {"title": title})
+
+    def _find_by_title(self, kind: str, title: str, load):
+        """
+        Find the id of a list or a swimlane of the board through the client's name index.
+        :param kind: "lists" or "swimlanes".
+        :param title: Wanted title.
+        :param load: Fetches the collection, reloading its index on a miss.
+        :return: ID of the found object, None if not found.
+        """
+
+        scope = (kind, self.id)
+        found_id = self._api.name_index.lookup(scope, title)
+        if found_id is None:
+            try:
+                load()
+            except LookupError:
+                return None
+
+            found_id = self._api.name_index.lookup(scope, title)
+
+        return found_id
@@ -1,4 +1,5 @@
-from . import _WekanObject
+from . import _WekanObject, intern
+from .colors import Colors
 
 
 class Card(_WekanObject):
@@ -6,11 +7,105 @@ class Card(_WekanObject):
     Wekan Card
     """
 
-    def __init__(self, api, board_id, list_id, id: str):
-        super().__init__(api, id)
-        self.boardId = board_id
-        self.listId = list_id
-        _data = self._api.get(f"/api/boards/{self.boardId}/lists/{self.listId}/cards/{self.id}")
+    _fields = {
+        "title": "title",
+        "description": "description",
+        "swimlaneId": "swimlaneId",
+        "archived": "archived",
+        "archivedAt": "archivedAt",
+        "parentId": "parentId",
+        "coverId": "coverId",
+        "color": "color",
+        "createdAt": "createdAt",
+        "modifiedAt": "modifiedAt",
+        "dateLastActivity": "dateLastActivity",
+        "customFields": "customFields",
+        "labelIds": "labelIds",
+        "members": "members",
+        "assignees": "assignees",
+        "receivedAt": "receivedAt",
+        "startAt": "startAt",
+        "dueAt": "dueAt",
+        "endAt": "endAt",
+        "spentTime": "spentTime",
+        "isOvertime": "isOvertime",
+        "userId": "userId",
+        "sort": "sort",
+        "subtaskSort": "subtaskSort",
+        "type": "type",
+        "linkedId": "linkedId",
+    }
 
-        self.title = _data.get("title")
-        self.description = _data.get("description")
+    __slots__ = ("boardId", "listId", *_fields)
+
+    def __init__(self, api, board_id, list_id, id: str, data: dict = None):
+        """
+        :param data: (optional) Already known fields of the card, the rest are fetched on first access.
+        """
+        self.boardId = intern(board_id)
+        self.listId = intern(list_id)
+        super().__init__(api, id, data)
+
+    @property
+    def _url(self) -> str:
+        return f"/api/boards/{self.boardId}/lists/{self.listId}/cards/{self.id}"
+
+    def _parse_color(self, color: str) -> Colors:
+        return Colors[color] if color else None
+
+    def update(self, **fields):
+        """
+        Edit the card. The fields are named like in Wekan's documents, and are updated locally once the write is sent.
+        Example: card.update(title="New title", dueAt="2021-01-01T00:00:00.000Z", labelIds=[...])
+        :param listId: (optional) Move the card to another list of the board.
+        :param swimlaneId: (optional) Move the card to another swimlane of the board.
+        :param archive: (optional) True to archive the card, False to restore it.
+        :param color: (optional) A :class:`Colors` or its name.
+        """
+
+        card_data = {key: value.value if isinstance(value, Colors) else value for key, value in fields.items()}
+
+        def apply():
+            local_data = dict(card_data)
+            if "archive" in local_data:
+                local_data["archived"] = bool(local_data.pop("archive"))
+            self._populate(local_data)
+
+            if local_data.get("listId", self.listId) != self.listId:
+                self.listId = intern(local_data["listId"])
+                # The written url is the one of the old list, the new list's cards are stale too.
+                if self._api.response_cache is not None:
+                    self._api.response_cache.invalidate(f"/api/boards/{self.boardId}/lists/{self.listId}/cards")
+
+            if self._api.search_index is not None:
+                self._api.search_index.mark_stale(self.boardId)
+
+        return self._api.put(self._url, card_data, deferrable=True, on_commit=apply)
+
+    def move(self, list_id: str, **kwargs):
+        """
+        Move the card to another list of the board.
+        :param list_id: ID of the destination list.
+        :param swimlane_id: (optional) ID of the destination swimlane, the card's current one by default.
+        :param sort: (optional) Position of the card in the destination list.
+        """
+
+        card_data = {"listId": list_id}
+        if kwargs.get("swimlane_id") is not None:
+            card_data["swimlaneId"] = kwargs["swimlane_id"]
+        if kwargs.get("sort") is not None:
+            card_data["sort"] = kwargs["sort"]
+
+        return self.update(**card_data)
+
+    def archive(self):
+        """
+        Move the card to the board's archive.
+        """
+        return self.update(archive=True)
+
+    def restore(self):
+        """
+        Restore the card from the board's archive.
+        """
+        return self.update(archive=False)
@@ -1,7 +1,35 @@
-from . import _WekanObject
+from . import _WekanObject, intern
 
 
 class CardComment(_WekanObject):
+    """
+    A comment on a card.
+    """
 
-    def __init__(self, id: str):
-        super().__init__(id)
+    _fields = {
+        "text": "text",
+        "userId": "userId",
+        "createdAt": "createdAt",
+        "modifiedAt": "modifiedAt",
+    }
+
+    __slots__ = ("boardId", "cardId", *_fields)
+
+    def __init__(self, api, board_id, card_id, id: str, data: dict = None):
+        """
+        :param data: (optional) Already known fields of the comment, the rest are fetched on first access.
+        """
+        self.boardId = intern(board_id)
+        self.cardId = intern(card_id)
+        super().__init__(api, id, data)
+
+    @property
+    def _url(self) -> str:
+        return f"/api/boards/{self.boardId}/cards/{self.cardId}/comments/{self.id}"
+
+    def _populate(self, data: dict, complete: bool = False):
+        # The comment endpoint of the REST api names the fields differently than the board export.
+        if "comment" in data or "authorId" in data:
+            data = dict(data, text=data.get("comment"), userId=data.get("authorId"))
+
+        super()._populate(data, complete)
@@ -1,7 +1,37 @@
-from . import _WekanObject
+from . import _WekanObject, intern
+from .checklist_item import CheckListItem
 
 
 class CheckList(_WekanObject):
+    """
+    A checklist of a card.
+    """
 
-    def __init__(self, id: str):
-        super().__init__(id)
+    _fields = {
+        "title": "title",
+        "sort": "sort",
+        "createdAt": "createdAt",
+        "finishedAt": "finishedAt",
+    }
+
+    __slots__ = ("boardId", "cardId", "items", *_fields)
+
+    def __init__(self, api, board_id, card_id, id: str, data: dict = None):
+        """
+        :param data: (optional) Already known fields of the checklist, the rest are fetched on first access.
+        """
+        self.boardId = intern(board_id)
+        self.cardId = intern(card_id)
+        super().__init__(api, id, data)
+
+    @property
+    def _url(self) -> str:
+        return f"/api/boards/{self.boardId}/cards/{self.cardId}/checklists/{self.id}"
+
+    def _populate(self, data: dict, complete: bool = False):
+        super()._populate(data, complete)
+
+        # The checklist document of the REST api embeds its items.
+        if "items" in data:
+            self.items = [CheckListItem(self._api, self.boardId, self.cardId, self.id, item["_id"], item)
+                          for item in data["items"]]
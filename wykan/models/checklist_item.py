@@ -1,7 +1,28 @@
-from . import _WekanObject
+from . import _WekanObject, intern
 
 
 class CheckListItem(_WekanObject):
+    """
+    An item of a card's checklist.
+    """
 
-    def __init__(self, id: str):
-        super().__init__(id)
+    _fields = {
+        "title": "title",
+        "sort": "sort",
+        "isFinished": "isFinished",
+    }
+
+    __slots__ = ("boardId", "cardId", "checklistId", *_fields)
+
+    def __init__(self, api, board_id, card_id, checklist_id, id: str, data: dict = None):
+        """
+        :param data: (optional) Already known fields of the item, the rest are fetched on first access.
+        """
+        self.boardId = intern(board_id)
+        self.cardId = intern(card_id)
+        self.checklistId = intern(checklist_id)
+        super().__init__(api, id, data)
+
+    @property
+    def _url(self) -> str:
+        return f"/api/boards/{self.boardId}/cards/{self.cardId}/checklists/{self.checklistId}/items/{self.id}"
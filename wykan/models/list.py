@@ -1,5 +1,6 @@
+from wykan.bulk import run_bulk, raise_for_failures
 from wykan.models.card import Card
-from . import _WekanObject
+from . import _WekanObject, intern
 from .colors import Colors
 
 
@@ -8,42 +9,132 @@ class List(_WekanObject):
     Wekan List
     """
 
-    def __init__(self, api, board_id, list_id: str):
-        super().__init__(api, list_id)
-        _list = self._api.get(f"/api/boards/{board_id}/lists/{list_id}")
-
-        self.title = _list.get("title")
-        self.starred = _list.get("starred")
-        self.archived = _list.get("archived")
-        self.boardId = board_id
-        self.swimlaneId = _list.get("swimlaneId")
-        self.createdAt = _list.get("createdAt")
-        self.sort = _list.get("sort")
-        self.updatedAt = _list.get("updatedAt")
-        self.modifiedAt = _list.get("modifiedAt")
-        self.wipLimit = _list.get("wipLimit")
-        self.color = Colors[_list.get("color")] if _list.get("color") else None
-        self.type = _list.get("type")
-
-    def create_card(self, title: str, description: str) -> Card:
+    _fields = {
+        "title": "title",
+        "starred": "starred",
+        "archived": "archived",
+        "swimlaneId": "swimlaneId",
+        "createdAt": "createdAt",
+        "sort": "sort",
+        "updatedAt": "updatedAt",
+        "modifiedAt": "modifiedAt",
+        "wipLimit": "wipLimit",
+        "color": "color",
+        "type": "type",
+    }
+
+    __slots__ = ("boardId", *_fields)
+
+    def __init__(self, api, board_id, list_id: str, data: dict = None):
+        """
+        :param data: (optional) Already known fields of the list, the rest are fetched on first access.
+        """
+        self.boardId = intern(board_id)
+        super().__init__(api, list_id, data)
+
+    @property
+    def _url(self) -> str:
+        return f"/api/boards/{self.boardId}/lists/{self.id}"
+
+    def _parse_color(self, color: str) -> Colors:
+        return Colors[color] if color else None
+
+    def create_card(self, title: str, description: str, **kwargs) -> Card:
         """
         Add a card to the list
         :param title: Title of the card to add.
+        :param author_id: (optional) ID of the card's author. Defaults to the first admin of the board.
+        :param swimlane_id: (optional) ID of the card's swimlane. Defaults to the first swimlane of the board.
         :return:
         """
 
+        author_id, swimlane_id = self._card_context(kwargs.get("author_id"), kwargs.get("swimlane_id"))
+        return self._post_card(title, description, author_id, swimlane_id)
+
+    def create_cards(self, cards, **kwargs) -> [Card]:
+        """
+        Add many cards to the list.
+        The author and swimlane are resolved once, and the cards are posted concurrently over the client's
+        connection pool. The returned cards are built from the posted data, without fetching them back.
+        :param cards: :class:`CardConfiguration` objects, or (title, description) tuples.
+        :param author_id: (optional) ID of the cards' author. Defaults to the first admin of the board.
+        :param swimlane_id: (optional) ID of the cards' swimlane. Defaults to the first swimlane of the board.
+        :param max_workers: (optional) Maximum number of cards posted at once. Defaults to the client's pool size.
+        :param first_sort: (optional) Position of the first card, the next ones get consecutive positions so their
+            order is kept regardless of the order the concurrent requests arrive in. Defaults to the number of cards
+            in the list, appending the cards like Wekan does. Cards posted one at a time get Wekan's own positions.
+        :return: The new cards, in the given order.
+        :raises BulkOperationError: If some of the cards couldn't be created.
+        """
+
+        author_id, swimlane_id = self._card_context(kwargs.get("author_id"), kwargs.get("swimlane_id"))
+        max_workers = kwargs.get("max_workers", self._api.pool_maxsize)
+        first_sort = kwargs.get("first_sort")
+        if first_sort is None and max_workers > 1:
+            first_sort = self._card_count()
+
+        def post(item) -> Card:
+            index, card = item
+            sort = first_sort + index if first_sort is not None else None
+            return self._post_card(*_card_fields(card), author_id, swimlane_id, sort)
+
+        results = run_bulk(post, enumerate(cards), max_workers)
+        raise_for_failures(results, f"cards of list {self.id}")
+
+        return [result.value for result in results]
+
+    def _card_count(self) -> int:
+        """
+        Number of cards in the list, the position Wekan gives a new card.
+        """
+        return sum(1 for _ in self._api.iter_get(f"/api/boards/{self.boardId}/lists/{self.id}/cards"))
+
+    def _card_context(self, author_id: str = None, swimlane_id: str = None) -> (str, str):
+        """
+        Resolve the author and swimlane for new cards of this list, fetching only the missing ones.
+        """
+
         board = self._api.get_board(self.boardId)
 
+        if author_id is None:
+            author_id = board.get_admin_users()[0].id
+
+        if swimlane_id is None:
+            swimlane_id = board.get_swimlanes()[0].id
+
+        return author_id, swimlane_id
+
+    def _post_card(self, title: str, description: str, author_id: str, swimlane_id: str, sort: int = None) -> Card:
         card_data = {
             "title": title,
             "description": description,
-            "authorId": board.get_admin_users()[0].id,
-            "swimlaneId": board.get_swimlanes()[0].id,
+            "authorId": author_id,
+            "swimlaneId": swimlane_id,
         }
+        if sort is not None:
+            card_data["sort"] = sort
 
         new_card = self._api.post(f"/api/boards/{self.boardId}/lists/{self.id}/cards", card_data)
+        if self._api.search_index is not None:
+            self._api.search_index.update_card(self.boardId, self.id, new_card["_id"], title, description)
+
+        return Card(self._api, self.boardId, self.id, new_card["_id"], card_data)
+
+    def move_all_cards(self, to_list, **kwargs) -> [Card]:
+        """
+        Move all the cards of this list to another list of the board, concurrently.
+        The cards are read with a single export of the board, and keep their order after the destination's cards.
+        :param to_list: The destination :class:`List`, or its ID.
+        :param swimlane_id: (optional) ID of the destination swimlane, the cards' current ones by default.
+        :param max_workers: (optional) Maximum number of cards moved at once. Defaults to the client's pool size.
+        :param retries: (optional) Times a card still failing with a transient error after the client's own retries
+            is moved again, none by default; the client's scheduler retries transient errors.
+        :return: The moved cards.
+        :raises BulkOperationError: If some of the cards couldn't be moved, with a result per card.
+        """
 
-        return Card(self._api, self.boardId, self.id, new_card["_id"])
+        snapshot = self._api.load_board_tree(self.boardId)
+        return self._api.update_cards(_moves(snapshot, self.id, to_list, kwargs.get("swimlane_id")), **kwargs)
 
     def get_cards(self) -> [Card]:
         """
@@ -53,6 +144,47 @@ class List(_WekanObject):
 
         cards_data = self._api.get(f"/api/boards/{self.boardId}/lists/{self.id}/cards")
         if len(cards_data) <= 0:
-            raise LookupError(f"Could not find cards in list {self.title}")
+            raise LookupError(f"Could not find cards in list {self.id}")
+
+        return [Card(self._api, self.boardId, self.id, card['_id'], card) for card in cards_data]
+
+    def iter_cards(self):
+        """
+        Iterate the cards in this list, as they're received. An empty list yields nothing.
+        """
+
+        for card in self._api.iter_get(f"/api/boards/{self.boardId}/lists/{self.id}/cards"):
+            yield Card(self._api, self.boardId, self.id, card['_id'], card)
+
+
+def _moves(snapshot, list_id: str, to_list, swimlane_id: str = None) -> [tuple]:
+    """
+    Updates moving the open cards of a list after the cards of another one, in their order.
+    :param snapshot: A :class:`wykan.snapshot.BoardSnapshot` of the lists' board.
+    """
+
+    to_list_id = to_list if isinstance(to_list, str) else to_list.id
+    first_sort = max((card.sort or 0 for card in snapshot.get_cards(to_list_id)), default=-1) + 1
+
+    moves = []
+    for card in snapshot.get_cards(list_id):
+        if card.archived:
+            continue
+
+        card_data = {"listId": to_list_id, "sort": first_sort + len(moves)}
+        if swimlane_id is not None:
+            card_data["swimlaneId"] = swimlane_id
+        moves.append((card, card_data))
+
+    return moves
+
+
+def _card_fields(card) -> (str, str):
+    """
+    Get the title and description of a card given as a configuration object or a (title, description) tuple.
+    """
+
+    if isinstance(card, tuple):
+        return card
 
-        return [Card(self._api, self.boardId, self.id, card['_id']) for card in cards_data]
+    return card.title, card.description
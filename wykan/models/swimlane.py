@@ -1,16 +1,26 @@
-from . import _WekanObject
+from . import _WekanObject, intern
 
 
 class Swimlane(_WekanObject):
-    def __init__(self, api, board_id, id: str):
-        super().__init__(api, id)
-        _data = api.get(f"/api/boards/{board_id}/swimlanes/{id}")
+    _fields = {
+        "title": "title",
+        "archived": "archived",
+        "createdAt": "createdAt",
+        "updatedAt": "updatedAt",
+        "modifiedAt": "modifiedAt",
+        "type": "type",
+        "sort": "sort",
+    }
 
-        self.title = _data.get('title')
-        self.boardId = board_id
-        self.archived = _data.get('archived')
-        self.createdAt = _data.get('createdAt')
-        self.updatedAt = _data.get('updatedAt')
-        self.modifiedAt = _data.get('modifiedAt')
-        self.type = _data.get('type')
-        self.sort = _data.get('sort')
+    __slots__ = ("boardId", *_fields)
+
+    def __init__(self, api, board_id, id: str, data: dict = None):
+        """
+        :param data: (optional) Already known fields of the swimlane, the rest are fetched on first access.
+        """
+        self.boardId = intern(board_id)
+        super().__init__(api, id, data)
+
+    @property
+    def _url(self) -> str:
+        return f"/api/boards/{self.boardId}/swimlanes/{self.id}"
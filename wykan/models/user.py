@@ -1,4 +1,4 @@
-from . import _WekanObject
+from . import _WekanObject, intern
 
 
 class User(_WekanObject):
@@ -6,21 +6,37 @@ class User(_WekanObject):
     A Wekan user.
     """
 
-    def __init__(self, api, id: str):
-        super().__init__(api, id)
-        user = self._api.get(f"/api/users/{self.id}")
+    _fields = {
+        "username": "username",
+        "emails": "emails",
+        "created_at": "createdAt",
+        "modified_at": "modifiedAt",
+        "profile": "profile",
+        "services": "services",
+        "heartbeat": "heartbeat",
+        "is_admin": "isAdmin",
+        "created_though_api": "createdThroughApi",
+        "login_disabled": "loginDisabled",
+        "authentication_method": "authenticationMethod",
+    }
 
-        self.username = user.get("username")
-        self.emails = [UserEmail(email.get("address"), email.get("verified")) for email in user.get("emails")]
-        self.created_at = user.get("createdAt")
-        self.modified_at = user.get("modifiedAt")
-        self.profile = UserProfile(user.get("profile"))
-        self.services = user.get("services")
-        self.heartbeat = user.get("heartbeat")
-        self.is_admin = user.get("isAdmin")
-        self.created_though_api = user.get("createdThroughApi")
-        self.login_disabled = user.get("loginDisabled")
-        self.authentication_method = user.get("authenticationMethod")
+    __slots__ = tuple(_fields)
+
+    def __init__(self, api, id: str, data: dict = None):
+        """
+        :param data: (optional) Already known fields of the user, the rest are fetched on first access.
+        """
+        super().__init__(api, id, data)
+
+    @property
+    def _url(self) -> str:
+        return f"/api/users/{self.id}"
+
+    def _parse_emails(self, emails: list) -> ["UserEmail"]:
+        return [UserEmail(email.get("address"), email.get("verified")) for email in emails or []]
+
+    def _parse_profile(self, profile: dict) -> "UserProfile":
+        return UserProfile(profile or {})
 
 
 class UserEmail:
@@ -28,8 +44,10 @@ class UserEmail:
     A Wekan user's email details
     """
 
+    __slots__ = ("address", "verified")
+
     def __init__(self, address: str, verified: str):
-        self.address = address
+        self.address = intern(address)
         self.verified = verified
 
 
@@ -38,6 +56,11 @@ class UserProfile:
     A Wekan user's profile details.
     """
 
+    __slots__ = ("avatar_url", "email_buffer", "fullname", "show_desktop_drag_handles", "hidden_system_messages",
+                 "hidden_minicard_label_text", "initials", "invited_boards", "language", "notifications",
+                 "show_cards_count_at", "starred_boards", "icode", "board_view", "list_sort_by", "templates_board_id",
+                 "card_templates_swimlane_id", "list_templates_swimlane_id", "board_templates_swimlane_id")
+
     def __init__(self, profile: dict):
         self.avatar_url = profile.get("avatarUrl")
         self.email_buffer = profile.get("emailBuffer", [])
@@ -45,16 +68,16 @@ class UserProfile:
         self.show_desktop_drag_handles = profile.get("showDesktopDragHandles")
         self.hidden_system_messages = profile.get("hiddenSystemMessages")
         self.hidden_minicard_label_text = profile.get("hiddenMinicardLabelText")
-        self.initials = profile.get("initials")
+        self.initials = intern(profile.get("initials"))
         self.invited_boards = profile.get("invitedBoards", [])
-        self.language = profile.get("language")
+        self.language = intern(profile.get("language"))
         self.notifications = profile.get("notifications", [])
         self.show_cards_count_at = profile.get("showCardsCountAT")
-        self.starred_boards = profile.get("starredBoards", [])
+        self.starred_boards = [intern(board_id) for board_id in profile.get("starredBoards", [])]
         self.icode = profile.get("icode")
-        self.board_view = profile.get("boardView")
-        self.list_sort_by = profile.get("listSortBy")
-        self.templates_board_id = profile.get("templatesBoardId")
-        self.card_templates_swimlane_id = profile.get("cardTemplatesSwimlaneId")
-        self.list_templates_swimlane_id = profile.get("listTemplatesSwimlaneId")
-        self.board_templates_swimlane_id = profile.get("boardTemplatesSwimlaneId")
+        self.board_view = intern(profile.get("boardView"))
+        self.list_sort_by = intern(profile.get("listSortBy"))
+        self.templates_board_id = intern(profile.get("templatesBoardId"))
+        self.card_templates_swimlane_id = intern(profile.get("cardTemplatesSwimlaneId"))
+        self.list_templates_swimlane_id = intern(profile.get("listTemplatesSwimlaneId"))
+        self.board_templates_swimlane_id = intern(profile.get("boardTemplatesSwimlaneId"))
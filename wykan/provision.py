@@ -0,0 +1,301 @@
+"""
+wykan-provision: create boards from BoardConfiguration YAML files, over a pool of workers.
+
+Every board's progress is appended to a checkpoint journal. Running again with the same journal skips the boards
+that were provisioned, and replaces the ones that were left partially provisioned, so no board is created twice.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from . import Wykan
+from .exceptions import WekanException
+
+try:
+    import yaml
+    from .board_configuration import BoardConfiguration
+except ImportError:
+    yaml = None
+
+CONFIG_EXTENSIONS = (".yml", ".yaml")
+
+STARTED = "started"
+CREATED = "created"
+DONE = "done"
+FAILED = "failed"
+
+# Seconds the server's clock may lag behind ours when telling if a board was created by an interrupted run.
+CLOCK_SKEW = 300
+
+
+class ProvisioningJournal:
+    """
+    Append-only journal of the boards being provisioned, one JSON object per line.
+    Each line is flushed to disk before the next step runs, so the journal survives a crash or interruption.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = dict()
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as fd:
+                for line in fd:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # The last line may be cut short by a crash.
+                        continue
+                    self.entries.setdefault(entry["key"], dict()).update(entry)
+
+        self._fd = open(path, "a", encoding="utf-8")
+
+    def close(self):
+        self._fd.close()
+
+    def status(self, key: str) -> str:
+        return self.entries.get(key, {}).get("status")
+
+    def board_id(self, key: str) -> str:
+        return self.entries.get(key, {}).get("board_id")
+
+    def recorded_at(self, key: str) -> float:
+        """
+        Unix time of the last entry of a board.
+        """
+        return self.entries.get(key, {}).get("time")
+
+    def claimed_board_ids(self) -> {str}:
+        return {entry["board_id"] for entry in self.entries.values() if entry.get("board_id")}
+
+    def record(self, key: str, status: str, **fields):
+        entry = dict(fields, key=key, status=status, time=time.time())
+        with self._lock:
+            self.entries.setdefault(key, dict()).update(entry)
+            self._fd.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._fd.flush()
+            os.fsync(self._fd.fileno())
+
+
+class ProvisioningTask:
+    """
+    A board to provision: a BoardConfiguration and where it was read from.
+    """
+
+    def __init__(self, key: str, config: "BoardConfiguration"):
+        """
+        :param key: Identity of the configuration in the journal. Example: /srv/boards/team.yml#2
+        """
+
+        self.key = key
+        self.config = config
+
+    @property
+    def cards(self) -> int:
+        return sum(len(board_list.cards or []) for board_list in self.config.lists or [])
+
+
+def load_tasks(paths: [str]) -> [ProvisioningTask]:
+    """
+    Read the configurations of YAML files, multi-document streams and directories of them.
+    :param paths: Files and directories. Directories are searched recursively for .yml and .yaml files.
+    """
+
+    if yaml is None:
+        raise ImportError("wykan-provision requires PyYAML, install it with: pip install Wykan[provision]")
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(directory, name)
+                                for directory, _, names in os.walk(path)
+                                for name in names if name.endswith(CONFIG_EXTENSIONS)))
+        else:
+            files.append(path)
+
+    tasks = []
+    for file_path in files:
+        with open(file_path, "rb") as fd:
+            for index, document in enumerate(yaml.load_all(fd, Loader=yaml.FullLoader)):
+                if document is None:
+                    continue
+                if not isinstance(document, BoardConfiguration):
+                    raise ValueError(f"{file_path}, document {index}: not a !BoardConfiguration")
+                tasks.append(ProvisioningTask(f"{os.path.abspath(file_path)}#{index}", document))
+
+    return tasks
+
+
+class Provisioner:
+    """
+    Provisions boards over a pool of workers, checkpointing every board in a journal.
+    """
+
+    def __init__(self, wekan: Wykan, journal: ProvisioningJournal, owner_id: str, **kwargs):
+        """
+        :param owner_id: User ID of the boards' owner.
+        :param workers: (optional) Boards provisioned at once, 4 by default.
+        :param board_workers: (optional) Lists and cards of a board created at once, 1 by default.
+        :param output: (optional) Stream progress is reported to, stdout by default.
+        :param delete_orphans: (optional) Delete the boards a run interrupted while creating a board may have left
+            unjournaled, found by title and creation time. Otherwise they're only reported.
+        """
+
+        self.wekan = wekan
+        self.journal = journal
+        self.owner_id = owner_id
+        self.workers = kwargs.get("workers", 4)
+        self.board_workers = kwargs.get("board_workers", 1)
+        self.output = kwargs.get("output", sys.stdout)
+        self.delete_orphans = kwargs.get("delete_orphans", False)
+        self._output_lock = threading.Lock()
+
+    def run(self, tasks: [ProvisioningTask]) -> dict:
+        """
+        Provision the boards that weren't provisioned by a previous run.
+        :return: Counters of the run.
+        """
+
+        pending = [task for task in tasks if self.journal.status(task.key) != DONE]
+        self._clean_up(pending)
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            outcomes = list(executor.map(self._provision, pending))
+        elapsed = time.monotonic() - start
+
+        provisioned = [task for task, ok in zip(pending, outcomes) if ok]
+        cards = sum(task.cards for task in provisioned)
+        return {
+            "boards": len(provisioned),
+            "cards": cards,
+            "skipped": len(tasks) - len(pending),
+            "failed": len(pending) - len(provisioned),
+            "seconds": elapsed,
+            "boards_per_second": len(provisioned) / elapsed if elapsed else 0.0,
+            "cards_per_second": cards / elapsed if elapsed else 0.0,
+        }
+
+    def _clean_up(self, pending: [ProvisioningTask]):
+        """
+        Delete the boards a previous run left partially provisioned.
+        """
+
+        for task in pending:
+            board_id = self.journal.board_id(task.key)
+            board_ids = [board_id] if board_id is not None else []
+            if board_id is None and self.journal.status(task.key) == STARTED:
+                # Interrupted while creating the board: it may exist without being journaled. A board with the same
+                # title may also be the user's own, so it's never deleted unless asked to.
+                board_ids = self._orphans(task)
+                if board_ids and not self.delete_orphans:
+                    self._report(f"{task.key} was interrupted while creating {task.config.title}, check and remove "
+                                 f"board(s) {', '.join(board_ids)} if it left them, or run with --delete-orphans")
+                    continue
+
+            for board_id in board_ids:
+                try:
+                    self.wekan.delete_board(board_id)
+                    self._report(f"removed partial board {task.config.title} ({board_id}) of {task.key}")
+                except (Exception, WekanException) as e:
+                    self._report(f"couldn't remove partial board {task.config.title} ({board_id}) of {task.key}: {e}")
+
+    def _orphans(self, task: ProvisioningTask) -> [str]:
+        """
+        IDs of the unjournaled boards with the task's title, created since the task was started.
+        """
+
+        claimed = self.journal.claimed_board_ids()
+        started_at = self.journal.recorded_at(task.key) or 0
+        orphans = []
+        for board in self.wekan.get_user_boards(self.owner_id):
+            if board.title != task.config.title or board.id in claimed:
+                continue
+
+            try:
+                created_at = datetime.fromisoformat(board.created_at.replace("Z", "+00:00")).timestamp()
+            except (AttributeError, ValueError):
+                continue
+
+            if created_at >= started_at - CLOCK_SKEW:
+                orphans.append(board.id)
+
+        return orphans
+
+    def _provision(self, task: ProvisioningTask) -> bool:
+        self.journal.record(task.key, STARTED, board_id=None, title=task.config.title)
+        try:
+            board = self.wekan.create_board(task.config.title, self.owner_id)
+            self.journal.record(task.key, CREATED, board_id=board.id)
+            self.wekan.apply_configuration(board, task.config, self.owner_id, max_workers=self.board_workers)
+        except (Exception, WekanException) as e:
+            self.journal.record(task.key, FAILED, error=str(e))
+            self._report(f"failed {task.config.title} of {task.key}: {e}")
+            return False
+
+        self.journal.record(task.key, DONE)
+        self._report(f"provisioned {task.config.title} ({board.id}) of {task.key}, {task.cards} cards")
+        return True
+
+    def _report(self, line: str):
+        with self._output_lock:
+            print(line, file=self.output, flush=True)
+
+
+def main(argv: [str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="wykan-provision",
+                                     description="Create Wekan boards from BoardConfiguration YAML files.")
+    parser.add_argument("paths", nargs="+", help="YAML files, possibly multi-document, or directories of them")
+    parser.add_argument("--url", default=os.environ.get("WEKAN_URL"), help="Wekan url, or $WEKAN_URL")
+    parser.add_argument("--username", default=os.environ.get("WEKAN_USERNAME"), help="or $WEKAN_USERNAME")
+    parser.add_argument("--password", default=os.environ.get("WEKAN_PASSWORD"), help="or $WEKAN_PASSWORD")
+    parser.add_argument("--owner", help="username of the boards' owner, the logged in user by default")
+    parser.add_argument("--journal", default="wykan-provision.journal",
+                        help="checkpoint journal, a run with the same journal resumes where it stopped")
+    parser.add_argument("--workers", type=int, default=4, help="boards provisioned at once")
+    parser.add_argument("--board-workers", type=int, default=1, help="lists and cards of a board created at once")
+    parser.add_argument("--delete-orphans", action="store_true",
+                        help="delete the boards an interrupted run may have created without journaling them, "
+                             "found by title and creation time")
+    parser.add_argument("--no-verify-tls", action="store_true", help="don't verify the server's certificate")
+    args = parser.parse_args(argv)
+
+    if yaml is None:
+        parser.error("PyYAML is required, install it with: pip install Wykan[provision]")
+
+    if not (args.url and args.username and args.password):
+        parser.error("the Wekan url, username and password are required")
+
+    tasks = load_tasks(args.paths)
+    journal = ProvisioningJournal(args.journal)
+    try:
+        with Wykan(args.url, args.username, args.password, verify_tls=not args.no_verify_tls,
+                   pool_maxsize=args.workers * args.board_workers) as wekan:
+            if args.owner:
+                owner = wekan.get_user_by_username(args.owner)
+                if owner is None:
+                    parser.error(f"no user named {args.owner}")
+                owner_id = owner.id
+            else:
+                owner_id = wekan.user.id
+
+            report = Provisioner(wekan, journal, owner_id, workers=args.workers, board_workers=args.board_workers,
+                                 delete_orphans=args.delete_orphans).run(tasks)
+    finally:
+        journal.close()
+
+    print(f"{report['boards']} boards and {report['cards']} cards provisioned in {report['seconds']:.1f}s "
+          f"({report['boards_per_second']:.2f} boards/s, {report['cards_per_second']:.1f} cards/s), "
+          f"{report['skipped']} already provisioned, {report['failed']} failed")
+
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
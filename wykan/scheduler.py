@@ -0,0 +1,217 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from .bulk import TRANSIENT_STATUSES
+
+# Methods sending the same request twice has the same effect as sending it once.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Seconds a response may be slower than its endpoint's baseline before it's considered a sign of load.
+LATENCY_SLACK = 0.01
+
+# Weight of a new latency sample in the smoothed latency of an endpoint.
+LATENCY_SMOOTHING = 0.2
+
+
+def retry_after(response) -> float:
+    """
+    Seconds to wait before retrying, as requested by the Retry-After header of a response. None if it has none.
+    """
+
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """
+    Bounds the requests in flight with an AIMD (additive increase, multiplicative decrease) limit, and retries
+    idempotent requests failing with a transient error.
+
+    The limit grows by one request per round of successful requests, and is cut by `decrease_factor` when the server
+    shows signs of load: a 429 or 5xx status, a connection error or timeout, or a response much slower than the
+    fastest smoothed latency seen for its endpoint. Collections and exports take as long as they're large, so only
+    reads of single documents and writes are judged by their latency. A cut is made once per round: failures of
+    requests sent before the previous cut don't cut again. Requests over the limit wait in a queue.
+    """
+
+    def __init__(self, max_limit: int = 10, **kwargs):
+        """
+        :param max_limit: Maximum number of requests in flight.
+        :param min_limit: (optional) Minimum number of requests in flight, 1 by default.
+        :param initial_limit: (optional) Starting limit, `max_limit` by default.
+        :param decrease_factor: (optional) Factor the limit is multiplied by on a sign of load, 0.7 by default.
+        :param latency_tolerance: (optional) How many times slower than its endpoint's baseline a response may be
+            before it's considered a sign of load, 3 by default. None to only react to errors.
+        :param retries: (optional) Times an idempotent request failing with a transient error is sent again, 2 by
+            default.
+        :param backoff: (optional) Upper bound in seconds of the first retry's random delay, doubled on every retry.
+        :param max_delay: (optional) Maximum seconds waited before a retry, including server requested delays.
+        """
+
+        self.max_limit = max_limit
+        self.min_limit = kwargs.get("min_limit", 1)
+        self.decrease_factor = kwargs.get("decrease_factor", 0.7)
+        self.latency_tolerance = kwargs.get("latency_tolerance", 3)
+        self.retries = kwargs.get("retries", 2)
+        self.backoff = kwargs.get("backoff", 0.1)
+        self.max_delay = kwargs.get("max_delay", 30)
+
+        self._limit = float(kwargs.get("initial_limit", max_limit))
+        self._in_flight = 0
+        self._queued = 0
+        # Incremented on every cut, requests remember the epoch they were sent in.
+        self._epoch = 0
+        # Endpoint -> [smoothed latency, lowest smoothed latency]
+        self._latencies = dict()
+        self._counters = {"requests": 0, "retries": 0, "increases": 0, "decreases": 0}
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @contextmanager
+    def slot(self):
+        """
+        Wait until a request may be sent, and hold its place while it's in flight.
+        :return: The epoch the request is sent in, to pass to :meth:`observe`.
+        """
+
+        with self._condition:
+            self._queued += 1
+            try:
+                while self._in_flight >= self.limit:
+                    self._condition.wait()
+            finally:
+                self._queued -= 1
+            self._in_flight += 1
+            epoch = self._epoch
+
+        try:
+            yield epoch
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+    def observe(self, epoch: int, event):
+        """
+        Adjust the limit from a finished request.
+        :param epoch: Epoch the request was sent in.
+        :param event: The :class:`RequestEvent` of the request.
+        """
+
+        with self._condition:
+            self._counters["requests"] += 1
+            if self._overloaded(event):
+                # Requests sent before the last cut saw the old limit, they don't cut again.
+                if epoch == self._epoch:
+                    self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                    self._epoch += 1
+                    self._counters["decreases"] += 1
+            elif self._limit < self.max_limit:
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+                self._counters["increases"] += 1
+                self._condition.notify_all()
+
+    def _overloaded(self, event) -> bool:
+        if event.error is not None:
+            return isinstance(event.error, (requests.ConnectionError, requests.Timeout))
+
+        if event.status is not None and (event.status == 429 or event.status >= 500):
+            return True
+
+        if event.method == "GET" and not event.endpoint.endswith("/{id}"):
+            return False
+
+        key = (event.method, event.endpoint)
+        latencies = self._latencies.get(key)
+        if latencies is None:
+            self._latencies[key] = [event.latency, event.latency]
+            return False
+
+        latencies[0] += LATENCY_SMOOTHING * (event.latency - latencies[0])
+        latencies[1] = min(latencies[1], latencies[0])
+        return self.latency_tolerance is not None \
+            and latencies[0] > latencies[1] * self.latency_tolerance + LATENCY_SLACK
+
+    def retry_delay(self, method: str, attempt: int, response=None, error: BaseException = None,
+                    idempotent: bool = None) -> float:
+        """
+        Seconds to wait before sending a failed request again, None if it shouldn't be retried.
+        The delay is a random ("full jitter") exponential backoff, added to the server's Retry-After if it sent one so
+        the clients it throttled don't all come back at once.
+        :param attempt: Number of the failed attempt, from 0.
+        :param idempotent: Whether the request may be sent twice, by its method by default. Some Wekan endpoints
+            create objects on PUT.
+        """
+
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        if attempt >= self.retries or not idempotent:
+            return None
+
+        if error is not None:
+            if not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+                return None
+        elif response is None or response.status_code not in TRANSIENT_STATUSES:
+            return None
+
+        delay = random.uniform(0, self.backoff * 2 ** attempt) + (retry_after(response) or 0)
+
+        with self._condition:
+            self._counters["retries"] += 1
+
+        return min(delay, self.max_delay)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return dict(self._counters, limit=self.limit, in_flight=self._in_flight, queued=self._queued)
+
+    def to_prometheus(self, prefix: str = "wykan") -> str:
+        """
+        Export the limit, requests in flight and queued, and the counters in the Prometheus text exposition format.
+        :param prefix: Prefix of the metric names.
+        """
+
+        stats = self.stats()
+        lines = []
+        for name, metric_type, help_text, key in [
+            ("concurrency_limit", "gauge", "Requests allowed in flight by the adaptive limiter.", "limit"),
+            ("requests_in_flight", "gauge", "Requests sent and not answered yet.", "in_flight"),
+            ("requests_queued", "gauge", "Requests waiting for the concurrency limit.", "queued"),
+            ("request_retries_total", "counter", "Idempotent requests sent again after a transient error.",
+             "retries"),
+            ("concurrency_limit_decreases_total", "counter", "Times the limit was cut on signs of server load.",
+             "decreases"),
+        ]:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            lines.append(f"{prefix}_{name} {stats[key]}")
+
+        return "\n".join(lines) + "\n"
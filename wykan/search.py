@@ -0,0 +1,268 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+
+_WORD = re.compile(r"\w+")
+
+# Matches in titles rank above matches in descriptions.
+_TITLE_WEIGHT = 3
+
+# Matches of a word without its Hebrew prefix rank below matches of the word itself.
+_STRIPPED_WEIGHT = 0.5
+
+# Letters attached as prefixes to Hebrew words: and, the, in, as, to, from, that.
+_HEBREW_PREFIXES = "והבכלמש"
+
+
+def tokenize(text: str) -> [str]:
+    """
+    Split text into search tokens: case folded words, without diacritics such as accents or Hebrew niqqud.
+    Example: "Café שָׁלוֹם" -> ["cafe", "שלום"]
+    """
+
+    if not text:
+        return []
+
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(character for character in decomposed if not unicodedata.combining(character))
+    return _WORD.findall(unicodedata.normalize("NFC", stripped))
+
+
+def _stripped(token: str) -> str:
+    """
+    A Hebrew word without the preposition or conjunction it may start with, None if it can't have one.
+    Example: "בעברית" -> "עברית"
+    """
+
+    if len(token) > 3 and token[0] in _HEBREW_PREFIXES and "\u05d0" <= token[1] <= "\u05ea":
+        return token[1:]
+
+    return None
+
+
+class SearchIndex:
+    """
+    An inverted index of card titles and descriptions, kept per board.
+    Boards are indexed from a :class:`wykan.snapshot.BoardSnapshot`, single cards can be updated incrementally.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        :param path: (optional) File the index is persisted in, loaded if it exists.
+        """
+
+        self.path = os.path.expanduser(path) if path else None
+        self._cards = dict()
+        self._postings = dict()
+        # Hebrew words without their first letter, which may be a prefix. See _matching().
+        self._stripped_postings = dict()
+        self._boards = dict()
+        self._lock = threading.Lock()
+
+        if self.path is not None and os.path.exists(self.path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def indexed_at(self, board_id: str) -> float:
+        """
+        Unix time the board was last indexed, None if it wasn't.
+        """
+        return self._boards.get(board_id)
+
+    @property
+    def board_ids(self) -> [str]:
+        return list(self._boards)
+
+    def index_board(self, snapshot):
+        """
+        Index all the cards of a board, replacing the ones indexed before.
+        Archived cards and cards of archived lists aren't indexed.
+        :param snapshot: A :class:`wykan.snapshot.BoardSnapshot` of the board.
+        """
+
+        board_id = snapshot.board.id
+        archived_lists = {board_list.id for board_list in snapshot.lists if board_list.archived}
+        cards = [card for card in snapshot.cards
+                 if not getattr(card, "archived", False) and card.listId not in archived_lists]
+
+        with self._lock:
+            current_ids = {card.id for card in cards}
+            for card_id in [card_id for card_id, entry in self._cards.items()
+                            if entry["board_id"] == board_id and card_id not in current_ids]:
+                self._remove(card_id)
+
+            for card in cards:
+                self._add(card.id, board_id, card.listId, card.title, card.description)
+
+            self._boards[board_id] = time.time()
+
+    def mark_stale(self, board_id: str):
+        """
+        Have a board reindexed on its next search, keeping its cards searchable until then.
+        """
+
+        with self._lock:
+            if board_id in self._boards:
+                self._boards[board_id] = 0
+
+    def update_card(self, board_id: str, list_id: str, card_id: str, title: str, description: str):
+        """
+        Index a new or changed card.
+        """
+
+        with self._lock:
+            self._add(card_id, board_id, list_id, title, description)
+
+    def remove_card(self, card_id: str):
+        with self._lock:
+            self._remove(card_id)
+
+    def remove_list(self, list_id: str):
+        with self._lock:
+            for card_id in [card_id for card_id, entry in self._cards.items() if entry["list_id"] == list_id]:
+                self._remove(card_id)
+
+    def remove_board(self, board_id: str):
+        with self._lock:
+            for card_id in [card_id for card_id, entry in self._cards.items() if entry["board_id"] == board_id]:
+                self._remove(card_id)
+            self._boards.pop(board_id, None)
+
+    def search(self, query: str, board_ids: [str] = None, limit: int = None) -> [dict]:
+        """
+        Find the cards matching every word of a query, the last word may be the beginning of a word.
+        :param board_ids: (optional) Search only these boards.
+        :param limit: (optional) Maximum number of cards returned.
+        :return: The indexed entries of the cards, best matches first.
+            Entries hold the card's id, board_id, list_id, title and description.
+        """
+
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            matches = None
+            for i, token in enumerate(tokens):
+                postings = self._matching(token, prefix=i == len(tokens) - 1)
+                matches = postings if matches is None else matches & postings
+                if not matches:
+                    return []
+
+            board_ids = set(board_ids) if board_ids is not None else None
+            entries = [self._cards[card_id] for card_id in matches
+                       if board_ids is None or self._cards[card_id]["board_id"] in board_ids]
+
+        def matches_token(word: str, token: str, prefix: bool) -> bool:
+            return word is not None and (word.startswith(token) if prefix else word == token)
+
+        def count(entry_tokens: [str], token: str, prefix: bool) -> float:
+            return sum(1 if matches_token(entry_token, token, prefix)
+                       else _STRIPPED_WEIGHT if matches_token(_stripped(entry_token), token, prefix) else 0
+                       for entry_token in entry_tokens)
+
+        def score(entry: dict) -> float:
+            return sum(_TITLE_WEIGHT * count(entry["title_tokens"], token, i == len(tokens) - 1)
+                       + count(entry["description_tokens"], token, i == len(tokens) - 1)
+                       for i, token in enumerate(tokens))
+
+        entries.sort(key=lambda entry: (-score(entry), entry["title"] or ""))
+        return [{key: entry[key] for key in ("id", "board_id", "list_id", "title", "description")}
+                for entry in entries[:limit]]
+
+    def _matching(self, token: str, prefix: bool = False) -> set:
+        """
+        IDs of the cards holding a token, or a word starting with it.
+        A Hebrew word is also found without its first letter, but only if the rest is a word of the index itself:
+        "בעברית" is found by "עברית" if some card holds "עברית", "שלום" is never found by "לום".
+        """
+
+        words = [word for word in self._postings if word.startswith(token)] if prefix \
+            else [token] if token in self._postings else []
+        return set().union(*[self._postings[word] for word in words],
+                           *[self._stripped_postings[word] for word in words if word in self._stripped_postings])
+
+    def save(self, path: str = None):
+        """
+        Persist the index, atomically replacing the file.
+        :param path: (optional) File to save to, the index's path by default.
+        """
+
+        path = os.path.expanduser(path) if path else self.path
+        with self._lock:
+            document = {
+                "version": 1,
+                "boards": dict(self._boards),
+                "cards": [{key: entry[key] for key in ("id", "board_id", "list_id", "title", "description")}
+                          for entry in self._cards.values()],
+            }
+
+        fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".wykan-search-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as temporary_file:
+                json.dump(document, temporary_file, ensure_ascii=False)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def load(self, path: str = None):
+        """
+        Replace the index with a persisted one.
+        :param path: (optional) File to load from, the index's path by default.
+        """
+
+        with open(os.path.expanduser(path) if path else self.path, encoding="utf-8") as fd:
+            document = json.load(fd)
+
+        with self._lock:
+            self._cards.clear()
+            self._postings.clear()
+            self._stripped_postings.clear()
+            self._boards = dict(document.get("boards", {}))
+            for card in document.get("cards", []):
+                self._add(card["id"], card["board_id"], card["list_id"], card["title"], card["description"])
+
+    def _add(self, card_id: str, board_id: str, list_id: str, title: str, description: str):
+        current = self._cards.get(card_id)
+        if current is not None:
+            if (current["title"], current["description"], current["list_id"]) == (title, description, list_id):
+                return
+            self._remove(card_id)
+
+        entry = self._cards[card_id] = {
+            "id": card_id,
+            "board_id": board_id,
+            "list_id": list_id,
+            "title": title,
+            "description": description,
+            "title_tokens": tokenize(title),
+            "description_tokens": tokenize(description),
+        }
+        for postings, tokens in self._entry_postings(entry):
+            for token in tokens:
+                postings.setdefault(token, set()).add(card_id)
+
+    def _remove(self, card_id: str):
+        entry = self._cards.pop(card_id, None)
+        if entry is None:
+            return
+
+        for postings, tokens in self._entry_postings(entry):
+            for token in tokens:
+                card_ids = postings.get(token)
+                if card_ids is not None:
+                    card_ids.discard(card_id)
+                    if not card_ids:
+                        del postings[token]
+
+    def _entry_postings(self, entry: dict) -> [(dict, {str})]:
+        tokens = set(entry["title_tokens"] + entry["description_tokens"])
+        return [(self._postings, tokens),
+                (self._stripped_postings, {_stripped(token) for token in tokens} - {None})]
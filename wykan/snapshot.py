@@ -0,0 +1,100 @@
+from collections import defaultdict
+
+from .models.board import Board
+from .models.card import Card
+from .models.card_comment import CardComment
+from .models.checklist import CheckList
+from .models.checklist_item import CheckListItem
+from .models.list import List
+from .models.swimlane import Swimlane
+from .models.user import User
+
+
+class BoardSnapshot:
+    """
+    A whole board loaded from a single export of the board, with its lists, swimlanes, cards, checklists,
+    comments and members' users.
+    Archived lists and cards are included, check their `archived` field.
+    """
+
+    # Model classes of the board's objects, replaced by asynchronous ones in AsyncBoardSnapshot.
+    _board_class = Board
+    _list_class = List
+    _swimlane_class = Swimlane
+    _card_class = Card
+    _user_class = User
+
+    def __init__(self, api, export: dict):
+        """
+        :param api: The Wykan client the models are bound to.
+        :param export: Document returned by the board export endpoint.
+        """
+
+        board_id = export["_id"]
+        self.board = _loaded(self._board_class(api, board_id), export)
+        self.lists = [_loaded(self._list_class(api, board_id, board_list["_id"]), board_list)
+                      for board_list in _sorted(export.get("lists"))]
+        self.swimlanes = [_loaded(self._swimlane_class(api, board_id, swimlane["_id"]), swimlane)
+                          for swimlane in _sorted(export.get("swimlanes"))]
+        self.cards = [_loaded(self._card_class(api, board_id, card.get("listId"), card["_id"]), card)
+                      for card in _sorted(export.get("cards"))]
+
+        self._cards_by_list = defaultdict(list)
+        for card in self.cards:
+            self._cards_by_list[card.listId].append(card)
+
+        items_by_checklist = defaultdict(list)
+        for item in _sorted(export.get("checklistItems")):
+            items_by_checklist[item.get("checklistId")].append(
+                _loaded(CheckListItem(api, board_id, item.get("cardId"), item.get("checklistId"), item["_id"]), item))
+
+        self._checklists_by_card = defaultdict(list)
+        for checklist in _sorted(export.get("checklists")):
+            card_checklist = _loaded(CheckList(api, board_id, checklist.get("cardId"), checklist["_id"]), checklist)
+            card_checklist.items = items_by_checklist[checklist["_id"]]
+            self._checklists_by_card[checklist.get("cardId")].append(card_checklist)
+
+        self._comments_by_card = defaultdict(list)
+        for comment in sorted(export.get("comments") or [], key=lambda comment: comment.get("createdAt") or ""):
+            self._comments_by_card[comment.get("cardId")].append(
+                _loaded(CardComment(api, board_id, comment.get("cardId"), comment["_id"]), comment))
+
+        # The export holds only some fields of the users, the rest are fetched on first access.
+        self.users = dict()
+        for user in export.get("users") or []:
+            cached_user = api.user_cache.get_or_create(user["_id"], lambda: self._user_class(api, user["_id"]))
+            cached_user._populate(user)
+            self.users[user["_id"]] = cached_user
+
+        api.name_index.load(("lists", board_id), export.get("lists") or [], "title")
+        api.name_index.load(("swimlanes", board_id), export.get("swimlanes") or [], "title")
+
+    def get_cards(self, list_id: str) -> [Card]:
+        """
+        Get the cards of a list, in their order.
+        :param list_id: ID of the list.
+        """
+        return self._cards_by_list.get(list_id, [])
+
+    def get_checklists(self, card_id: str) -> [CheckList]:
+        """
+        Get the checklists of a card, with their items.
+        :param card_id: ID of the card.
+        """
+        return self._checklists_by_card.get(card_id, [])
+
+    def get_comments(self, card_id: str) -> [CardComment]:
+        """
+        Get the comments on a card, oldest first.
+        :param card_id: ID of the card.
+        """
+        return self._comments_by_card.get(card_id, [])
+
+
+def _loaded(wekan_object, document: dict):
+    wekan_object._populate(document, complete=True)
+    return wekan_object
+
+
+def _sorted(documents: list) -> list:
+    return sorted(documents or [], key=lambda document: document.get("sort") or 0)
@@ -0,0 +1,96 @@
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CONTINUATIONS = ".eE+-"
+
+
+class NotAnArray(ValueError):
+    """
+    Raised by :func:`iter_json_array` when the document isn't a JSON array.
+    document: The decoded document.
+    """
+
+    def __init__(self, document):
+        super().__init__("JSON document is not an array")
+        self.document = document
+
+
+def iter_json_array(chunks):
+    """
+    Incrementally decode a JSON array, yielding its elements as soon as they're fully received.
+    Only the element being decoded is buffered, not the whole document.
+    :param chunks: Iterable of bytes chunks of the document.
+    :raises NotAnArray: If the document isn't an array.
+    """
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    exhausted = False
+
+    def read_more() -> bool:
+        nonlocal buffer, position, exhausted
+        if exhausted:
+            return False
+
+        for chunk in chunks:
+            if chunk:
+                buffer = buffer[position:] + text_decoder.decode(chunk)
+                position = 0
+                return True
+
+        buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        position = 0
+        exhausted = True
+        return False
+
+    def skip(characters: str) -> str:
+        """
+        Skip the given characters, return the next one ("" at the end of the document).
+        """
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in characters:
+                position += 1
+
+            if position < len(buffer):
+                return buffer[position]
+
+            if not read_more():
+                return ""
+
+    if skip(_WHITESPACE) != "[":
+        while read_more():
+            pass
+        raise NotAnArray(json.loads(buffer[position:]))
+
+    position += 1
+    expect_element = True
+    while True:
+        character = skip(_WHITESPACE + ("" if expect_element else ","))
+        if character == "]":
+            return
+        if character == "":
+            raise ValueError("Unterminated JSON array")
+
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if not read_more():
+                    raise
+                continue
+
+            # A scalar at the end of the buffer may continue in the next chunk, and a number cut before its
+            # fraction or exponent is decoded as the shorter number it starts with.
+            if (end == len(buffer) or buffer[end] in _NUMBER_CONTINUATIONS) and not exhausted and read_more():
+                continue
+
+            break
+
+        position = end
+        expect_element = False
+        yield element
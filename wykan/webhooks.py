@@ -0,0 +1,268 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+BOARD = "board"
+LIST = "list"
+CARD = "card"
+USER = "user"
+
+
+class ActivityEvent:
+    """
+    A board activity, as sent by Wekan's outgoing webhooks.
+    """
+
+    def __init__(self, payload: dict):
+        """
+        :param payload: The webhook's JSON document.
+        """
+
+        self.payload = payload
+        # Example: "act-moveCard"
+        self.activity = payload.get("description")
+        self.board_id = payload.get("boardId")
+        self.list_id = payload.get("listId")
+        self.old_list_id = payload.get("oldListId")
+        self.card_id = payload.get("cardId")
+        self.swimlane_id = payload.get("swimlaneId")
+        self.member_id = payload.get("memberId")
+        self.comment_id = payload.get("commentId")
+        # Username of the user who did the activity.
+        self.username = payload.get("user")
+        self.text = payload.get("text")
+
+    @property
+    def kinds(self) -> {str}:
+        """
+        Kinds of objects the activity affected: board, list, card and user.
+        """
+
+        kinds = set()
+        if self.board_id:
+            kinds.add(BOARD)
+        if self.list_id or self.old_list_id:
+            kinds.add(LIST)
+        if self.card_id:
+            kinds.add(CARD)
+        if self.member_id:
+            kinds.add(USER)
+
+        return kinds
+
+    def __repr__(self):
+        return f"<ActivityEvent {self.activity} board={self.board_id} list={self.list_id} card={self.card_id}>"
+
+
+class WebhookListener:
+    """
+    A local HTTP endpoint receiving Wekan's outgoing webhooks, routing the activities to callbacks.
+    Serve it in a background thread with :meth:`start`, or in an asyncio event loop with :meth:`serve`.
+    Callbacks run in the thread or event loop serving the request, an exception of a callback doesn't stop the others.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **kwargs):
+        """
+        :param host: Address to listen on.
+        :param port: Port to listen on, a free one by default.
+        :param token: (optional) Token the webhook integration was configured with, other requests are rejected.
+        :param path: (optional) Path the webhooks are posted to, any path by default.
+        """
+
+        self.host = host
+        self.port = port
+        self.token = kwargs.get("token")
+        self.path = kwargs.get("path")
+        self.received = 0
+        self.errors = []
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self._server = None
+
+    def subscribe(self, callback, kinds: [str] = None):
+        """
+        Call a function with every activity affecting some kinds of objects.
+        :param callback: Callable receiving the :class:`ActivityEvent`.
+        :param kinds: (optional) Kinds of objects: "board", "list", "card" or "user". All activities by default.
+        """
+
+        with self._lock:
+            self._subscriptions.append((callback, set(kinds) if kinds is not None else None))
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscriptions = [subscription for subscription in self._subscriptions
+                                   if subscription[0] != callback]
+
+    def attach(self, wekan):
+        """
+        Invalidate the caches of a :class:`wykan.Wykan` client on every activity: its response cache, name indexes,
+        user cache and search index. With the listener attached, their TTLs can be raised or disabled.
+        """
+
+        self.subscribe(lambda event: invalidate_caches(wekan, event))
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """
+        Serve in a background thread.
+        """
+
+        listener = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                status = listener._receive(self.path, self.headers.get("Content-Type", ""),
+                                           self.rfile.read(length) if length else b"")
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    async def serve(self):
+        """
+        Serve in the running asyncio event loop, until the task is cancelled.
+        Example: asyncio.create_task(listener.serve())
+        """
+
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = dict()
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length") or 0)
+            body = await reader.readexactly(length) if length else b""
+
+            if len(request_line) < 2:
+                status = 400
+            elif request_line[0] != "POST":
+                status = 405
+            else:
+                status = self._receive(request_line[1], headers.get("content-type", ""), body)
+
+            writer.write(f"HTTP/1.1 {status} \r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _receive(self, path: str, content_type: str, body: bytes) -> int:
+        """
+        Handle a posted webhook.
+        :return: HTTP status of the response.
+        """
+
+        if self.path is not None and path.split("?", 1)[0] != self.path:
+            return 404
+
+        try:
+            if content_type.startswith("application/x-www-form-urlencoded"):
+                payload = {key: values[0] for key, values in parse_qs(body.decode("utf-8")).items()}
+            else:
+                payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400
+
+        if not isinstance(payload, dict):
+            return 400
+
+        if self.token is not None and payload.get("token") != self.token:
+            return 403
+
+        self.dispatch(ActivityEvent(payload))
+        return 200
+
+    def dispatch(self, event: ActivityEvent):
+        """
+        Route an activity to the subscribed callbacks.
+        """
+
+        with self._lock:
+            self.received += 1
+            subscriptions = list(self._subscriptions)
+
+        kinds = event.kinds
+        for callback, subscribed_kinds in subscriptions:
+            if subscribed_kinds is not None and not subscribed_kinds & kinds:
+                continue
+
+            try:
+                callback(event)
+            except Exception as e:
+                with self._lock:
+                    self.errors.append((event, e))
+
+
+def invalidate_caches(wekan, event: ActivityEvent):
+    """
+    Drop what the caches of a :class:`wykan.Wykan` client hold about the objects an activity affected.
+    """
+
+    board_id = event.board_id
+    if event.member_id:
+        wekan.invalidate_user(event.member_id)
+
+    if not board_id:
+        return
+
+    urls = [f"/api/boards/{board_id}"]
+    for list_id in {event.list_id, event.old_list_id} - {None}:
+        urls.append(f"/api/boards/{board_id}/lists/{list_id}")
+        if event.card_id:
+            urls.append(f"/api/boards/{board_id}/lists/{list_id}/cards/{event.card_id}")
+    if event.swimlane_id:
+        urls.append(f"/api/boards/{board_id}/swimlanes/{event.swimlane_id}")
+
+    if wekan.response_cache is not None:
+        for url in urls:
+            wekan.response_cache.invalidate(url)
+
+    wekan.name_index.invalidate(("lists", board_id))
+    wekan.name_index.invalidate(("swimlanes", board_id))
+    if not event.list_id and not event.card_id:
+        # The board itself may have been renamed, its owners' title indexes aren't known.
+        wekan.name_index.invalidate()
+
+    if wekan.search_index is not None and event.card_id:
+        wekan.search_index.mark_stale(board_id)